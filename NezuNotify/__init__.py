@@ -1,3 +1,29 @@
-from .nezu_notify import NezuNotify
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["NezuNotify"]
+if TYPE_CHECKING:
+    from .async_nezu_notify import AsyncNezuNotify
+    from .nezu_notify import NezuNotify
+
+# Submodules are imported on first access so that importing the package,
+# or a light submodule such as NezuNotify.lite, does not load requests,
+# aiohttp and the token management stack.
+_LAZY_ATTRIBUTES = {
+    "AsyncNezuNotify": ".async_nezu_notify",
+    "NezuNotify": ".nezu_notify",
+}
+
+__all__ = ["AsyncNezuNotify", "NezuNotify"]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
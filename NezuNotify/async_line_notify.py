@@ -0,0 +1,159 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from .async_transport import (
+    AsyncResponse,
+    AsyncTransport,
+    translate_async_error,
+)
+from .exceptions import NezuNotifyError, NezuNotifyValueError
+from .results import SendResult
+from .urls import APIUrls
+
+
+class AsyncLineNotify:
+    def __init__(self, token: str, transport: Optional[AsyncTransport] = None):
+        self.token = token
+        self.transport = transport or AsyncTransport()
+        self.headers = {"Authorization": f"Bearer {self.token}"}
+
+    async def send_message(self, message: str) -> SendResult:
+        data = {"message": message}
+        return await self._make_request(
+            APIUrls.NOTIFY_URL, method="POST", data=data
+        )
+
+    async def send_image_with_url(self, text: str, url: str) -> SendResult:
+        data = {
+            "message": text,
+            "imageThumbnail": url,
+            "imageFullsize": url,
+        }
+        return await self._make_request(
+            APIUrls.NOTIFY_URL, method="POST", data=data
+        )
+
+    async def send_image_with_local_path(
+        self, text: str, path: str
+    ) -> SendResult:
+        # Disk reads would block the event loop, so they run in a thread.
+        loop = asyncio.get_running_loop()
+        try:
+            content = await loop.run_in_executor(None, _read_file, path)
+        except FileNotFoundError:
+            return SendResult(
+                False,
+                error=NezuNotifyValueError(
+                    f"Image file not found at the specified path: {path}"
+                ),
+                token=self.token,
+            )
+        except OSError as e:
+            return SendResult(
+                False,
+                error=NezuNotifyValueError(f"Failed to read image file: {e}"),
+                token=self.token,
+            )
+
+        start = time.monotonic()
+        form = aiohttp.FormData()
+        form.add_field("message", text)
+        form.add_field("imageFile", content, filename=os.path.basename(path))
+        try:
+            # Form data can only be encoded once, so uploads are not
+            # retried.
+            response = await self.transport.request(
+                "POST", APIUrls.NOTIFY_URL, headers=self.headers, data=form
+            )
+        except (
+            NezuNotifyError,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ) as e:
+            return SendResult(
+                False,
+                elapsed=time.monotonic() - start,
+                error=translate_async_error(e),
+                token=self.token,
+            )
+        return self._result(response, start)
+
+    async def send_sticker(
+        self, message: str, sticker_id: str, sticker_package_id: str
+    ) -> SendResult:
+        data = {
+            "message": message,
+            "stickerId": sticker_id,
+            "stickerPackageId": sticker_package_id,
+        }
+        return await self._make_request(
+            APIUrls.NOTIFY_URL, method="POST", data=data
+        )
+
+    async def _make_request(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        data: Optional[Dict[str, Any]] = None,
+    ) -> SendResult:
+        method = method.upper()
+        if method not in {"GET", "POST"}:
+            return SendResult(
+                False,
+                error=NezuNotifyValueError(
+                    f"Invalid HTTP method specified: {method}"
+                ),
+                token=self.token,
+            )
+
+        start = time.monotonic()
+        try:
+            response = await self.transport.request(
+                method,
+                endpoint,
+                operation="send",
+                headers=self.headers,
+                data=data,
+            )
+        except (
+            NezuNotifyError,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ) as e:
+            return SendResult(
+                False,
+                elapsed=time.monotonic() - start,
+                error=translate_async_error(e),
+                token=self.token,
+            )
+        return self._result(response, start)
+
+    def _result(self, response: AsyncResponse, start: float) -> SendResult:
+        elapsed = time.monotonic() - start
+        try:
+            response.raise_for_status()
+        except NezuNotifyError as e:
+            return SendResult(
+                False,
+                response.status_code,
+                elapsed,
+                response.headers,
+                e,
+                token=self.token,
+            )
+        return SendResult(
+            True,
+            response.status_code,
+            elapsed,
+            response.headers,
+            token=self.token,
+        )
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
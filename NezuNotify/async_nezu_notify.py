@@ -0,0 +1,143 @@
+from typing import Any, Dict, List, Optional, Union
+
+from .async_line_notify import AsyncLineNotify
+from .async_token_manager import AsyncTokenManager
+from .async_transport import AsyncTransport
+from .exceptions import NezuNotifyValueError
+from .instrumentation import Instrumentation
+from .results import (
+    BulkRevokeResult,
+    RevokeResult,
+    SendResult,
+    StatusResult,
+)
+
+
+class AsyncNezuNotify:
+    """Asyncio counterpart of NezuNotify for sending and token checks."""
+
+    def __init__(
+        self,
+        csrf: Optional[str] = None,
+        cookie: Optional[str] = None,
+        token: Optional[str] = None,
+        transport: Optional[AsyncTransport] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        """
+        Initialize an AsyncNezuNotify object.
+
+        Args:
+            csrf (Optional[str]): CSRF token
+            cookie (Optional[str]): Session cookie
+            token (Optional[str]): LINE Notify token
+            transport (Optional[AsyncTransport]): Pooled async HTTP
+                transport shared by every component. A transport passed in
+                is left open by close().
+            instrumentation (Optional[Instrumentation]): Hooks and metrics
+                run around every HTTP call of the transport created when
+                none is given.
+
+        Raises:
+            NezuNotifyValueError: If both transport and instrumentation are
+                given.
+        """
+        self.csrf = csrf
+        self.cookie = cookie
+        self.token = token
+        if transport is not None and instrumentation is not None:
+            raise NezuNotifyValueError(
+                "instrumentation configures the transport AsyncNezuNotify "
+                "creates. Set it on the given transport instead."
+            )
+        self._owns_transport = transport is None
+        self.transport = transport or AsyncTransport(
+            instrumentation=instrumentation
+        )
+
+        self.token_manager: Optional[AsyncTokenManager] = None
+        self.line_notify: Optional[AsyncLineNotify] = None
+
+        if csrf and cookie:
+            self.token_manager = AsyncTokenManager(
+                csrf, cookie, self.transport
+            )
+        if token:
+            self.line_notify = AsyncLineNotify(token, self.transport)
+
+    async def send_message(self, message: str) -> SendResult:
+        """Send a text message."""
+        return await self._require_line_notify().send_message(message)
+
+    async def send_image_with_url(self, text: str, url: str) -> SendResult:
+        """Send an image hosted at a URL."""
+        return await self._require_line_notify().send_image_with_url(text, url)
+
+    async def send_image_with_local_path(
+        self, text: str, path: str
+    ) -> SendResult:
+        """Send an image read from a local file."""
+        return await self._require_line_notify().send_image_with_local_path(
+            text, path
+        )
+
+    async def send_sticker(
+        self, message: str, sticker_id: str, sticker_package_id: str
+    ) -> SendResult:
+        """Send a sticker."""
+        return await self._require_line_notify().send_sticker(
+            message, sticker_id, sticker_package_id
+        )
+
+    async def check_token_status(
+        self, data: Union[str, List[str]]
+    ) -> Union[StatusResult, Dict[str, StatusResult]]:
+        """Check the status of one token or a list of tokens."""
+        token_manager = self._require_token_manager()
+        if not data:
+            raise NezuNotifyValueError(
+                "A token is required to check the status."
+            )
+        if isinstance(data, list):
+            return await token_manager.check_token_statuses(data)
+        return await token_manager.check_token_status(data)
+
+    async def revoke(
+        self, data: Union[str, List[str]]
+    ) -> Union[RevokeResult, BulkRevokeResult]:
+        """Revoke one token or a list of tokens."""
+        token_manager = self._require_token_manager()
+        if not data:
+            raise NezuNotifyValueError("A token is required for revocation.")
+        if isinstance(data, str):
+            return await token_manager.revoke_token(data)
+        elif isinstance(data, list):
+            return await token_manager.revoke_all_tokens(data)
+        else:
+            raise NezuNotifyValueError("Data must be a string or a list.")
+
+    async def close(self) -> None:
+        """Close the pooled connections, unless the transport was passed
+        in."""
+        if self._owns_transport:
+            await self.transport.close()
+
+    async def __aenter__(self) -> "AsyncNezuNotify":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _require_line_notify(self) -> AsyncLineNotify:
+        if not self.line_notify:
+            raise NezuNotifyValueError(
+                "A token is required to send a message."
+            )
+        return self.line_notify
+
+    def _require_token_manager(self) -> AsyncTokenManager:
+        if not self.token_manager:
+            raise NezuNotifyValueError(
+                "CSRF and cookie are required for token management actions."
+            )
+        return self.token_manager
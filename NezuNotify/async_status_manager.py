@@ -0,0 +1,100 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from .async_transport import (
+    AsyncResponse,
+    AsyncTransport,
+    translate_async_error,
+)
+from .exceptions import NezuNotifyError
+from .results import StatusResult
+from .status_cache import STATUS_BLOCKED, STATUS_OK
+from .status_manager import DEFAULT_MAX_WORKERS
+from .urls import APIUrls
+
+
+class AsyncStatusManager:
+    def __init__(
+        self,
+        csrf: str,
+        cookie: str,
+        transport: Optional[AsyncTransport] = None,
+    ):
+        self.csrf = csrf
+        self.cookie = cookie
+        self.transport = transport or AsyncTransport()
+
+    async def check_token_statuses(
+        self, tokens: List[str], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> Dict[str, StatusResult]:
+        """
+        Check the status of multiple tokens concurrently.
+
+        Args:
+            tokens (List[str]): A list of tokens to check.
+            max_workers (int): Maximum number of requests in flight.
+
+        Returns:
+            Dict[str, StatusResult]: The outcome of each check, by token.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def check(token: str) -> StatusResult:
+            async with semaphore:
+                return await self.check_token_status(token)
+
+        results = await asyncio.gather(*(check(token) for token in tokens))
+        return dict(zip(tokens, results))
+
+    async def check_token_status(self, token: str) -> StatusResult:
+        """
+        Check the status of a single token.
+
+        Args:
+            token (str): The token to check.
+
+        Returns:
+            StatusResult: The outcome of the check.
+        """
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "X-CSRF-TOKEN": self.csrf,
+            "Cookie": self.cookie,
+        }
+        start = time.monotonic()
+        try:
+            response = await self.transport.request(
+                "GET", APIUrls.STATUS_URL, operation="status", headers=headers
+            )
+        except (
+            NezuNotifyError,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ) as error:
+            return StatusResult(
+                token,
+                f"Error: {str(error)}",
+                False,
+                elapsed=time.monotonic() - start,
+                error=translate_async_error(error),
+            )
+        status = self._determine_status(response)
+        return StatusResult(
+            token,
+            status,
+            status == STATUS_OK,
+            response.status_code,
+            time.monotonic() - start,
+            response.headers,
+        )
+
+    def _determine_status(self, response: AsyncResponse) -> str:
+        if response.status_code == 200:
+            return STATUS_OK
+        elif response.status_code == 401:
+            return STATUS_BLOCKED
+        else:
+            return f"Unexpected status code: {response.status_code}"
@@ -0,0 +1,40 @@
+from typing import Dict, List, Optional
+
+from .async_status_manager import AsyncStatusManager
+from .async_token_revoker import AsyncTokenRevoker
+from .async_transport import AsyncTransport
+from .results import BulkRevokeResult, RevokeResult, StatusResult
+from .status_manager import DEFAULT_MAX_WORKERS as STATUS_MAX_WORKERS
+from .token_revoker import DEFAULT_MAX_WORKERS
+
+
+class AsyncTokenManager:
+    def __init__(
+        self,
+        csrf: str,
+        cookie: str,
+        transport: Optional[AsyncTransport] = None,
+    ):
+        self.csrf = csrf
+        self.cookie = cookie
+        self.transport = transport or AsyncTransport()
+        self.token_revoker = AsyncTokenRevoker(csrf, cookie, self.transport)
+        self.status_manager = AsyncStatusManager(csrf, cookie, self.transport)
+
+    async def revoke_token(self, token: str) -> RevokeResult:
+        return await self.token_revoker.revoke(token)
+
+    async def revoke_all_tokens(
+        self, tokens: List[str], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> BulkRevokeResult:
+        return await self.token_revoker.revoke_many(tokens, max_workers)
+
+    async def check_token_status(self, token: str) -> StatusResult:
+        return await self.status_manager.check_token_status(token)
+
+    async def check_token_statuses(
+        self, tokens: List[str], max_workers: int = STATUS_MAX_WORKERS
+    ) -> Dict[str, StatusResult]:
+        return await self.status_manager.check_token_statuses(
+            tokens, max_workers
+        )
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from typing import List, Optional
+
+import aiohttp
+
+from .async_transport import AsyncTransport, translate_async_error
+from .exceptions import NezuNotifyError
+from .results import BulkRevokeResult, RevokeResult
+from .retry import NO_RETRY, RetryPolicy
+from .token_revoker import DEFAULT_MAX_WORKERS
+from .urls import APIUrls
+
+
+class AsyncTokenRevoker:
+    def __init__(
+        self,
+        csrf: str,
+        cookie: str,
+        transport: Optional[AsyncTransport] = None,
+    ):
+        self.csrf = csrf
+        self.cookie = cookie
+        self.transport = transport or AsyncTransport()
+        self.headers = {
+            "X-CSRF-Token": self.csrf,
+            "Cookie": self.cookie,
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+
+    async def revoke(self, token: str) -> RevokeResult:
+        return await self.revoke_with_result(token)
+
+    async def revoke_with_result(
+        self, token: str, retry_policy: Optional[RetryPolicy] = None
+    ) -> RevokeResult:
+        url = APIUrls.UNOFFICIAL_REVOKE_URL
+        payload = f"token={token}"
+        policy = retry_policy or self.transport.retry_policy("revoke")
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            response = None
+            try:
+                response = await self.transport.request(
+                    "POST",
+                    url,
+                    retry_policy=NO_RETRY,
+                    headers=self.headers,
+                    data=payload,
+                )
+                response.raise_for_status()
+                return RevokeResult(
+                    token,
+                    True,
+                    response.status_code,
+                    time.monotonic() - start,
+                    response.headers,
+                    attempts=attempt,
+                )
+            except (
+                NezuNotifyError,
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+            ) as e:
+                headers = None if response is None else response.headers
+                status_code = (
+                    None if response is None else response.status_code
+                )
+                delay = (
+                    policy.compute_delay(attempt, headers)
+                    if policy.should_retry(attempt, status_code)
+                    else None
+                )
+                if delay is None:
+                    return RevokeResult(
+                        token,
+                        False,
+                        status_code,
+                        time.monotonic() - start,
+                        headers,
+                        translate_async_error(e),
+                        attempt,
+                    )
+            await asyncio.sleep(delay)
+
+    async def revoke_many(
+        self,
+        tokens: List[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> BulkRevokeResult:
+        start = time.monotonic()
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def revoke(token: str) -> RevokeResult:
+            async with semaphore:
+                return await self.revoke_with_result(token, retry_policy)
+
+        results = await asyncio.gather(*(revoke(token) for token in tokens))
+        return BulkRevokeResult(list(results), time.monotonic() - start)
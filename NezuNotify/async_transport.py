@@ -0,0 +1,263 @@
+import asyncio
+import json
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import aiohttp
+from requests.structures import CaseInsensitiveDict
+
+from .exceptions import (
+    NezuNotifyAPIError,
+    NezuNotifyAuthError,
+    NezuNotifyCircuitOpenError,
+    NezuNotifyError,
+    NezuNotifyNetworkError,
+    NezuNotifyRateLimitError,
+)
+from .instrumentation import Instrumentation
+from .rate_limiter import parse_rate_limit_headers
+from .retry import NO_RETRY, CircuitBreaker, RetryPolicy
+from .transport import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_SIZES,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RETRY_POLICIES,
+)
+
+
+class AsyncResponse:
+    """Fully read HTTP response returned by AsyncTransport."""
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: Mapping[str, str],
+        text: str,
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        if self.status_code < 400:
+            return
+        message = f"HTTP error {self.status_code} for url: {self.url}"
+        if self.status_code == 401:
+            raise NezuNotifyAuthError(message)
+        if self.status_code == 429:
+            info = parse_rate_limit_headers(self.headers)
+            raise NezuNotifyRateLimitError(
+                info.limit if info else 0, info.reset if info else 0
+            )
+        raise NezuNotifyAPIError(message, self.status_code)
+
+
+def translate_async_error(error: BaseException) -> NezuNotifyError:
+    """
+    Convert an error raised by an async request into a NezuNotify exception.
+
+    Args:
+        error (BaseException): The exception to convert.
+
+    Returns:
+        NezuNotifyError: The typed NezuNotify exception.
+    """
+    if isinstance(error, NezuNotifyError):
+        return error
+    return NezuNotifyNetworkError(str(error) or type(error).__name__)
+
+
+class AsyncTransport:
+    """Pooled asyncio HTTP transport shared by the async clients."""
+
+    def __init__(
+        self,
+        pool_sizes: Optional[Dict[str, int]] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        instrumentation: Optional[Instrumentation] = None,
+        host_overrides: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize an AsyncTransport object.
+
+        Args:
+            pool_sizes (Optional[Dict[str, int]]): Maximum number of
+                keep-alive connections per base URL.
+            connect_timeout (float): Seconds to wait for a connection.
+            read_timeout (float): Seconds to wait for a response.
+            retry_policies (Optional[Dict[str, RetryPolicy]]): Retry policy
+                per operation, overriding DEFAULT_RETRY_POLICIES.
+            failure_threshold (int): Consecutive failures that open a
+                host's circuit.
+            recovery_timeout (float): Seconds an open circuit waits before
+                letting a probe through.
+            instrumentation (Optional[Instrumentation]): Hooks and metrics
+                run around every HTTP attempt.
+            host_overrides (Optional[Dict[str, str]]): Base URLs that
+                replace the LINE ones, keyed by the LINE base URL, e.g. to
+                point the client at a local test server.
+        """
+        self.pool_sizes = dict(DEFAULT_POOL_SIZES)
+        self.pool_sizes.update(pool_sizes or {})
+        self.timeout = aiohttp.ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self.retry_policies = dict(DEFAULT_RETRY_POLICIES)
+        self.retry_policies.update(retry_policies or {})
+        self.instrumentation = instrumentation
+        self.host_overrides = dict(host_overrides or {})
+        self.breakers = {
+            base_url: CircuitBreaker(failure_threshold, recovery_timeout)
+            for base_url in self.pool_sizes
+        }
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+
+    def retry_policy(self, operation: Optional[str]) -> RetryPolicy:
+        """Return the retry policy configured for an operation."""
+        if operation is None:
+            return NO_RETRY
+        return self.retry_policies.get(operation, NO_RETRY)
+
+    def circuit_states(self) -> Dict[str, str]:
+        """Return the circuit breaker state of every known host."""
+        return {
+            base_url: breaker.state
+            for base_url, breaker in self.breakers.items()
+        }
+
+    def _get_session(self, url: str) -> aiohttp.ClientSession:
+        # Sessions are created lazily because they must be bound to the
+        # running event loop. Each known host gets its own connector so the
+        # per-host pool sizes are enforced independently.
+        base_url = next(
+            (base for base in self.pool_sizes if url.startswith(f"{base}/")),
+            "",
+        )
+        session = self._sessions.get(base_url)
+        if session is None or session.closed:
+            limit = self.pool_sizes.get(base_url, 0)
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=limit),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=self.timeout,
+            )
+            self._sessions[base_url] = session
+        return session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        operation: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        **kwargs: Any,
+    ) -> AsyncResponse:
+        """
+        Send an HTTP request over the pooled session.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            operation (Optional[str]): Operation name selecting the retry
+                policy. Requests without one are not retried.
+            retry_policy (Optional[RetryPolicy]): Overrides the operation's
+                retry policy.
+            **kwargs: Extra arguments passed to aiohttp.ClientSession.request.
+
+        Returns:
+            AsyncResponse: The fully read HTTP response.
+
+        Raises:
+            NezuNotifyCircuitOpenError: If the host's circuit is open.
+        """
+        policy = retry_policy or self.retry_policy(operation)
+        breaker, host = self._breaker(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker and not breaker.allow():
+                raise NezuNotifyCircuitOpenError(host, breaker.retry_in())
+            event = None
+            if self.instrumentation is not None:
+                event = self.instrumentation.start(
+                    method, url, operation, attempt, kwargs
+                )
+            try:
+                response = await self._send(method, url, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if event is not None:
+                    event.finish(error=e)
+                if breaker:
+                    breaker.record_failure()
+                delay = (
+                    policy.compute_delay(attempt)
+                    if policy.should_retry(
+                        attempt,
+                        None,
+                        not isinstance(e, aiohttp.ClientConnectorError),
+                    )
+                    else None
+                )
+                if delay is None:
+                    raise
+            else:
+                if event is not None:
+                    event.finish(response)
+                if breaker:
+                    if response.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                if not policy.should_retry(attempt, response.status_code):
+                    return response
+                delay = policy.compute_delay(attempt, response.headers)
+                if delay is None:
+                    return response
+            await asyncio.sleep(delay)
+
+    async def _send(
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncResponse:
+        session = self._get_session(url)
+        if self.host_overrides:
+            url = self._override_host(url)
+        async with session.request(method, url, **kwargs) as response:
+            text = await response.text()
+            return AsyncResponse(
+                url,
+                response.status,
+                CaseInsensitiveDict(response.headers),
+                text,
+            )
+
+    def _override_host(self, url: str) -> str:
+        for base_url, target in self.host_overrides.items():
+            if url.startswith(f"{base_url}/"):
+                return f"{target}{url[len(base_url):]}"
+        return url
+
+    def _breaker(self, url: str) -> Tuple[Optional[CircuitBreaker], str]:
+        for base_url, breaker in self.breakers.items():
+            if url.startswith(f"{base_url}/"):
+                return breaker, base_url
+        return None, url
+
+    async def close(self) -> None:
+        """Close every pooled connection."""
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
+
+    async def __aenter__(self) -> "AsyncTransport":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
@@ -0,0 +1,379 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    cast,
+)
+
+from .exceptions import NezuNotifyError, NezuNotifyValueError
+from .messages import check_message, message_payload
+from .nezu_notify import NezuNotify
+from .rate_limiter import RateLimiter
+from .results import Result, SendResult
+from .status_manager import DEFAULT_MAX_WORKERS as STATUS_MAX_WORKERS
+from .token_manager import TokenManager
+from .token_pool import LEAST_LOADED, ROUND_ROBIN
+from .token_revoker import DEFAULT_MAX_WORKERS as REVOKE_MAX_WORKERS
+from .transport import Transport
+from .urls import APIUrls
+
+DEFAULT_CONCURRENCY = 4
+TOKEN_ENV = "LINE_NOTIFY_TOKEN"
+CSRF_ENV = "LINE_CSRF_TOKEN"
+COOKIE_ENV = "LINE_COOKIE"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="nezu-notify",
+        description="Send LINE Notify messages and manage tokens.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    send = commands.add_parser(
+        "send",
+        help="send the messages read from stdin, one per line",
+        description=(
+            "Send newline-delimited messages, or JSON lines with 'message' "
+            "and optional 'image' and 'sticker', from stdin. Failures are "
+            "written to stdout as JSON lines."
+        ),
+    )
+    send.add_argument(
+        "--token",
+        action="append",
+        help=(
+            f"LINE Notify token, defaults to ${TOKEN_ENV}. Repeat to spread "
+            "messages across several tokens."
+        ),
+    )
+    send.add_argument(
+        "--json",
+        action="store_true",
+        help="read JSON lines instead of plain text",
+    )
+    send.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="messages in flight (default: %(default)s)",
+    )
+    send.add_argument(
+        "--routing",
+        choices=(ROUND_ROBIN, LEAST_LOADED),
+        default=ROUND_ROBIN,
+        help="token selection with several tokens (default: %(default)s)",
+    )
+    send.add_argument(
+        "--max-wait",
+        type=float,
+        help=(
+            "longest time in seconds to wait for a token's quota to reset; "
+            "messages that would wait longer fail"
+        ),
+    )
+    send.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="fail messages instead of waiting when the quota is exhausted",
+    )
+
+    for name, help_text, workers in (
+        ("status", "check the status of tokens", STATUS_MAX_WORKERS),
+        ("revoke", "revoke tokens", REVOKE_MAX_WORKERS),
+    ):
+        command = commands.add_parser(
+            name,
+            help=help_text,
+            description=(
+                f"{help_text.capitalize()} read from files, one per line. "
+                "Results are written to stdout as JSON lines."
+            ),
+        )
+        command.add_argument(
+            "files",
+            nargs="*",
+            default=["-"],
+            help="token files, '-' for stdin (default)",
+        )
+        command.add_argument(
+            "--workers",
+            type=int,
+            default=workers,
+            help="requests in flight (default: %(default)s)",
+        )
+        command.add_argument(
+            "--csrf",
+            default=os.environ.get(CSRF_ENV),
+            help=f"CSRF token, defaults to ${CSRF_ENV}",
+        )
+        command.add_argument(
+            "--cookie",
+            default=os.environ.get(COOKIE_ENV),
+            help=f"session cookie, defaults to ${COOKIE_ENV}",
+        )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the nezu-notify command.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments, defaults to
+            sys.argv[1:].
+
+    Returns:
+        int: Exit status: 1 if any message failed to send, any token is
+            not OK or any revocation failed, and 2 on usage errors.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "send":
+            return run_send(args, sys.stdin, sys.stdout)
+        tokens = list(dict.fromkeys(read_tokens(args.files)))
+        if args.command == "status":
+            return run_status(args, tokens, sys.stdout)
+        return run_revoke(args, tokens, sys.stdout)
+    except (NezuNotifyValueError, OSError) as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        return 130
+
+
+def run_send(args: argparse.Namespace, stdin: TextIO, out: TextIO) -> int:
+    """Stream the messages on stdin through one pooled NezuNotify."""
+    tokens = args.token or [os.environ.get(TOKEN_ENV, "")]
+    tokens = [token for token in tokens if token]
+    if not tokens:
+        raise NezuNotifyValueError(
+            f"A token is required, use --token or ${TOKEN_ENV}."
+        )
+    if args.concurrency < 1:
+        raise NezuNotifyValueError("--concurrency must be at least 1.")
+    nezu = NezuNotify(
+        token=tokens[0],
+        tokens=tokens[1:] or None,
+        routing=args.routing,
+        transport=_transport(args.concurrency),
+        rate_limiter=RateLimiter(
+            fail_fast=args.fail_fast, max_wait=args.max_wait
+        ),
+    )
+    sent = failed = 0
+    try:
+        for line_number, result in send_lines(
+            nezu, stdin, args.json, args.concurrency
+        ):
+            if result.ok:
+                sent += 1
+                continue
+            failed += 1
+            _write(
+                out,
+                {
+                    "line": line_number,
+                    "ok": False,
+                    "status_code": result.status_code,
+                    "error": str(result.error),
+                },
+            )
+    finally:
+        nezu.close()
+    print(f"sent {sent}, failed {failed}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def send_lines(
+    nezu: NezuNotify,
+    lines: Iterable[str],
+    parse_json: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Iterator[Tuple[int, SendResult]]:
+    """
+    Send one message per line, keeping a bounded number in flight.
+
+    Lines are read only as capacity frees up, so arbitrarily long streams
+    are sent in constant memory. Blank lines are skipped.
+
+    Args:
+        nezu (NezuNotify): Client the messages are sent with.
+        lines (Iterable[str]): Message texts, or JSON objects when
+            parse_json is set.
+        parse_json (bool): Parse each line as a JSON object of send()
+            arguments.
+        concurrency (int): Maximum number of messages in flight.
+
+    Yields:
+        Tuple[int, SendResult]: The line number and outcome of each
+            message, in completion order.
+    """
+    pending: Set["Future[SendResult]"] = set()
+    line_numbers: Dict["Future[SendResult]", int] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for line_number, line in enumerate(lines, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            try:
+                payload = _parse_line(line, line_number, parse_json)
+            except NezuNotifyError as e:
+                yield line_number, SendResult(False, error=e)
+                continue
+            future = executor.submit(_send, nezu, payload)
+            pending.add(future)
+            line_numbers[future] = line_number
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield line_numbers.pop(future), future.result()
+        for future in pending:
+            yield line_numbers.pop(future), future.result()
+
+
+def run_status(
+    args: argparse.Namespace, tokens: List[str], out: TextIO
+) -> int:
+    """Check the status of tokens and write one JSON line per token."""
+    nezu, token_manager = _token_client(args)
+    try:
+        results = token_manager.check_token_statuses(tokens, args.workers)
+    finally:
+        nezu.close()
+    failed = 0
+    for token in tokens:
+        result = results[token]
+        failed += not result.ok
+        _write(
+            out, {"token": token, "status": result.status, **_fields(result)}
+        )
+    return 1 if failed else 0
+
+
+def run_revoke(
+    args: argparse.Namespace, tokens: List[str], out: TextIO
+) -> int:
+    """Revoke tokens and write one JSON line per token."""
+    nezu, token_manager = _token_client(args)
+    try:
+        bulk = token_manager.revoke_all_tokens(tokens, args.workers)
+    finally:
+        nezu.close()
+    for result in bulk.results:
+        _write(
+            out,
+            {
+                "token": result.token,
+                "attempts": result.attempts,
+                **_fields(result),
+            },
+        )
+    return 1 if bulk.failed else 0
+
+
+def read_tokens(paths: Iterable[str]) -> Iterator[str]:
+    """
+    Read tokens from files, one per line.
+
+    Blank lines and lines starting with '#' are skipped.
+
+    Args:
+        paths (Iterable[str]): File paths, '-' for stdin.
+
+    Yields:
+        str: Each token.
+    """
+    for path in paths:
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            for line in stream:
+                token = line.strip()
+                if token and not token.startswith("#"):
+                    yield token
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def _token_client(
+    args: argparse.Namespace,
+) -> Tuple[NezuNotify, TokenManager]:
+    if not args.csrf or not args.cookie:
+        raise NezuNotifyValueError(
+            f"CSRF and cookie are required, use --csrf and --cookie or "
+            f"${CSRF_ENV} and ${COOKIE_ENV}."
+        )
+    if args.workers < 1:
+        raise NezuNotifyValueError("--workers must be at least 1.")
+    nezu = NezuNotify(
+        csrf=args.csrf, cookie=args.cookie, transport=_transport(args.workers)
+    )
+    return nezu, cast(TokenManager, nezu.token_manager)
+
+
+def _transport(pool_size: int) -> Transport:
+    """A transport with a connection per worker, so none is reopened."""
+    return Transport(
+        {
+            APIUrls.BASE_URL: pool_size,
+            APIUrls.UNOFFICIAL_BASE_URL: pool_size,
+        }
+    )
+
+
+def _parse_line(
+    line: str, line_number: int, parse_json: bool
+) -> Dict[str, Any]:
+    if not parse_json:
+        return {"message": line}
+    try:
+        message = json.loads(line)
+    except ValueError as e:
+        raise NezuNotifyValueError(
+            f"Line {line_number}: invalid JSON: {e}"
+        ) from e
+    if not isinstance(message, dict):
+        raise NezuNotifyValueError(
+            f"Line {line_number}: JSON lines must be objects."
+        )
+    problem = check_message(message)
+    if problem:
+        raise NezuNotifyValueError(f"Line {line_number}: {problem}")
+    return message_payload(message)
+
+
+def _send(nezu: NezuNotify, payload: Dict[str, Any]) -> SendResult:
+    try:
+        return nezu.send(**payload)
+    except NezuNotifyError as e:
+        return SendResult(False, error=e)
+
+
+def _fields(result: Result) -> Dict[str, Any]:
+    return {
+        "ok": result.ok,
+        "status_code": result.status_code,
+        "error": None if result.error is None else str(result.error),
+    }
+
+
+def _write(out: TextIO, record: Dict[str, Any]) -> None:
+    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    out.flush()
@@ -0,0 +1,187 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Union
+
+from .exceptions import NezuNotifyError, NezuNotifyValueError
+from .line_notify import MAX_MESSAGE_LENGTH, LineNotify
+from .results import SendResult
+from .token_pool import TokenPool
+
+
+def coalesce(
+    messages: List[str],
+    max_length: int = MAX_MESSAGE_LENGTH,
+    dedupe: bool = False,
+) -> List[str]:
+    """
+    Merge messages into as few LINE messages as possible.
+
+    Messages are joined line by line and split at line boundaries so that
+    no merged message exceeds max_length. A single line longer than
+    max_length is cut into pieces.
+
+    Args:
+        messages (List[str]): Messages in the order they were submitted.
+        max_length (int): Maximum length of a merged message.
+        dedupe (bool): Collapse identical lines into one line with a repeat
+            count, keeping the position of the first occurrence.
+
+    Returns:
+        List[str]: The merged messages.
+    """
+    lines: List[str] = []
+    for message in messages:
+        lines.extend(message.splitlines() or [""])
+    if dedupe:
+        counts: Dict[str, int] = OrderedDict()
+        for line in lines:
+            counts[line] = counts.get(line, 0) + 1
+        lines = [
+            f"{line} (x{count})" if count > 1 else line
+            for line, count in counts.items()
+        ]
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in lines:
+        while len(line) > max_length:
+            if current:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            chunks.append(line[:max_length])
+            line = line[max_length:]
+        added = len(line) + (1 if current else 0)
+        if current and size + added > max_length:
+            chunks.append("\n".join(current))
+            current, size = [line], len(line)
+        else:
+            current.append(line)
+            size += added
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class MessageCoalescer:
+    """
+    Buffer text messages and send them merged.
+
+    Messages submitted within window seconds of the first buffered message
+    are merged into as few LINE messages as the length limit allows. The
+    buffer is flushed early once it holds max_messages messages.
+    """
+
+    def __init__(
+        self,
+        sender: Union[LineNotify, TokenPool],
+        window: float = 1.0,
+        max_messages: int = 50,
+        dedupe: bool = False,
+        max_length: int = MAX_MESSAGE_LENGTH,
+    ):
+        """
+        Initialize a MessageCoalescer object.
+
+        Args:
+            sender (Union[LineNotify, TokenPool]): Sender for the merged
+                messages. Failed sends are logged.
+            window (float): Seconds to buffer before flushing.
+            max_messages (int): Buffered messages that trigger an early
+                flush.
+            dedupe (bool): Collapse identical lines with a repeat count.
+            max_length (int): Maximum length of a merged message.
+        """
+        self.sender = sender
+        self.window = window
+        self.max_messages = max_messages
+        self.dedupe = dedupe
+        self.max_length = max_length
+        self._buffer: List[str] = []
+        self._on_fail: List[Callable[[], None]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered messages."""
+        with self._lock:
+            return len(self._buffer)
+
+    def submit(
+        self, message: str, on_fail: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Add a message to the buffer.
+
+        Args:
+            message (str): Message text.
+            on_fail (Optional[Callable[[], None]]): Called when a merged
+                send of the flush that takes the message fails. Which merged
+                message held which input is not tracked, so the callbacks of
+                every message in that flush are called.
+
+        Raises:
+            NezuNotifyValueError: If the message is not a non-empty string.
+        """
+        if not isinstance(message, str) or not message:
+            raise NezuNotifyValueError("A message must be a non-empty string.")
+        with self._lock:
+            self._buffer.append(message)
+            if on_fail is not None:
+                self._on_fail.append(on_fail)
+            full = len(self._buffer) >= self.max_messages
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> List[SendResult]:
+        """
+        Send everything buffered so far.
+
+        A failed send does not stop the others. Its error is logged and
+        returned in its result, so a flush run by the timer never raises.
+
+        Returns:
+            List[SendResult]: The outcome of each merged send.
+        """
+        with self._lock:
+            messages, self._buffer = self._buffer, []
+            on_fail, self._on_fail = self._on_fail, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not messages:
+            return []
+        results = []
+        for chunk in coalesce(messages, self.max_length, self.dedupe):
+            try:
+                result = self.sender.send_message(chunk)
+            except NezuNotifyError as e:
+                result = SendResult(False, error=e)
+            except Exception as e:
+                result = SendResult(
+                    False, error=NezuNotifyError(f"Failed to send: {e}")
+                )
+            if not result:
+                logging.error(
+                    f"Failed to send coalesced messages: {result.error}"
+                )
+            results.append(result)
+        if not all(results):
+            for callback in on_fail:
+                try:
+                    callback()
+                except Exception as e:
+                    logging.warning(
+                        f"Coalescer on_fail callback failed: {e!r}"
+                    )
+        return results
+
+    def close(self) -> None:
+        """Flush the buffer and stop the timer."""
+        self.flush()
@@ -0,0 +1,48 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+def connect(path: str, schema: str) -> sqlite3.Connection:
+    """
+    Open a SQLite file shared by threads and processes.
+
+    The connection runs in autocommit mode with write-ahead logging and
+    waits up to 30 seconds for a lock held by another process. The schema
+    is created if it does not exist yet.
+
+    Args:
+        path (str): SQLite database file.
+        schema (str): CREATE ... IF NOT EXISTS statements.
+
+    Returns:
+        sqlite3.Connection: The open connection.
+    """
+    conn = sqlite3.connect(
+        path, check_same_thread=False, isolation_level=None, timeout=30
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(schema)
+    return conn
+
+
+@contextmanager
+def transaction(
+    conn: sqlite3.Connection, lock: threading.Lock
+) -> Iterator[None]:
+    """
+    Run the block in an IMMEDIATE transaction, rolled back on error.
+
+    Args:
+        conn (sqlite3.Connection): Connection opened by connect.
+        lock (threading.Lock): Lock serializing the threads sharing conn.
+    """
+    with lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
@@ -0,0 +1,165 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Mapping, Optional
+
+from .results import SendResult
+
+DEFAULT_WINDOW = 300.0
+DEFAULT_MAX_ENTRIES = 100_000
+# Keys are stored as digests of this many bytes, whatever their source.
+KEY_SIZE = 16
+
+
+def dedup_key(
+    scope: str,
+    payload: Mapping[str, Any],
+    idempotency_key: Optional[str] = None,
+) -> Optional[bytes]:
+    """
+    Derive the deduplication key of a send.
+
+    An explicit idempotency key identifies the send on its own. Otherwise
+    the key is a hash of the message, the image and the sticker. Image
+    URLs and paths are hashed by name and in-memory images by content.
+
+    Args:
+        scope (str): Keys only match within a scope, normally the token.
+        payload (Mapping[str, Any]): LineNotify.send arguments.
+        idempotency_key (Optional[str]): Caller-supplied key.
+
+    Returns:
+        Optional[bytes]: The key, or None when the send cannot be keyed
+            because its image is a file object.
+    """
+    digest = hashlib.blake2b(digest_size=KEY_SIZE)
+    _update(digest, scope.encode())
+    if idempotency_key is not None:
+        _update(digest, b"key")
+        _update(digest, idempotency_key.encode())
+        return digest.digest()
+    for name in ("message", "image", "sticker"):
+        value = payload.get(name)
+        if value is None:
+            continue
+        if isinstance(value, str):
+            data = value.encode()
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            data = bytes(value)
+        elif isinstance(value, tuple):
+            data = "\0".join(map(str, value)).encode()
+        else:
+            return None
+        _update(digest, name.encode())
+        _update(digest, data)
+    return digest.digest()
+
+
+def _update(digest: Any, data: bytes) -> None:
+    # Length prefixes keep ("ab", "c") and ("a", "bc") apart.
+    digest.update(len(data).to_bytes(8, "big"))
+    digest.update(data)
+
+
+class DedupCache:
+    """
+    Keys of recent sends, so a repeat within the window is suppressed.
+
+    Keys are fixed-size digests kept in insertion order, which with a
+    single window is also expiry order: expired keys are dropped from the
+    front on every claim, and the oldest keys are evicted first once
+    max_entries is reached.
+    """
+
+    def __init__(
+        self,
+        window: float = DEFAULT_WINDOW,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Initialize a DedupCache object.
+
+        Args:
+            window (float): Seconds during which a repeated send is
+                suppressed.
+            max_entries (int): Most keys kept at once.
+        """
+        self.window = window
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def claim(self, key: bytes) -> bool:
+        """
+        Record a send unless the key was claimed within the window.
+
+        Claiming is atomic, so of several concurrent sends with the same
+        key exactly one goes ahead.
+
+        Args:
+            key (bytes): Key from dedup_key().
+
+        Returns:
+            bool: True if the send should go ahead, False for a duplicate.
+        """
+        now = time.monotonic()
+        with self._lock:
+            while self._entries:
+                oldest, expires_at = next(iter(self._entries.items()))
+                if expires_at > now:
+                    break
+                del self._entries[oldest]
+            if key in self._entries:
+                return False
+            self._entries[key] = now + self.window
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def release(self, key: bytes) -> None:
+        """Forget a key, so a send that failed can be retried."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def send_once(
+        self,
+        key: Optional[bytes],
+        send: Callable[[], SendResult],
+        token: Optional[str] = None,
+    ) -> SendResult:
+        """
+        Send unless the key was claimed within the window.
+
+        The key is released again when the send fails, so only delivered
+        or queued messages are suppressed.
+
+        Args:
+            key (Optional[bytes]): Key from dedup_key(). None always sends.
+            send (Callable[[], SendResult]): Performs the send.
+            token (Optional[str]): Token reported on a suppressed send.
+
+        Returns:
+            SendResult: The outcome of the send, or a successful result
+                with duplicate set when it was suppressed.
+        """
+        if key is None:
+            return send()
+        if not self.claim(key):
+            return SendResult(True, token=token, duplicate=True)
+        try:
+            result = send()
+        except BaseException:
+            self.release(key)
+            raise
+        if not result.ok:
+            self.release(key)
+        return result
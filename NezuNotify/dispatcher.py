@@ -0,0 +1,445 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .exceptions import (
+    NezuNotifyError,
+    NezuNotifyExpiredError,
+    NezuNotifyRateLimitError,
+    NezuNotifyValueError,
+)
+from .line_notify import LineNotify
+from .multipart import ImageSource
+from .results import SendResult
+from .token_pool import TokenPool
+
+CRITICAL = "critical"
+HIGH = "high"
+NORMAL = "normal"
+LOW = "low"
+# Highest priority first.
+PRIORITIES = (CRITICAL, HIGH, NORMAL, LOW)
+
+DROP = "drop"
+DOWNGRADE = "downgrade"
+EXPIRY_ACTIONS = (DROP, DOWNGRADE)
+
+NO_DEADLINE = float("inf")
+
+
+class _Entry:
+    __slots__ = (
+        "payload",
+        "priority",
+        "deadline",
+        "on_expire",
+        "submitted",
+        "future",
+        "seq",
+    )
+
+    def __init__(
+        self,
+        payload: Dict[str, Any],
+        priority: str,
+        deadline: float,
+        on_expire: str,
+    ):
+        self.payload = payload
+        self.priority = priority
+        self.deadline = deadline
+        self.on_expire = on_expire
+        self.submitted = time.monotonic()
+        self.future: "Future[SendResult]" = Future()
+        # Sequence number of the entry's live queue item, None when it is
+        # not queued. Items with any other number are stale.
+        self.seq: Optional[int] = None
+
+
+class _LaneStats:
+    __slots__ = (
+        "depth",
+        "submitted",
+        "sent",
+        "failed",
+        "expired",
+        "downgraded",
+        "total_wait",
+        "max_wait",
+    )
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.submitted = 0
+        self.sent = 0
+        self.failed = 0
+        self.expired = 0
+        self.downgraded = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class PriorityDispatcher:
+    """
+    Send messages by priority lane and deadline.
+
+    Messages wait in one queue ordered by lane, then by deadline. Worker
+    threads take the most urgent message whenever the sender's rate-limit
+    budget allows, so when the budget runs low critical messages go out
+    before informational ones. The last reserve requests of each window
+    are kept for the critical lane. A message that passes its deadline
+    while queued is dropped, or moved to the low lane with no deadline,
+    instead of being sent late.
+
+    Deadlines are tracked in a second heap. Messages leaving either heap
+    are only marked, and their stale items skipped when they surface, so
+    queueing, sending and expiring a message are all O(log n).
+    """
+
+    def __init__(
+        self,
+        sender: Union[LineNotify, TokenPool],
+        workers: int = 1,
+        reserve: int = 0,
+        on_expire: str = DROP,
+    ):
+        """
+        Initialize a PriorityDispatcher object.
+
+        Args:
+            sender (Union[LineNotify, TokenPool]): Sender for the messages.
+                It must have a rate limiter, whose quota the dispatcher
+                schedules against.
+            workers (int): Number of sending threads.
+            reserve (int): Requests per rate-limit window that only the
+                critical lane may use.
+            on_expire (str): Default handling of expired messages, 'drop'
+                or 'downgrade'.
+
+        Raises:
+            NezuNotifyValueError: If the sender has no rate limiter or an
+                argument is invalid.
+        """
+        rate_limiter = sender.rate_limiter
+        if rate_limiter is None:
+            raise NezuNotifyValueError(
+                "The dispatcher needs a sender with a rate limiter."
+            )
+        if workers < 1:
+            raise NezuNotifyValueError("workers must be at least 1.")
+        _check_expiry_action(on_expire)
+        self.sender = sender
+        self.rate_limiter = rate_limiter
+        self.workers = workers
+        self.reserve = reserve
+        self.on_expire = on_expire
+        self._queue: List[Tuple[int, float, int, _Entry]] = []
+        self._deadlines: List[Tuple[float, int, _Entry]] = []
+        self._sequence = itertools.count()
+        self._claimed = 0
+        self._stats = {priority: _LaneStats() for priority in PRIORITIES}
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        self._draining = True
+        self._condition = threading.Condition()
+
+    def start(self) -> None:
+        """Start the sending threads."""
+        with self._condition:
+            self._closed = False
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run,
+                name=f"NezuNotifyDispatcher-{i}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(
+        self, drain: bool = True, timeout: Optional[float] = None
+    ) -> None:
+        """
+        Stop the sending threads.
+
+        Args:
+            drain (bool): Send the queued messages first. Otherwise they
+                are cancelled.
+            timeout (Optional[float]): Seconds to wait in all. Messages
+                still queued when it runs out are cancelled.
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._closed = True
+            self._draining = drain
+            self._condition.notify_all()
+            while drain and self._head() is not None:
+                if end is None:
+                    self._condition.wait()
+                elif not self._condition.wait(end - time.monotonic()):
+                    break
+            self._draining = False
+            while self._head() is not None:
+                entry = heapq.heappop(self._queue)[-1]
+                entry.seq = None
+                self._stats[entry.priority].depth -= 1
+                entry.future.cancel()
+            self._deadlines.clear()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(
+                None if end is None else max(end - time.monotonic(), 0)
+            )
+        self._threads.clear()
+
+    def submit(
+        self,
+        message: str,
+        image: Optional[ImageSource] = None,
+        sticker: Optional[Tuple[str, str]] = None,
+        priority: str = NORMAL,
+        ttl: Optional[float] = None,
+        on_expire: Optional[str] = None,
+    ) -> "Future[SendResult]":
+        """
+        Queue a message.
+
+        Args:
+            message (str): Message text.
+            image (Optional[ImageSource]): Image URL, local file path,
+                image bytes or binary file object.
+            sticker (Optional[Tuple[str, str]]): Sticker package ID and
+                sticker ID.
+            priority (str): 'critical', 'high', 'normal' or 'low'.
+            ttl (Optional[float]): Seconds after which the message is no
+                longer worth sending. None never expires.
+            on_expire (Optional[str]): Overrides the dispatcher's handling
+                of expired messages.
+
+        Returns:
+            Future[SendResult]: Resolves to the outcome of the send. An
+                expired message resolves to a failed result carrying
+                NezuNotifyExpiredError.
+
+        Raises:
+            NezuNotifyValueError: If the priority or expiry handling is
+                invalid.
+            NezuNotifyError: If the dispatcher is stopped.
+        """
+        if priority not in PRIORITIES:
+            raise NezuNotifyValueError(
+                "Invalid priority. It must be 'critical', 'high', 'normal' "
+                "or 'low'."
+            )
+        if on_expire is None:
+            on_expire = self.on_expire
+        _check_expiry_action(on_expire)
+        payload: Dict[str, Any] = {"message": message}
+        if image is not None:
+            payload["image"] = image
+        if sticker is not None:
+            payload["sticker"] = sticker
+        entry = _Entry(
+            payload,
+            priority,
+            NO_DEADLINE if ttl is None else time.monotonic() + ttl,
+            on_expire,
+        )
+        with self._condition:
+            if self._closed:
+                raise NezuNotifyError("The dispatcher is stopped.")
+            self._stats[priority].submitted += 1
+            self._push(entry)
+            self._condition.notify()
+        return entry.future
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-lane queue statistics.
+
+        Returns:
+            Dict[str, Dict[str, float]]: For each lane, the queue depth,
+                the age in seconds of its oldest queued message, counts of
+                submitted, sent, failed, expired and downgraded messages,
+                and the mean and maximum seconds sent messages waited.
+        """
+        now = time.monotonic()
+        with self._condition:
+            oldest = {priority: 0.0 for priority in PRIORITIES}
+            for _, _, seq, entry in self._queue:
+                if seq != entry.seq:
+                    continue
+                age = now - entry.submitted
+                oldest[entry.priority] = max(oldest[entry.priority], age)
+            return {
+                priority: {
+                    "depth": lane.depth,
+                    "oldest_age": oldest[priority],
+                    "submitted": lane.submitted,
+                    "sent": lane.sent,
+                    "failed": lane.failed,
+                    "expired": lane.expired,
+                    "downgraded": lane.downgraded,
+                    "mean_wait": (
+                        lane.total_wait / (lane.sent + lane.failed)
+                        if lane.sent + lane.failed
+                        else 0.0
+                    ),
+                    "max_wait": lane.max_wait,
+                }
+                for priority, lane in self._stats.items()
+            }
+
+    def _push(self, entry: _Entry) -> None:
+        entry.seq = next(self._sequence)
+        heapq.heappush(
+            self._queue,
+            (
+                PRIORITIES.index(entry.priority),
+                entry.deadline,
+                entry.seq,
+                entry,
+            ),
+        )
+        if entry.deadline != NO_DEADLINE:
+            heapq.heappush(self._deadlines, (entry.deadline, entry.seq, entry))
+        self._stats[entry.priority].depth += 1
+
+    def _head(self) -> Optional[Tuple[int, float, int, _Entry]]:
+        """The most urgent live queue item, dropping stale ones."""
+        while self._queue and self._queue[0][2] != self._queue[0][3].seq:
+            heapq.heappop(self._queue)
+        return self._queue[0] if self._queue else None
+
+    def _next_deadline(self) -> float:
+        """The earliest deadline of a queued message, dropping stale
+        items."""
+        while self._deadlines and (
+            self._deadlines[0][1] != self._deadlines[0][2].seq
+        ):
+            heapq.heappop(self._deadlines)
+        return self._deadlines[0][0] if self._deadlines else NO_DEADLINE
+
+    def _run(self) -> None:
+        while True:
+            entry = self._next()
+            if entry is None:
+                return
+            try:
+                self._send(entry)
+            finally:
+                with self._condition:
+                    self._claimed -= 1
+                    self._condition.notify_all()
+
+    def _next(self) -> Optional[_Entry]:
+        """Wait for a message the budget allows and claim it."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                head = self._head()
+                if head is None:
+                    if self._closed:
+                        return None
+                    self._condition.wait()
+                    continue
+                if self._closed and not self._draining:
+                    return None
+                budget, reset_in = self._budget()
+                reserve = 0 if head[0] == 0 else self.reserve
+                if budget is None or budget > reserve:
+                    entry = heapq.heappop(self._queue)[-1]
+                    entry.seq = None
+                    self._stats[entry.priority].depth -= 1
+                    self._claimed += 1
+                    return entry
+                # Wake for the next window, the next deadline or a newly
+                # queued, possibly more urgent, message.
+                deadline = self._next_deadline()
+                self._condition.wait(max(min(reset_in, deadline - now), 0.0))
+
+    def _budget(self) -> Tuple[Optional[int], float]:
+        """Requests left across the sender's tokens, and seconds until the
+        first window resets. None when a token's quota is unknown."""
+        if isinstance(self.sender, TokenPool):
+            tokens = self.sender.tokens
+        else:
+            tokens = [self.sender.token]
+        now = time.time()
+        remaining = -self._claimed
+        reset_in = NO_DEADLINE
+        for token in tokens:
+            state = self.rate_limiter.get(token)
+            if state is None or state.reset <= now:
+                return None, 0.0
+            remaining += max(state.remaining - self.rate_limiter.reserve, 0)
+            reset_in = min(reset_in, state.reset - now)
+        return remaining, reset_in
+
+    def _expire(self, now: float) -> None:
+        """Drop or downgrade every queued message past its deadline."""
+        while self._next_deadline() <= now:
+            entry = heapq.heappop(self._deadlines)[-1]
+            # Its item in the main queue becomes stale.
+            entry.seq = None
+            lane = self._stats[entry.priority]
+            lane.depth -= 1
+            if entry.on_expire == DOWNGRADE and entry.priority != LOW:
+                lane.downgraded += 1
+                entry.priority = LOW
+                entry.deadline = NO_DEADLINE
+                self._push(entry)
+                continue
+            lane.expired += 1
+            entry.future.set_result(
+                SendResult(
+                    False,
+                    error=NezuNotifyExpiredError(
+                        entry.priority, now - entry.submitted
+                    ),
+                )
+            )
+
+    def _send(self, entry: _Entry) -> None:
+        waited = time.monotonic() - entry.submitted
+        try:
+            result = self.sender.send(**entry.payload)
+        except NezuNotifyError as e:
+            result = SendResult(False, error=e)
+        except Exception as e:
+            result = SendResult(
+                False, error=NezuNotifyError(f"Failed to send: {e}")
+            )
+        with self._condition:
+            if isinstance(result.error, NezuNotifyRateLimitError) and not (
+                self._closed and not self._draining
+            ):
+                # The quota ran out under us: queue the message again to
+                # compete with whatever arrives before the reset.
+                self._push(entry)
+                self._condition.notify()
+                return
+            lane = self._stats[entry.priority]
+            if result.ok:
+                lane.sent += 1
+            else:
+                lane.failed += 1
+                logging.error(
+                    f"Failed to send a {entry.priority} message: "
+                    f"{result.error}"
+                )
+            lane.total_wait += waited
+            lane.max_wait = max(lane.max_wait, waited)
+        entry.future.set_result(result)
+
+
+def _check_expiry_action(on_expire: str) -> None:
+    if on_expire not in EXPIRY_ACTIONS:
+        raise NezuNotifyValueError(
+            "Invalid expiry action. It must be 'drop' or 'downgrade'."
+        )
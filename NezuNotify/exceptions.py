@@ -1,3 +1,6 @@
+from typing import Any, Dict, Optional, Tuple, Type
+
+
 class NezuNotifyError(Exception):
     """Base exception class for NezuNotify"""
 
@@ -5,6 +8,20 @@ class NezuNotifyError(Exception):
         self.message = message
         super().__init__(f"[NezuNotify] {self.message}")
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Subclasses take different constructor arguments, so errors are
+        # rebuilt from their state when passed between processes.
+        return _restore, (type(self), self.args, self.__dict__)
+
+
+def _restore(
+    cls: Type[NezuNotifyError], args: Tuple[Any, ...], state: Dict[str, Any]
+) -> NezuNotifyError:
+    error = cls.__new__(cls)
+    error.args = args
+    error.__dict__.update(state)
+    return error
+
 
 class NezuNotifyValueError(NezuNotifyError):
     """Exception raised when an invalid value is provided"""
@@ -23,7 +40,7 @@ class NezuNotifyAuthError(NezuNotifyError):
 class NezuNotifyAPIError(NezuNotifyError):
     """Exception raised when an API call fails"""
 
-    def __init__(self, message: str, status_code: int = None):
+    def __init__(self, message: str, status_code: Optional[int] = None):
         error_message = f"API error: {message}"
         if status_code:
             error_message += f" (Status code: {status_code})"
@@ -47,3 +64,26 @@ class NezuNotifyNetworkError(NezuNotifyError):
 
     def __init__(self, message: str):
         super().__init__(f"Network error: {message}")
+
+
+class NezuNotifyCircuitOpenError(NezuNotifyNetworkError):
+    """Exception raised when a host's circuit breaker is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(
+            f"Circuit open for {host}, retry in {retry_in:.1f} seconds"
+        )
+        self.host = host
+        self.retry_in = retry_in
+
+
+class NezuNotifyExpiredError(NezuNotifyError):
+    """Exception raised when a queued message passes its deadline"""
+
+    def __init__(self, priority: str, waited: float):
+        super().__init__(
+            f"Message expired after waiting {waited:.1f} seconds in the "
+            f"'{priority}' lane"
+        )
+        self.priority = priority
+        self.waited = waited
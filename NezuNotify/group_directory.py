@@ -0,0 +1,220 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .exceptions import NezuNotifyAPIError
+
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_STALE = 3600.0
+DEFAULT_MAX_WORKERS = 4
+PAGE_COUNT_KEYS = ("totalPage", "totalPages", "pageCount")
+
+PageFetcher = Callable[[int], Dict[str, Any]]
+
+
+class GroupDirectory:
+    """
+    In-memory index of every group the account belongs to.
+
+    Groups are indexed by MID and by name. Lookups are served from memory;
+    once the directory is older than ttl it is still served for up to
+    max_stale seconds while a background refresh runs. The directory can
+    be persisted to a JSON snapshot so a new process starts warm.
+    """
+
+    def __init__(
+        self,
+        fetch_page: PageFetcher,
+        ttl: float = DEFAULT_TTL,
+        max_stale: float = DEFAULT_MAX_STALE,
+        snapshot_path: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        """
+        Initialize a GroupDirectory object.
+
+        Args:
+            fetch_page (PageFetcher): Returns the decoded group list page
+                for a 1-based page number, raising NezuNotifyError on
+                failure.
+            ttl (float): Seconds the directory is considered fresh.
+            max_stale (float): Seconds past ttl that the directory is still
+                served while it is refreshed in the background.
+            snapshot_path (Optional[str]): JSON file the directory is loaded
+                from and saved to.
+            max_workers (int): Maximum number of pages fetched at once.
+        """
+        self.fetch_page = fetch_page
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.snapshot_path = snapshot_path
+        self.max_workers = max_workers
+        self._groups: List[Dict[str, str]] = []
+        self._by_mid: Dict[str, Dict[str, str]] = {}
+        self._by_name: Dict[str, List[Dict[str, str]]] = {}
+        self._fetched_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        if snapshot_path:
+            self._load_snapshot()
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the directory was fetched, or None if never."""
+        with self._lock:
+            if self._fetched_at is None:
+                return None
+            return time.time() - self._fetched_at
+
+    def groups(self) -> List[Dict[str, str]]:
+        """Return every group."""
+        self._ensure_fresh()
+        with self._lock:
+            return list(self._groups)
+
+    def get(self, mid: str) -> Optional[Dict[str, str]]:
+        """Return the group with the given MID, or None."""
+        self._ensure_fresh()
+        with self._lock:
+            return self._by_mid.get(mid)
+
+    def find_by_name(self, name: str) -> List[Dict[str, str]]:
+        """Return every group with the given name."""
+        self._ensure_fresh()
+        with self._lock:
+            return list(self._by_name.get(name, []))
+
+    def invalidate(self) -> None:
+        """Force the next lookup to fetch the directory again."""
+        with self._lock:
+            self._fetched_at = None
+
+    def refresh(self) -> None:
+        """
+        Fetch every page and replace the directory.
+
+        Raises:
+            NezuNotifyError: If a page cannot be fetched.
+        """
+        self._refresh()
+
+    def _refresh(self, max_age: Optional[float] = None) -> None:
+        with self._refresh_lock:
+            # A caller that waited for the lock may find the directory
+            # already refreshed by the caller it waited for.
+            age = self.age
+            if max_age is not None and age is not None and age <= max_age:
+                return
+            groups = self._fetch_all()
+            self._replace(groups, time.time())
+        if self.snapshot_path:
+            self._save_snapshot()
+
+    def _ensure_fresh(self) -> None:
+        age = self.age
+        if age is None or age > self.ttl + self.max_stale:
+            self._refresh(self.ttl)
+        elif age > self.ttl:
+            self._refresh_in_background()
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self._refresh(self.ttl)
+        except Exception as e:
+            logging.warning(f"Failed to refresh the group directory: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _fetch_all(self) -> List[Dict[str, str]]:
+        first = self.fetch_page(1)
+        pages = [first]
+        page_count = _page_count(first)
+        if page_count is not None:
+            if page_count > 1:
+                with ThreadPoolExecutor(self.max_workers) as executor:
+                    pages.extend(
+                        executor.map(self.fetch_page, range(2, page_count + 1))
+                    )
+        else:
+            # Without a page count, pages are followed one by one until an
+            # empty page, hasNext false, or a page seen before.
+            seen = {group.get("mid") for group in _results(first)}
+            data, page = first, 1
+            while data.get("hasNext", True) and _results(data):
+                page += 1
+                data = self.fetch_page(page)
+                mids = {group.get("mid") for group in _results(data)}
+                if not mids or mids <= seen:
+                    break
+                seen |= mids
+                pages.append(data)
+        groups: List[Dict[str, str]] = []
+        mids_added = set()
+        for data in pages:
+            for group in _results(data):
+                if group.get("mid") not in mids_added:
+                    mids_added.add(group.get("mid"))
+                    groups.append(group)
+        return groups
+
+    def _replace(
+        self, groups: List[Dict[str, str]], fetched_at: float
+    ) -> None:
+        by_mid = {group["mid"]: group for group in groups if "mid" in group}
+        by_name: Dict[str, List[Dict[str, str]]] = {}
+        for group in groups:
+            by_name.setdefault(group.get("name", ""), []).append(group)
+        with self._lock:
+            self._groups = groups
+            self._by_mid = by_mid
+            self._by_name = by_name
+            self._fetched_at = fetched_at
+
+    def _load_snapshot(self) -> None:
+        try:
+            with open(str(self.snapshot_path), encoding="utf-8") as file:
+                snapshot = json.load(file)
+            self._replace(snapshot["groups"], float(snapshot["fetched_at"]))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable group snapshot: {e}")
+
+    def _save_snapshot(self) -> None:
+        with self._lock:
+            snapshot = {"fetched_at": self._fetched_at, "groups": self._groups}
+        path = str(self.snapshot_path)
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(snapshot, file, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logging.warning(f"Failed to save the group snapshot: {e}")
+
+
+def _results(data: Dict[str, Any]) -> List[Dict[str, str]]:
+    results = data.get("results", [])
+    if not isinstance(results, list):
+        raise NezuNotifyAPIError("Unexpected group list response.")
+    return results
+
+
+def _page_count(data: Dict[str, Any]) -> Optional[int]:
+    for key in PAGE_COUNT_KEYS:
+        if isinstance(data.get(key), int):
+            return int(data[key])
+    return None
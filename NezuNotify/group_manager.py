@@ -1,14 +1,25 @@
-import json
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 import requests
 
+from .exceptions import NezuNotifyAPIError
+from .group_directory import DEFAULT_TTL, GroupDirectory
+from .results import TokenResult
+from .token_provisioner import TokenProvisioner
+from .transport import Transport, translate_error
 from .urls import APIUrls
 
 
 class GroupManager:
-    def __init__(self, csrf: str, cookie: str):
-        self.session = requests.Session()
+    def __init__(
+        self,
+        csrf: str,
+        cookie: str,
+        transport: Optional[Transport] = None,
+        group_ttl: float = DEFAULT_TTL,
+        group_snapshot: Optional[str] = None,
+    ):
+        self.transport = transport or Transport()
         self.csrf = csrf
         self.cookie = cookie
         self.headers = {
@@ -28,77 +39,78 @@ class GroupManager:
             "X-CSRF-Token": self.csrf,
             "Cookie": self.cookie,
         }
+        self.token_provisioner = TokenProvisioner(csrf, cookie, self.transport)
+        self.directory = GroupDirectory(
+            self.fetch_group_page, ttl=group_ttl, snapshot_path=group_snapshot
+        )
 
     def get_groups(self) -> List[Dict[str, str]]:
-        response = self._make_request(APIUrls.GROUP_LIST_URL)
-        if response:
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    groups = data.get("results", [])
-                    return groups
-                except json.JSONDecodeError:
-                    return "Failed to decode JSON."
-            else:
-                return (
-                    f"Failed to retrieve groups. Status code: "
-                    f"{response.status_code}"
-                )
-        else:
-            return "API request failed."
+        """
+        Return every group the account belongs to.
 
-    def create_token(
-        self, description: str, target_type: str, target_mid: str
-    ) -> Optional[str]:
-        url = "https://notify-bot.line.me/api/token"
-        data = {
-            "action": "issuePersonalAcessToken",
-            "description": description,
-            "targetType": target_type,
-            "targetMid": target_mid,
-            "_csrf": self.csrf,
-        }
+        Raises:
+            NezuNotifyError: If the group list cannot be fetched.
+        """
+        return self.directory.groups()
 
-        response = self._make_request(url, method="POST", data=data)
-        if response and response.status_code == 200:
-            try:
-                result = response.json()
-                return result.get("token")
-            except json.JSONDecodeError:
-                return "Failed to decode JSON."
-        else:
-            return (
-                f"Failed to create token. Status code: "
-                f"{response.status_code if response else 'Unknown'}"
-            )
+    def fetch_group_page(self, page: int) -> Dict[str, Any]:
+        """
+        Fetch one page of the group list.
 
-    def get_group_by_mid(self, mid: str) -> Optional[Dict[str, str]]:
-        groups = self.get_groups()
-        if isinstance(groups, str):
-            return groups  # Return error message
-        for group in groups:
-            if group["mid"] == mid:
-                return group
-        return f"Group with MID: {mid} not found."
+        Args:
+            page (int): 1-based page number.
 
-    def _make_request(
-        self, endpoint: str, method: str = "GET", data: Optional[Dict] = None
-    ) -> Optional[requests.Response]:
-        method = method.upper()
-        if method not in {"GET", "POST"}:
-            return f"Invalid HTTP method specified: {method}"
+        Returns:
+            Dict[str, Any]: The decoded response.
 
+        Raises:
+            NezuNotifyError: If the request fails or the response is not
+                JSON.
+        """
         try:
-            response = requests.request(
-                method, endpoint, headers=self.headers, data=data
+            response = self.transport.request(
+                "GET",
+                APIUrls.GROUP_LIST_URL,
+                operation="groups",
+                headers=self.headers,
+                params={"page": page},
             )
             response.raise_for_status()
-            return response
         except requests.RequestException as e:
-            error_message = (
-                f"HTTP request error - URL: {endpoint}, Method: {method}, "
-                f"Error: {e}"
+            raise translate_error(e) from e
+        try:
+            payload: Dict[str, Any] = response.json()
+        except ValueError as e:
+            raise NezuNotifyAPIError(
+                "Failed to decode JSON.", response.status_code
+            ) from e
+        if not isinstance(payload, dict):
+            raise NezuNotifyAPIError(
+                "Unexpected group list response.", response.status_code
             )
-            if hasattr(e, "response"):
-                error_message += f" Error response: {e.response.text}"
-            return error_message
+        return payload
+
+    def create_token(
+        self, description: str, target_type: str, target_mid: str
+    ) -> TokenResult:
+        return self.token_provisioner.create_token(
+            target_mid, description, target_type
+        )
+
+    def get_group_by_mid(self, mid: str) -> Optional[Dict[str, str]]:
+        """
+        Return the group with the given MID, or None if there is none.
+
+        Raises:
+            NezuNotifyError: If the group list cannot be fetched.
+        """
+        return self.directory.get(mid)
+
+    def get_groups_by_name(self, name: str) -> List[Dict[str, str]]:
+        """
+        Return every group with the given name.
+
+        Raises:
+            NezuNotifyError: If the group list cannot be fetched.
+        """
+        return self.directory.find_by_name(name)
@@ -0,0 +1,425 @@
+import bisect
+import hashlib
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .rate_limiter import parse_rate_limit_headers
+from .urls import APIUrls
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ENDPOINTS = {
+    urlsplit(APIUrls.NOTIFY_URL).path: "notify",
+    urlsplit(APIUrls.STATUS_URL).path: "status",
+    urlsplit(APIUrls.UNOFFICIAL_REVOKE_URL).path: "revoke",
+    urlsplit(APIUrls.PERSONAL_ACCESS_TOKEN_URL).path: "create",
+    urlsplit(APIUrls.GROUP_LIST_URL).path: "groups",
+}
+
+
+def redact(secret: Optional[str]) -> str:
+    """Mask a secret for logging, keeping only its last four characters."""
+    if not secret:
+        return ""
+    if len(secret) <= 8:
+        return "****"
+    return f"****{secret[-4:]}"
+
+
+def token_label(token: str) -> str:
+    """Stable, non-reversible label identifying a token in metrics."""
+    return hashlib.sha256(token.encode()).hexdigest()[:12]
+
+
+def endpoint_label(url: str) -> str:
+    """Name of the LINE endpoint a URL points at."""
+    return _ENDPOINTS.get(urlsplit(url).path, "other")
+
+
+class RequestEvent:
+    """
+    A single HTTP attempt, passed to instrumentation hooks.
+
+    Pre hooks see the request fields and may add headers, for example to
+    propagate a trace ID. Post hooks additionally see the outcome. The
+    token is only ever exposed as token_label().
+    """
+
+    __slots__ = (
+        "method",
+        "url",
+        "endpoint",
+        "operation",
+        "token",
+        "attempt",
+        "headers",
+        "status_code",
+        "elapsed",
+        "error",
+        "remaining",
+        "_instrumentation",
+        "_started",
+    )
+
+    def __init__(
+        self,
+        instrumentation: "Instrumentation",
+        method: str,
+        url: str,
+        operation: Optional[str],
+        token: Optional[str],
+        attempt: int,
+    ):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_label(url)
+        self.operation = operation
+        self.token = token
+        self.attempt = attempt
+        self.headers: Dict[str, str] = {}
+        self.status_code: Optional[int] = None
+        self.elapsed = 0.0
+        self.error: Optional[str] = None
+        self.remaining: Optional[int] = None
+        self._instrumentation = instrumentation
+        self._started = time.perf_counter()
+
+    def finish(
+        self, response: Any = None, error: Optional[BaseException] = None
+    ) -> None:
+        """
+        Record the outcome of the attempt and run the post hooks.
+
+        Args:
+            response (Any): The HTTP response, if one was received.
+            error (Optional[BaseException]): The exception raised instead
+                of a response.
+        """
+        self.elapsed = time.perf_counter() - self._started
+        if response is not None:
+            self.status_code = response.status_code
+            self.error = _status_error(response.status_code)
+            info = parse_rate_limit_headers(response.headers)
+            if info is not None:
+                self.remaining = info.remaining
+        elif error is not None:
+            self.error = type(error).__name__
+        self._instrumentation._run(self._instrumentation._post_hooks, self)
+
+
+Hook = Callable[[RequestEvent], None]
+
+
+class Instrumentation:
+    """
+    Pre and post hooks run around every outbound HTTP attempt.
+
+    Pass one to Transport or AsyncTransport. Without it the transports do
+    no instrumentation work at all.
+    """
+
+    def __init__(self, metrics: Optional["Metrics"] = None):
+        """
+        Initialize an Instrumentation object.
+
+        Args:
+            metrics (Optional[Metrics]): Collector registered as a post
+                hook.
+        """
+        self.metrics = metrics
+        self._pre_hooks: List[Hook] = []
+        self._post_hooks: List[Hook] = []
+        if metrics is not None:
+            self.add_post_hook(metrics.record)
+
+    def add_pre_hook(self, hook: Hook) -> None:
+        self._pre_hooks.append(hook)
+
+    def add_post_hook(self, hook: Hook) -> None:
+        self._post_hooks.append(hook)
+
+    def start(
+        self,
+        method: str,
+        url: str,
+        operation: Optional[str],
+        attempt: int,
+        request_kwargs: Dict[str, Any],
+    ) -> RequestEvent:
+        """
+        Create the event for an attempt and run the pre hooks.
+
+        Headers added by pre hooks are merged into the request.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            operation (Optional[str]): Operation name of the request.
+            attempt (int): 1 for the first attempt, higher for retries.
+            request_kwargs (Dict[str, Any]): Keyword arguments of the HTTP
+                call.
+
+        Returns:
+            RequestEvent: The event to finish once the attempt is over.
+        """
+        headers = request_kwargs.get("headers")
+        event = RequestEvent(
+            self,
+            method,
+            url,
+            operation,
+            _request_token(headers, request_kwargs.get("data")),
+            attempt,
+        )
+        self._run(self._pre_hooks, event)
+        if event.headers:
+            request_kwargs["headers"] = {**(headers or {}), **event.headers}
+        return event
+
+    def _run(self, hooks: List[Hook], event: RequestEvent) -> None:
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                logging.warning(f"Instrumentation hook failed: {e!r}")
+
+
+def _request_token(
+    headers: Optional[Dict[str, str]], data: object
+) -> Optional[str]:
+    authorization = (headers or {}).get("Authorization", "")
+    if authorization.startswith("Bearer "):
+        return token_label(authorization[7:])
+    if isinstance(data, str) and data.startswith("token="):
+        return token_label(data[6:])
+    return None
+
+
+def _status_error(status_code: int) -> Optional[str]:
+    if status_code < 400:
+        return None
+    if status_code == 401:
+        return "auth"
+    if status_code == 429:
+        return "rate_limit"
+    if status_code >= 500:
+        return "server"
+    return "client"
+
+
+class Histogram:
+    """Cumulative latency histogram."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Bucket upper bounds with the number of observations below."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class Metrics:
+    """Counters and latency histograms per endpoint and per token."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.requests: Dict[Tuple[str, str], int] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.retries: Dict[str, int] = {}
+        self.latency: Dict[str, Histogram] = {}
+        self.token_requests: Dict[Tuple[str, str], int] = {}
+        self.token_latency: Dict[str, Histogram] = {}
+        self.token_remaining: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, event: RequestEvent) -> None:
+        """Post hook recording a finished attempt."""
+        endpoint = event.endpoint
+        outcome = (
+            str(event.status_code)
+            if event.status_code is not None
+            else "error"
+        )
+        with self._lock:
+            key = (endpoint, outcome)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if event.error is not None:
+                key = (endpoint, event.error)
+                self.errors[key] = self.errors.get(key, 0) + 1
+            if event.attempt > 1:
+                self.retries[endpoint] = self.retries.get(endpoint, 0) + 1
+            self._histogram(self.latency, endpoint).observe(event.elapsed)
+            if event.token is not None:
+                key = (event.token, endpoint)
+                self.token_requests[key] = self.token_requests.get(key, 0) + 1
+                self._histogram(self.token_latency, event.token).observe(
+                    event.elapsed
+                )
+                if event.remaining is not None:
+                    self.token_remaining[event.token] = event.remaining
+
+    def _histogram(
+        self, histograms: Dict[str, Histogram], key: str
+    ) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.errors.clear()
+            self.retries.clear()
+            self.latency.clear()
+            self.token_requests.clear()
+            self.token_latency.clear()
+            self.token_remaining.clear()
+
+
+class MetricsExporter(ABC):
+    """Interface for publishing collected metrics."""
+
+    @abstractmethod
+    def export(self, metrics: Metrics) -> None:
+        """Publish a snapshot of the metrics."""
+
+
+class PrometheusTextExporter(MetricsExporter):
+    """
+    Render metrics in the Prometheus text exposition format.
+
+    With a path, export() writes the file atomically, suitable for the
+    node_exporter textfile collector.
+    """
+
+    def __init__(self, path: Optional[str] = None, prefix: str = "nezunotify"):
+        self.path = path
+        self.prefix = prefix
+
+    def render(self, metrics: Metrics) -> str:
+        """Return the metrics as Prometheus text."""
+        p = self.prefix
+        lines: List[str] = []
+        with metrics._lock:
+            lines += _counter(
+                f"{p}_requests_total",
+                "HTTP attempts by endpoint and status.",
+                {
+                    _labels(endpoint=e, status=s): v
+                    for (e, s), v in metrics.requests.items()
+                },
+            )
+            lines += _counter(
+                f"{p}_errors_total",
+                "Failed attempts by endpoint and error type.",
+                {
+                    _labels(endpoint=e, error=k): v
+                    for (e, k), v in metrics.errors.items()
+                },
+            )
+            lines += _counter(
+                f"{p}_retries_total",
+                "Retried attempts by endpoint.",
+                {_labels(endpoint=e): v for e, v in metrics.retries.items()},
+            )
+            lines += _histograms(
+                f"{p}_request_duration_seconds",
+                "Attempt latency by endpoint.",
+                "endpoint",
+                metrics.latency,
+            )
+            lines += _counter(
+                f"{p}_token_requests_total",
+                "HTTP attempts by token and endpoint.",
+                {
+                    _labels(token=t, endpoint=e): v
+                    for (t, e), v in metrics.token_requests.items()
+                },
+            )
+            lines += _histograms(
+                f"{p}_token_request_duration_seconds",
+                "Attempt latency by token.",
+                "token",
+                metrics.token_latency,
+            )
+            if metrics.token_remaining:
+                lines.append(
+                    f"# HELP {p}_rate_limit_remaining "
+                    "Remaining rate-limit quota by token."
+                )
+                lines.append(f"# TYPE {p}_rate_limit_remaining gauge")
+                lines += [
+                    f"{p}_rate_limit_remaining{_labels(token=t)} {v}"
+                    for t, v in metrics.token_remaining.items()
+                ]
+        return "\n".join(lines) + "\n"
+
+    def export(self, metrics: Metrics) -> None:
+        """Write the metrics to path."""
+        if self.path is None:
+            raise ValueError("PrometheusTextExporter has no path to write.")
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(self.render(metrics))
+        os.replace(temp_path, self.path)
+
+
+def _labels(**labels: str) -> str:
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in labels.items()
+    )
+    return f"{{{pairs}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _counter(name: str, help_text: str, values: Dict[str, int]) -> List[str]:
+    if not values:
+        return []
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    lines += [f"{name}{labels} {value}" for labels, value in values.items()]
+    return lines
+
+
+def _histograms(
+    name: str, help_text: str, label: str, histograms: Dict[str, Histogram]
+) -> List[str]:
+    if not histograms:
+        return []
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for key, histogram in histograms.items():
+        for bound, count in histogram.cumulative():
+            labels = _labels(**{label: key, "le": repr(bound)})
+            lines.append(f"{name}_bucket{labels} {count}")
+        labels = _labels(**{label: key, "le": "+Inf"})
+        lines.append(f"{name}_bucket{labels} {histogram.count}")
+        lines.append(f"{name}_sum{_labels(**{label: key})} {histogram.sum}")
+        lines.append(
+            f"{name}_count{_labels(**{label: key})} {histogram.count}"
+        )
+    return lines
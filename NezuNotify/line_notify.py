@@ -1,21 +1,111 @@
-import os
-from typing import Dict, Optional
+import time
+from typing import Dict, Optional, Tuple, Union
 
 import requests
 
+from .dedup_cache import DedupCache, dedup_key
+from .exceptions import (
+    NezuNotifyError,
+    NezuNotifyRateLimitError,
+    NezuNotifyValueError,
+)
+from .multipart import (
+    ImageSource,
+    MultipartBody,
+    UploadCache,
+    build_image_body,
+)
+from .rate_limiter import RateLimiter
+from .results import SendResult
+from .status_cache import StatusCache
+from .transport import Transport, translate_error
 from .urls import APIUrls
 
+MAX_MESSAGE_LENGTH = 1000
+
 
 class LineNotify:
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        transport: Optional[Transport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        raise_on_error: bool = False,
+        upload_cache: Optional[UploadCache] = None,
+        status_cache: Optional[StatusCache] = None,
+        dedup_cache: Optional[DedupCache] = None,
+    ):
         self.token = token
+        self.transport = transport or Transport()
+        self.rate_limiter = rate_limiter
+        self.raise_on_error = raise_on_error
+        self.upload_cache = upload_cache
+        self.status_cache = status_cache
+        self.dedup_cache = dedup_cache
         self.headers = {"Authorization": f"Bearer {self.token}"}
 
-    def send_message(self, message: str) -> str:
+    def send(
+        self,
+        message: str,
+        image: Optional[ImageSource] = None,
+        sticker: Optional[Tuple[str, str]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> SendResult:
+        """
+        Send a message, optionally with an image or a sticker.
+
+        With a dedup cache, a send repeating one made with this token within
+        the cache's window is suppressed. Sends are identified by the
+        idempotency key, or else by their content.
+
+        Args:
+            message (str): Message text.
+            image (Optional[ImageSource]): Image URL, local file path,
+                image bytes or binary file object.
+            sticker (Optional[Tuple[str, str]]): Sticker package ID and
+                sticker ID.
+            idempotency_key (Optional[str]): Identifies the send for
+                deduplication.
+
+        Returns:
+            SendResult: The outcome of the request. A suppressed send
+                succeeds with duplicate set.
+        """
+        if self.dedup_cache is None:
+            return self._send_content(message, image, sticker)
+        key = dedup_key(
+            self.token,
+            {"message": message, "image": image, "sticker": sticker},
+            idempotency_key,
+        )
+        return self.dedup_cache.send_once(
+            key,
+            lambda: self._send_content(message, image, sticker),
+            self.token,
+        )
+
+    def _send_content(
+        self,
+        message: str,
+        image: Optional[ImageSource],
+        sticker: Optional[Tuple[str, str]],
+    ) -> SendResult:
+        if image is not None:
+            if isinstance(image, str) and image.startswith(
+                ("http://", "https://")
+            ):
+                return self.send_image_with_url(message, image)
+            return self.send_image(message, image)
+        if sticker:
+            sticker_package_id, sticker_id = sticker
+            return self.send_sticker(message, sticker_id, sticker_package_id)
+        return self.send_message(message)
+
+    def send_message(self, message: str) -> SendResult:
         data = {"message": message}
         return self._make_request(APIUrls.NOTIFY_URL, method="POST", data=data)
 
-    def send_image_with_url(self, text: str, url: str) -> str:
+    def send_image_with_url(self, text: str, url: str) -> SendResult:
         data = {
             "message": text,
             "imageThumbnail": url,
@@ -23,30 +113,54 @@ class LineNotify:
         }
         return self._make_request(APIUrls.NOTIFY_URL, method="POST", data=data)
 
-    def send_image_with_local_path(self, text: str, path: str) -> str:
-        if not os.path.exists(path):
-            return f"Image file not found at the specified path: {path}"
+    def send_image_with_local_path(self, text: str, path: str) -> SendResult:
+        return self.send_image(text, path)
 
+    def send_image(
+        self,
+        text: str,
+        image: ImageSource,
+        filename: Optional[str] = None,
+    ) -> SendResult:
+        """
+        Upload an image from disk or memory.
+
+        Files are memory-mapped and their encoded multipart part is cached
+        by (path, mtime, size), so sending the same file again neither
+        rereads nor re-encodes it.
+
+        Args:
+            text (str): Message text.
+            image (ImageSource): Local file path, image bytes or binary
+                file object.
+            filename (Optional[str]): File name reported for in-memory
+                images.
+
+        Returns:
+            SendResult: The outcome of the request.
+        """
         try:
-            with open(path, "rb") as image_file:
-                files = {"imageFile": image_file}
-                data = {"message": text}
-                response = requests.post(
-                    APIUrls.NOTIFY_URL,
-                    headers=self.headers,
-                    data=data,
-                    files=files,
-                )
-                response.raise_for_status()
-                return "Image sent successfully."
-        except IOError as e:
-            return f"Failed to read image file: {e}"
-        except requests.RequestException as e:
-            return f"Error occurred while sending image: {e}"
+            body = build_image_body(
+                text, image, filename, cache=self.upload_cache
+            )
+        except FileNotFoundError as e:
+            return self._failure(
+                NezuNotifyValueError(
+                    f"Image file not found at the specified path: "
+                    f"{e.filename}"
+                ),
+                cause=e,
+            )
+        except OSError as e:
+            return self._failure(
+                NezuNotifyValueError(f"Failed to read image file: {e}"),
+                cause=e,
+            )
+        return self._make_request(APIUrls.NOTIFY_URL, method="POST", data=body)
 
     def send_sticker(
         self, message: str, sticker_id: str, sticker_package_id: str
-    ) -> str:
+    ) -> SendResult:
         data = {
             "message": message,
             "stickerId": sticker_id,
@@ -55,20 +169,91 @@ class LineNotify:
         return self._make_request(APIUrls.NOTIFY_URL, method="POST", data=data)
 
     def _make_request(
-        self, endpoint: str, method: str = "GET", data: Optional[Dict] = None
-    ) -> str:
+        self,
+        endpoint: str,
+        method: str = "GET",
+        data: Optional[Union[Dict, MultipartBody]] = None,
+    ) -> SendResult:
         method = method.upper()
         if method not in {"GET", "POST"}:
-            return f"Invalid HTTP method specified: {method}"
+            return self._failure(
+                NezuNotifyValueError(
+                    f"Invalid HTTP method specified: {method}"
+                )
+            )
 
+        start = time.monotonic()
         try:
-            response = requests.request(
-                method, endpoint, headers=self.headers, data=data
-            )
-            response.raise_for_status()
-            return "Request successful."
+            response = self._send(method, endpoint, data=data)
         except requests.RequestException as e:
-            return (
-                f"HTTP request error - URL: {endpoint}, Method: {method}, "
-                f"Error: {e}"
-            )
+            return self._failure(translate_error(e), start, e.response, e)
+        except NezuNotifyRateLimitError as e:
+            return self._failure(e, start)
+        return SendResult(
+            True,
+            response.status_code,
+            time.monotonic() - start,
+            response.headers,
+            token=self.token,
+        )
+
+    def _failure(
+        self,
+        error: NezuNotifyError,
+        start: Optional[float] = None,
+        response: Optional[requests.Response] = None,
+        cause: Optional[BaseException] = None,
+    ) -> SendResult:
+        if self.raise_on_error:
+            if error is cause:
+                raise error
+            raise error from cause
+        return SendResult(
+            False,
+            None if response is None else response.status_code,
+            0.0 if start is None else time.monotonic() - start,
+            None if response is None else response.headers,
+            error,
+            token=self.token,
+        )
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Union[Dict, MultipartBody]] = None,
+    ) -> requests.Response:
+        image = isinstance(data, MultipartBody)
+        headers = self.headers
+        if isinstance(data, MultipartBody):
+            headers = {**headers, "Content-Type": data.content_type}
+        rate_limiter = self.rate_limiter
+        before_attempt = None
+        if rate_limiter:
+            # Every attempt, retries included, is charged to the quota.
+            def before_attempt() -> None:
+                rate_limiter.acquire(self.token, image=image)
+
+        response = self.transport.request(
+            method,
+            endpoint,
+            operation="send",
+            before_attempt=before_attempt,
+            headers=headers,
+            data=data,
+        )
+        if self.status_cache:
+            self.status_cache.observe(self.token, response.status_code)
+        if self.rate_limiter:
+            info = self.rate_limiter.update(self.token, response.headers)
+            if response.status_code == 429:
+                reset = info.reset if info else None
+                self.rate_limiter.exhaust(self.token, reset)
+                if self.rate_limiter.fail_fast:
+                    state = self.rate_limiter.get(self.token)
+                    raise NezuNotifyRateLimitError(
+                        state.limit if state else 0,
+                        state.reset if state else 0,
+                    )
+        response.raise_for_status()
+        return response
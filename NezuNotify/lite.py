@@ -0,0 +1,183 @@
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Mapping, Optional, Tuple, Union, cast
+from urllib.parse import urlencode
+
+from .exceptions import (
+    NezuNotifyAPIError,
+    NezuNotifyAuthError,
+    NezuNotifyError,
+    NezuNotifyNetworkError,
+    NezuNotifyRateLimitError,
+)
+from .rate_limiter import parse_rate_limit_headers
+from .results import SendResult
+from .urls import APIUrls
+
+DEFAULT_TIMEOUT = 10.0
+
+
+class LiteNotify:
+    """
+    Send-only LINE Notify client built on the standard library.
+
+    It does not import requests, aiohttp or the token management modules,
+    so short-lived jobs that send one notification start quickly. There is
+    no connection pooling, retrying or rate limiting.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        raise_on_error: bool = False,
+        url: Optional[str] = None,
+    ):
+        """
+        Initialize a LiteNotify object.
+
+        Args:
+            token (str): LINE Notify token
+            timeout (float): Request timeout in seconds.
+            raise_on_error (bool): Raise the error of a failed send instead
+                of returning it in the result.
+            url (Optional[str]): Overrides APIUrls.NOTIFY_URL.
+        """
+        self.token = token
+        self.timeout = timeout
+        self.raise_on_error = raise_on_error
+        self.url = url or APIUrls.NOTIFY_URL
+
+    def send(
+        self,
+        message: str,
+        image: Optional[Union[str, bytes]] = None,
+        sticker: Optional[Tuple[str, str]] = None,
+    ) -> SendResult:
+        """
+        Send a message, optionally with an image or a sticker.
+
+        Args:
+            message (str): Message text.
+            image (Optional[Union[str, bytes]]): Image URL, local file path
+                or image bytes.
+            sticker (Optional[Tuple[str, str]]): Sticker package ID and
+                sticker ID.
+
+        Returns:
+            SendResult: The outcome of the request.
+        """
+        headers = {"Authorization": f"Bearer {self.token}"}
+        data: Any
+        if image is not None and not (
+            isinstance(image, str)
+            and image.startswith(("http://", "https://"))
+        ):
+            # Only uploads need the multipart encoder.
+            from .multipart import build_image_body
+
+            try:
+                body = build_image_body(message, image)
+            except OSError as e:
+                return self._failure(
+                    NezuNotifyError(f"Failed to read the image: {e}")
+                )
+            headers["Content-Type"] = body.content_type
+            headers["Content-Length"] = str(len(body))
+            data = body
+        else:
+            fields: Dict[str, str] = {"message": message}
+            if image is not None:
+                fields["imageThumbnail"] = fields["imageFullsize"] = image
+            elif sticker:
+                fields["stickerPackageId"], fields["stickerId"] = sticker
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+            data = urlencode(fields).encode()
+
+        request = urllib.request.Request(
+            self.url, data=data, headers=headers, method="POST"
+        )
+        start = time.monotonic()
+        try:
+            with urllib.request.urlopen(
+                request, timeout=self.timeout
+            ) as response:
+                response.read()
+                return SendResult(
+                    True,
+                    response.status,
+                    time.monotonic() - start,
+                    cast(Mapping[str, str], response.headers),
+                    token=self.token,
+                )
+        except urllib.error.HTTPError as e:
+            response_headers = cast(Mapping[str, str], e.headers)
+            return self._failure(
+                _http_error(e.code, str(e), response_headers),
+                start,
+                e.code,
+                response_headers,
+                e,
+            )
+        except OSError as e:
+            return self._failure(
+                NezuNotifyNetworkError(str(e)), start, cause=e
+            )
+
+    def _failure(
+        self,
+        error: NezuNotifyError,
+        start: Optional[float] = None,
+        status_code: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        cause: Optional[BaseException] = None,
+    ) -> SendResult:
+        if self.raise_on_error:
+            raise error from cause
+        return SendResult(
+            False,
+            status_code,
+            0.0 if start is None else time.monotonic() - start,
+            headers,
+            error,
+            token=self.token,
+        )
+
+
+def _http_error(
+    status_code: int, message: str, headers: Mapping[str, str]
+) -> NezuNotifyError:
+    if status_code == 401:
+        return NezuNotifyAuthError(message)
+    if status_code == 429:
+        info = parse_rate_limit_headers(headers)
+        return NezuNotifyRateLimitError(
+            info.limit if info else 0, info.reset if info else 0
+        )
+    return NezuNotifyAPIError(message, status_code)
+
+
+def send(
+    token: str,
+    message: str,
+    image: Optional[Union[str, bytes]] = None,
+    sticker: Optional[Tuple[str, str]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> SendResult:
+    """
+    Send a single message with LiteNotify.
+
+    Args:
+        token (str): LINE Notify token
+        message (str): Message text.
+        image (Optional[Union[str, bytes]]): Image URL, local file path or
+            image bytes.
+        sticker (Optional[Tuple[str, str]]): Sticker package ID and sticker
+            ID.
+        timeout (float): Request timeout in seconds.
+
+    Returns:
+        SendResult: The outcome of the request.
+    """
+    return LiteNotify(token, timeout).send(message, image, sticker)
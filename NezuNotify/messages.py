@@ -0,0 +1,73 @@
+from typing import Any, Dict, Mapping, Optional, Union
+
+from .exceptions import NezuNotifyValueError
+
+MESSAGE_FIELDS = ("message", "image", "sticker")
+
+
+def check_message(message: Mapping[str, Any]) -> Optional[str]:
+    """
+    Check a mapping of send() arguments.
+
+    Args:
+        message (Mapping[str, Any]): A 'message' and an optional 'image'
+            or 'sticker'.
+
+    Returns:
+        Optional[str]: What is wrong with the mapping, or None if it is
+            valid.
+    """
+    if set(message) - set(MESSAGE_FIELDS) or "message" not in message:
+        return (
+            "Messages must be strings or mappings with a 'message' and an "
+            "optional 'image' or 'sticker'."
+        )
+    sticker = message.get("sticker")
+    if sticker is not None and not (
+        isinstance(sticker, (list, tuple))
+        and len(sticker) == 2
+        and all(_is_id(value) for value in sticker)
+    ):
+        return (
+            "'sticker' must be a pair of integer IDs, the sticker package "
+            "ID and the sticker ID."
+        )
+    return None
+
+
+def message_payload(message: Union[str, Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Turn a message text or a mapping of send() arguments into
+    LineNotify.send arguments.
+
+    Args:
+        message (Union[str, Mapping[str, Any]]): Message text, or a
+            mapping with a 'message' and an optional 'image' or 'sticker'.
+
+    Returns:
+        Dict[str, Any]: The arguments, with the sticker as a pair of
+            strings and None values left out.
+
+    Raises:
+        NezuNotifyValueError: If the mapping is invalid.
+    """
+    if isinstance(message, str):
+        return {"message": message}
+    problem = check_message(message)
+    if problem:
+        raise NezuNotifyValueError(problem)
+    payload = {
+        key: value for key, value in message.items() if value is not None
+    }
+    if "sticker" in payload:
+        package_id, sticker_id = payload["sticker"]
+        payload["sticker"] = (str(package_id), str(sticker_id))
+    return payload
+
+
+def _is_id(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (
+        isinstance(value, str) and value.isdigit()
+    )
@@ -0,0 +1,293 @@
+import io
+import mimetypes
+import mmap
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import (
+    IO,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+ImageSource = Union[str, bytes, bytearray, memoryview, IO[bytes]]
+
+DEFAULT_CACHE_SIZE = 16
+CHUNK_SIZE = 64 * 1024
+
+# Characters that would end a quoted header parameter, percent-encoded the
+# way browsers and urllib3 encode them.
+_PARAM_ESCAPES = {ord('"'): "%22", ord("\r"): "%0D", ord("\n"): "%0A"}
+
+
+class FilePart:
+    """Encoded file part of a multipart/form-data body."""
+
+    __slots__ = ("boundary", "header", "content")
+
+    def __init__(self, boundary: str, header: bytes, content: Buffer):
+        self.boundary = boundary
+        self.header = header
+        self.content = content
+
+    def __len__(self) -> int:
+        return len(self.header) + len(self.content)
+
+
+class MultipartBody:
+    """
+    Read-only file-like multipart/form-data body.
+
+    The body is a sequence of buffers that are never joined, so a
+    memory-mapped file is handed to the socket in slices without being
+    copied into Python bytes.
+    """
+
+    def __init__(self, fields: Dict[str, str], part: FilePart):
+        """
+        Initialize a MultipartBody object.
+
+        Args:
+            fields (Dict[str, str]): Plain form fields sent before the file.
+            part (FilePart): The encoded file part.
+        """
+        self.boundary = part.boundary
+        self.fields = fields
+        self._segments: List[memoryview] = []
+        for name, value in fields.items():
+            self._segments.append(
+                memoryview(
+                    _field_header(self.boundary, name)
+                    + value.encode()
+                    + b"\r\n"
+                )
+            )
+        self._segments.append(memoryview(part.header))
+        if len(part.content):
+            self._segments.append(memoryview(part.content))
+        self._segments.append(
+            memoryview(f"\r\n--{self.boundary}--\r\n".encode())
+        )
+        self._length = sum(len(segment) for segment in self._segments)
+        self._index = 0
+        self._offset = 0
+        self._position = 0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        while True:
+            chunk = self.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size: int = -1) -> Union[bytes, memoryview]:
+        """
+        Read up to size bytes.
+
+        A bounded read returns a slice of a single underlying buffer; an
+        unbounded read copies the rest of the body into bytes.
+        """
+        if size is None or size < 0:
+            rest = b"".join(bytes(chunk) for chunk in self._remaining())
+            self._index = len(self._segments)
+            self._offset = 0
+            self._position = self._length
+            return rest
+        while self._index < len(self._segments):
+            segment = self._segments[self._index]
+            if self._offset < len(segment):
+                chunk = segment[self._offset : self._offset + size]
+                self._offset += len(chunk)
+                self._position += len(chunk)
+                return chunk
+            self._index += 1
+            self._offset = 0
+        return b""
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._length
+        offset = max(0, min(offset, self._length))
+        self._index, self._offset, self._position = 0, 0, 0
+        while self._index < len(self._segments):
+            segment_length = len(self._segments[self._index])
+            if offset - self._position < segment_length:
+                break
+            self._position += segment_length
+            self._index += 1
+        self._offset = offset - self._position
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def _remaining(self) -> Iterator[memoryview]:
+        for index in range(self._index, len(self._segments)):
+            start = self._offset if index == self._index else 0
+            yield self._segments[index][start:]
+
+
+def encode_file_part(name: str, filename: str, content: Buffer) -> FilePart:
+    """
+    Encode a file as a multipart part without copying its content.
+
+    Args:
+        name (str): Form field name.
+        filename (str): File name reported to the server.
+        content (Buffer): File content.
+
+    Returns:
+        FilePart: The encoded part.
+    """
+    boundary = uuid.uuid4().hex
+    content_type = (
+        mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    )
+    header = (
+        _field_header(boundary, name, filename)
+        + f"Content-Type: {content_type}\r\n\r\n".encode()
+    )
+    return FilePart(boundary, header, content)
+
+
+def _field_header(
+    boundary: str, name: str, filename: Optional[str] = None
+) -> bytes:
+    disposition = f"form-data; {_header_param('name', name)}"
+    if filename is not None:
+        disposition += f"; {_header_param('filename', filename)}"
+    header = f"--{boundary}\r\nContent-Disposition: {disposition}\r\n"
+    if filename is None:
+        header += "\r\n"
+    return header.encode()
+
+
+def _header_param(name: str, value: str) -> str:
+    return f'{name}="{value.translate(_PARAM_ESCAPES)}"'
+
+
+def _map_file(file: IO[bytes], size: int) -> Buffer:
+    if size == 0:
+        return b""
+    # The mapping stays valid after the file is closed.
+    return mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+
+
+class UploadCache:
+    """
+    LRU cache of encoded file parts.
+
+    Entries are keyed by (path, mtime, size) of the opened file, and the
+    file is mapped from that same descriptor, so the key always describes
+    the mapped content. A file that changes on disk is encoded again on its
+    next send and its previous entry is dropped. Files must not be
+    truncated in place while a send of them is in flight.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int, int], FilePart]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, path: str, name: str = "imageFile") -> FilePart:
+        """
+        Return the encoded part for a file, mapping it on a cache miss.
+
+        Args:
+            path (str): Path to the file.
+            name (str): Form field name.
+
+        Returns:
+            FilePart: The encoded part.
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+        path = os.path.abspath(path)
+        with open(path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            key = (path, stat.st_mtime_ns, stat.st_size)
+            with self._lock:
+                part = self._entries.get(key)
+                if part is not None:
+                    self._entries.move_to_end(key)
+                    return part
+            part = encode_file_part(
+                name, os.path.basename(path), _map_file(file, stat.st_size)
+            )
+        with self._lock:
+            for stale in [
+                entry for entry in self._entries if entry[0] == path
+            ]:
+                del self._entries[stale]
+            self._entries[key] = part
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return part
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+DEFAULT_UPLOAD_CACHE = UploadCache()
+
+
+def build_image_body(
+    message: str,
+    image: ImageSource,
+    filename: Optional[str] = None,
+    cache: Optional[UploadCache] = None,
+) -> MultipartBody:
+    """
+    Build the multipart body of a LINE Notify image upload.
+
+    Args:
+        message (str): Message text.
+        image (ImageSource): Path to an image file, the image content as a
+            bytes-like object, or a binary file object.
+        filename (Optional[str]): File name reported to the server for
+            in-memory images.
+        cache (Optional[UploadCache]): Cache for images read from disk.
+            DEFAULT_UPLOAD_CACHE is used when omitted.
+
+    Returns:
+        MultipartBody: The request body.
+
+    Raises:
+        OSError: If the image file cannot be read.
+    """
+    if isinstance(image, str):
+        part = (cache or DEFAULT_UPLOAD_CACHE).get(image)
+    else:
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            content: Buffer = memoryview(image)
+        else:
+            content = image.read()
+            filename = filename or os.path.basename(
+                str(getattr(image, "name", ""))
+            )
+        part = encode_file_part("imageFile", filename or "image", content)
+    return MultipartBody({"message": message}, part)
@@ -1,9 +1,35 @@
-from typing import Dict, List, Optional, Union
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
+from requests.adapters import BaseAdapter
+
+from .coalescer import MessageCoalescer
+from .dedup_cache import DedupCache, dedup_key
+from .dispatcher import DROP, NORMAL, PriorityDispatcher
 from .exceptions import NezuNotifyError, NezuNotifyValueError
 from .group_manager import GroupManager
+from .instrumentation import Instrumentation
 from .line_notify import LineNotify
+from .messages import message_payload
+from .multipart import ImageSource
+from .outbox import Outbox, OutboxEntry, OutboxWorker
+from .rate_limiter import RateLimiter
+from .results import (
+    BulkRevokeResult,
+    RevokeResult,
+    SendResult,
+    StatusResult,
+    TokenResult,
+)
+from .status_cache import StatusCache
+from .templates import TemplateRegistry
 from .token_manager import TokenManager
+from .token_pool import ROUND_ROBIN, TokenPool
+from .token_store import TokenStore
+from .transport import Transport
+from .transport_modes import create_adapter
+
+DEFAULT_CLOSE_TIMEOUT = 30.0
 
 
 class NezuNotify:
@@ -19,6 +45,26 @@ class NezuNotify:
         message_content: Optional[str] = None,
         sticker_id: Optional[str] = None,
         sticker_package_id: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        tokens: Optional[List[str]] = None,
+        routing: str = ROUND_ROBIN,
+        outbox: Optional[Outbox] = None,
+        outbox_workers: int = 1,
+        coalesce_window: Optional[float] = None,
+        coalesce_max_messages: int = 50,
+        coalesce_dedupe: bool = False,
+        token_store: Optional[TokenStore] = None,
+        status_cache: Optional[StatusCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        templates: Optional[TemplateRegistry] = None,
+        priority_dispatch: bool = False,
+        dispatch_workers: int = 1,
+        dispatch_reserve: int = 0,
+        dispatch_on_expire: str = DROP,
+        transport_mode: Optional[str] = None,
+        recording_path: Optional[str] = None,
+        dedup_cache: Optional[DedupCache] = None,
     ):
         """
         Initialize a NezuNotify object.
@@ -32,6 +78,60 @@ class NezuNotify:
             message_content (Optional[str]): Message content
             sticker_id (Optional[str]): Sticker ID
             sticker_package_id (Optional[str]): Sticker package ID
+            transport (Optional[Transport]): Pooled HTTP transport shared by
+                every component. A new one is created when omitted. A
+                transport passed in is left open by close().
+            rate_limiter (Optional[RateLimiter]): Scheduler that paces sends
+                against each token's X-RateLimit quota.
+            tokens (Optional[List[str]]): Extra tokens for the same target.
+                When given, sends are spread across all tokens.
+            routing (str): Token selection for multi-token sends,
+                'round_robin' or 'least_loaded'.
+            outbox (Optional[Outbox]): Durable queue for outgoing messages.
+                When given, process('send') enqueues and returns at once,
+                and background workers deliver the queue.
+            outbox_workers (int): Number of outbox delivery threads.
+            coalesce_window (Optional[float]): When given, text sends are
+                buffered for this many seconds and merged into as few
+                messages as possible. Cannot be combined with an outbox
+                or priority_dispatch.
+            coalesce_max_messages (int): Buffered messages that trigger an
+                early flush.
+            coalesce_dedupe (bool): Collapse identical buffered lines into
+                one line with a repeat count.
+            token_store (Optional[TokenStore]): Store updated with the
+                outcome of status checks and revocations.
+            status_cache (Optional[StatusCache]): Cache of token statuses,
+                filled by status checks and by the responses of sends.
+            instrumentation (Optional[Instrumentation]): Hooks and metrics
+                run around every HTTP call of the transport created when
+                none is given.
+            templates (Optional[TemplateRegistry]): Templates available to
+                send_template().
+            priority_dispatch (bool): Queue sends and deliver them by
+                priority and deadline, see PriorityDispatcher. Cannot be
+                combined with an outbox.
+            dispatch_workers (int): Number of dispatcher threads.
+            dispatch_reserve (int): Requests per rate-limit window kept for
+                critical messages.
+            dispatch_on_expire (str): Handling of messages that pass their
+                deadline, 'drop' or 'downgrade'.
+            transport_mode (Optional[str]): 'dry_run' answers requests
+                locally without sending them, 'record' sends them and
+                records every exchange to recording_path, and 'replay'
+                answers them from that recording. See
+                NezuNotify.transport_modes. Only applies to the transport
+                created when none is given.
+            recording_path (Optional[str]): Recording file for the 'record'
+                and 'replay' modes.
+            dedup_cache (Optional[DedupCache]): Suppresses sends repeating
+                one made within its window, see send(). Use a
+                SharedDedupCache to deduplicate across restarts.
+
+        Raises:
+            NezuNotifyValueError: If more than one of outbox,
+                priority_dispatch and coalesce_window is given, or a
+                transport is given with instrumentation or transport_mode.
         """
         self.csrf = csrf
         self.cookie = cookie
@@ -41,20 +141,123 @@ class NezuNotify:
         self.message_content = message_content
         self.sticker_id = sticker_id
         self.sticker_package_id = sticker_package_id
+        background = [
+            name
+            for name, enabled in (
+                ("outbox", outbox is not None),
+                ("priority_dispatch", priority_dispatch),
+                ("coalesce_window", coalesce_window is not None),
+            )
+            if enabled
+        ]
+        if len(background) > 1:
+            raise NezuNotifyValueError(
+                f"{' and '.join(background)} cannot be used together."
+            )
+        if transport is not None and (
+            instrumentation is not None or transport_mode is not None
+        ):
+            raise NezuNotifyValueError(
+                "instrumentation and transport_mode configure the transport "
+                "NezuNotify creates. Set them on the given transport instead."
+            )
+        # A transport passed in belongs to the caller and is left open.
+        self._owns_transport = transport is None
+        self.transport = transport or Transport(
+            instrumentation=instrumentation
+        )
+        self.transport_adapter: Optional[BaseAdapter] = None
+        if transport_mode is not None:
+            self.transport_adapter = create_adapter(
+                transport_mode,
+                recording_path,
+                max(self.transport.pool_sizes.values()),
+            )
+            self.transport.mount(self.transport_adapter)
+        # Routing across several tokens and priority dispatch need each
+        # token's quota.
+        if rate_limiter is None and (tokens or priority_dispatch):
+            rate_limiter = RateLimiter()
+        self.rate_limiter = rate_limiter
+        self.status_cache = status_cache
+        self.templates = templates
+        self.dedup_cache = dedup_cache
+        # Sends are deduplicated per token, or per pool of tokens.
+        self._dedup_scope = "\n".join(
+            [token, *(tokens or [])] if token else tokens or []
+        )
 
         self.group_manager: Optional[GroupManager] = None
         self.token_manager: Optional[TokenManager] = None
-        self.line_notify: Optional[LineNotify] = None
+        self.line_notify: Optional[Union[LineNotify, TokenPool]] = None
+        self.outbox = outbox
+        self.outbox_worker: Optional[OutboxWorker] = None
+        self.dispatcher: Optional[PriorityDispatcher] = None
+        self.coalescer: Optional[MessageCoalescer] = None
 
         if csrf and cookie:
-            self.group_manager = GroupManager(csrf, cookie)
-            self.token_manager = TokenManager(csrf, cookie)
-        if token:
-            self.line_notify = LineNotify(token)
+            self.group_manager = GroupManager(csrf, cookie, self.transport)
+            self.token_manager = TokenManager(
+                csrf,
+                cookie,
+                self.transport,
+                self.rate_limiter,
+                token_store,
+                status_cache,
+            )
+        if tokens:
+            pool_tokens = [token, *tokens] if token else list(tokens)
+            self.line_notify = TokenPool(
+                pool_tokens,
+                self.transport,
+                self.rate_limiter,
+                routing,
+                status_cache=status_cache,
+            )
+        elif token:
+            self.line_notify = LineNotify(
+                token,
+                self.transport,
+                self.rate_limiter,
+                status_cache=status_cache,
+            )
+
+        # Background sends share self.line_notify, so a token blocked or
+        # drained on one path is avoided on the others.
+        if outbox and self.line_notify:
+            self.outbox_worker = OutboxWorker(
+                outbox,
+                self.line_notify,
+                workers=outbox_workers,
+                on_fail=self._release_dead,
+            )
+            self.outbox_worker.start()
+        elif priority_dispatch and self.line_notify:
+            self.dispatcher = PriorityDispatcher(
+                self.line_notify,
+                workers=dispatch_workers,
+                reserve=dispatch_reserve,
+                on_expire=dispatch_on_expire,
+            )
+            self.dispatcher.start()
+        elif coalesce_window is not None and self.line_notify:
+            self.coalescer = MessageCoalescer(
+                self.line_notify,
+                window=coalesce_window,
+                max_messages=coalesce_max_messages,
+                dedupe=coalesce_dedupe,
+            )
 
     def process(
         self, action: str, data: Optional[Union[str, List[str]]] = None
-    ) -> Union[str, List[str], Dict[str, str]]:
+    ) -> Union[
+        SendResult,
+        StatusResult,
+        RevokeResult,
+        TokenResult,
+        Dict[str, StatusResult],
+        BulkRevokeResult,
+    ]:
         """
         Execute the specified action.
 
@@ -65,7 +268,9 @@ class NezuNotify:
                 action.
 
         Returns:
-            Union[str, List[str], Dict[str, str]]: The result of the action
+            Union[SendResult, StatusResult, RevokeResult, TokenResult,
+                Dict[str, StatusResult], BulkRevokeResult]: The outcome of
+                the action
 
         Raises:
             NezuNotifyValueError: If the action is invalid or required data
@@ -82,82 +287,323 @@ class NezuNotify:
                 "Invalid action. It must be 'create', 'revoke', 'check', or "
                 "'send'."
             )
-        if action in ["create", "revoke", "check"] and not self.token_manager:
-            raise NezuNotifyValueError(
-                "CSRF and cookie are required for token management actions."
-            )
         return actions[action](data)
 
-    def _create(self, data: Optional[str] = None) -> str:
+    def _create(
+        self, data: Optional[Union[str, List[str]]] = None
+    ) -> TokenResult:
         """Create a token."""
-        if not self.csrf or not self.cookie or not self.target_mid:
+        token_manager = self._require_token_manager()
+        if not self.target_mid:
             raise NezuNotifyValueError(
                 "CSRF, cookie, and target_mid are required to create a token."
             )
+        if isinstance(data, list):
+            raise NezuNotifyValueError("The description must be a string.")
         description = data or "NezuNotify"
-        return self.token_manager.create_token(self.target_mid, description)
+        return token_manager.create_token(self.target_mid, description)
 
     def _revoke(
         self, data: Optional[Union[str, List[str]]] = None
-    ) -> Union[str, List[str]]:
-        """Revoke a token."""
+    ) -> Union[RevokeResult, BulkRevokeResult]:
+        """Revoke a token or a list of tokens."""
+        token_manager = self._require_token_manager()
         if not data:
             raise NezuNotifyValueError("A token is required for revocation.")
         if isinstance(data, str):
-            return self.token_manager.revoke_token(data)
+            return token_manager.revoke_token(data)
         elif isinstance(data, list):
-            return self.token_manager.revoke_all_tokens(data)
+            return token_manager.revoke_all_tokens(data)
         else:
             raise NezuNotifyValueError("Data must be a string or a list.")
 
     def _check(
         self, data: Optional[Union[str, List[str]]] = None
-    ) -> Union[str, Dict[str, str]]:
-        """Check the status of a token."""
+    ) -> Union[StatusResult, Dict[str, StatusResult]]:
+        """Check the status of a token or a list of tokens."""
+        token_manager = self._require_token_manager()
         if not data:
             raise NezuNotifyValueError(
                 "A token is required to check the status."
             )
-        return self.token_manager.check_token_status(data)
+        if isinstance(data, list):
+            return token_manager.check_token_statuses(data)
+        return token_manager.check_token_status(data)
 
-    def _send(self, data: Optional[str] = None) -> str:
+    def _require_token_manager(self) -> TokenManager:
+        if not self.token_manager:
+            raise NezuNotifyValueError(
+                "CSRF and cookie are required for token management actions."
+            )
+        return self.token_manager
+
+    def _send(
+        self, data: Optional[Union[str, List[str]]] = None
+    ) -> SendResult:
         """Send a message."""
         if not self.line_notify:
             raise NezuNotifyValueError(
                 "A token is required to send a message."
             )
+        return self._dispatch(self._build_payload())
+
+    def send_template(
+        self,
+        name: str,
+        context: Mapping[str, Any],
+        severity: Optional[str] = None,
+    ) -> SendResult:
+        """
+        Render a registered template and send it.
+
+        Args:
+            name (str): Template name.
+            context (Mapping[str, Any]): Values of the template fields.
+            severity (Optional[str]): Severity selecting the image or
+                sticker. Defaults to context['severity'].
+
+        Returns:
+            SendResult: The outcome of the send.
+
+        Raises:
+            NezuNotifyValueError: If no token or template registry is
+                configured, or the template cannot be rendered.
+        """
+        if self.templates is None:
+            raise NezuNotifyValueError(
+                "A template registry is required to send templates."
+            )
+        rendered = self.templates.render(name, context, severity)
+        return self._dispatch(rendered.payload)
+
+    def send(
+        self,
+        message: str,
+        image: Optional[ImageSource] = None,
+        sticker: Optional[Tuple[str, str]] = None,
+        priority: str = NORMAL,
+        ttl: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> SendResult:
+        """
+        Send a message.
+
+        Unlike process('send'), the message is an argument rather than
+        instance state, so one NezuNotify can send any number of different
+        messages over the same connections.
+
+        With a dedup cache, a message repeating one sent or queued within
+        the cache's window is not sent again. Messages are identified by
+        the idempotency key, or else by their content.
+
+        Args:
+            message (str): Message text.
+            image (Optional[ImageSource]): Image URL, local file path,
+                image bytes or binary file object.
+            sticker (Optional[Tuple[str, str]]): Sticker package ID and
+                sticker ID.
+            priority (str): Dispatcher lane, 'critical', 'high', 'normal'
+                or 'low'. Only used with priority dispatch.
+            ttl (Optional[float]): Seconds after which a queued message is
+                no longer worth sending. Only used with priority dispatch.
+            idempotency_key (Optional[str]): Identifies the message for
+                deduplication, e.g. the ID of the event it reports.
+
+        Returns:
+            SendResult: The outcome of the send. A suppressed message
+                succeeds with duplicate set.
+
+        Raises:
+            NezuNotifyValueError: If no token is configured.
+        """
+        payload: Dict[str, Any] = {"message": message}
+        if image is not None:
+            payload["image"] = image
+        if sticker is not None:
+            payload["sticker"] = sticker
+        return self._dispatch(payload, priority, ttl, idempotency_key)
+
+    def send_many(
+        self, messages: Iterable[Union[str, Mapping[str, Any]]]
+    ) -> List[SendResult]:
+        """
+        Send several messages in order.
+
+        With an outbox, every message is enqueued in a single transaction.
+
+        Args:
+            messages (Iterable[Union[str, Mapping[str, Any]]]): Message
+                texts, or mappings of send() arguments.
+
+        Returns:
+            List[SendResult]: The outcome of each send, in order.
+
+        Raises:
+            NezuNotifyValueError: If no token is configured or a message is
+                invalid.
+        """
+        payloads = [message_payload(message) for message in messages]
+        if not self.line_notify:
+            raise NezuNotifyValueError(
+                "A token is required to send a message."
+            )
+        if self.outbox:
+            for payload in payloads:
+                _check_queueable(payload)
+            return self._enqueue_many(self.outbox, payloads)
+        return [self._dispatch(payload) for payload in payloads]
 
+    def _enqueue_many(
+        self, outbox: Outbox, payloads: List[Dict[str, Any]]
+    ) -> List[SendResult]:
+        """Enqueue, in one transaction, the payloads that do not repeat a
+        recent message."""
+        cache = self.dedup_cache
+        if cache is None:
+            outbox.enqueue_many(self.token or "", payloads)
+            return [
+                SendResult(True, token=self.token, queued=True)
+                for _ in payloads
+            ]
+        results = []
+        fresh = []
+        keys: List[Optional[bytes]] = []
+        for payload in payloads:
+            key = dedup_key(self._dedup_scope, payload)
+            if key is not None and not cache.claim(key):
+                results.append(
+                    SendResult(True, token=self.token, duplicate=True)
+                )
+                continue
+            fresh.append(payload)
+            keys.append(key)
+            results.append(SendResult(True, token=self.token, queued=True))
         try:
-            if self.message_type == "text":
-                self.line_notify.send_message(self.message_content)
-            elif self.message_type == "image":
-                if self.message_content.startswith(("http://", "https://")):
-                    self.line_notify.send_image_with_url(
-                        "Sending image", self.message_content
-                    )
-                else:
-                    self.line_notify.send_image_with_local_path(
-                        "Sending image", self.message_content
-                    )
-            elif self.message_type == "sticker":
-                if not self.sticker_id or not self.sticker_package_id:
-                    raise NezuNotifyValueError(
-                        "sticker_id and sticker_package_id are required to "
-                        "send a sticker."
-                    )
-                self.line_notify.send_sticker(
-                    self.message_content,
-                    self.sticker_package_id,
-                    self.sticker_id,
+            outbox.enqueue_many(self.token or "", fresh, keys)
+        except BaseException:
+            for key in keys:
+                if key is not None:
+                    cache.release(key)
+            raise
+        return results
+
+    def _dispatch(
+        self,
+        payload: Dict[str, Any],
+        priority: str = NORMAL,
+        ttl: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> SendResult:
+        """Queue, buffer or send a LineNotify.send payload, unless it
+        repeats a recent one."""
+        if self.dedup_cache is None:
+            return self._deliver(payload, priority, ttl)
+        key = dedup_key(self._dedup_scope, payload, idempotency_key)
+        return self.dedup_cache.send_once(
+            key,
+            lambda: self._deliver(payload, priority, ttl, key),
+            self.token,
+        )
+
+    def _deliver(
+        self,
+        payload: Dict[str, Any],
+        priority: str = NORMAL,
+        ttl: Optional[float] = None,
+        key: Optional[bytes] = None,
+    ) -> SendResult:
+        if not self.line_notify:
+            raise NezuNotifyValueError(
+                "A token is required to send a message."
+            )
+        if self.outbox:
+            _check_queueable(payload)
+            self.outbox.enqueue(self.token or "", payload, key)
+            return SendResult(True, token=self.token, queued=True)
+        if self.dispatcher:
+            future = self.dispatcher.submit(
+                **payload, priority=priority, ttl=ttl
+            )
+            if key is not None:
+                future.add_done_callback(
+                    lambda done: self._release_failed(key, done)
                 )
-            else:
-                raise NezuNotifyValueError("Invalid message type.")
+            return SendResult(True, token=self.token, queued=True)
+        if self.coalescer and len(payload) == 1:
+            self.coalescer.submit(
+                payload["message"],
+                None if key is None else lambda: self._release(key),
+            )
+            return SendResult(True, token=self.token, queued=True)
+
+        try:
+            return self.line_notify.send(**payload)
+        except NezuNotifyError:
+            raise
         except Exception as e:
             raise NezuNotifyError(
                 f"Failed to send the message: {str(e)}"
             ) from e
 
-        return "Message has been sent."
+    def _release_failed(
+        self, key: bytes, future: "Future[SendResult]"
+    ) -> None:
+        """Let a message the dispatcher failed to send be sent again."""
+        if future.cancelled() or not future.result().ok:
+            self._release(key)
+
+    def _release_dead(self, entry: OutboxEntry) -> None:
+        """Let a message the outbox gave up on be sent again."""
+        if entry.dedup_key is not None:
+            self._release(entry.dedup_key)
+
+    def _release(self, key: bytes) -> None:
+        if self.dedup_cache is not None:
+            self.dedup_cache.release(key)
+
+    def _build_payload(self) -> Dict[str, Any]:
+        """Build the LineNotify.send arguments for the configured message."""
+        if self.message_type == "text":
+            return {"message": self.message_content}
+        elif self.message_type == "image":
+            if not self.message_content:
+                raise NezuNotifyValueError(
+                    "An image URL or path is required to send an image."
+                )
+            return {"message": "Sending image", "image": self.message_content}
+        elif self.message_type == "sticker":
+            if not self.sticker_id or not self.sticker_package_id:
+                raise NezuNotifyValueError(
+                    "sticker_id and sticker_package_id are required to "
+                    "send a sticker."
+                )
+            return {
+                "message": self.message_content,
+                "sticker": (self.sticker_package_id, self.sticker_id),
+            }
+        else:
+            raise NezuNotifyValueError("Invalid message type.")
+
+    def close(self, timeout: Optional[float] = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """
+        Flush buffered messages, stop the outbox workers and the
+        dispatcher, and close the pooled connections unless the transport
+        was passed in.
+
+        Args:
+            timeout (Optional[float]): Seconds the dispatcher may spend
+                sending queued messages, e.g. while waiting for a quota
+                reset. Messages still queued then are cancelled. None
+                waits for every message.
+        """
+        if self.coalescer:
+            self.coalescer.close()
+        if self.dispatcher:
+            self.dispatcher.stop(timeout=timeout)
+        if self.outbox_worker:
+            self.outbox_worker.stop(timeout)
+        if self._owns_transport:
+            self.transport.close()
 
     def get_groups(self) -> List[Dict[str, str]]:
         """Retrieve the list of groups."""
@@ -167,7 +613,18 @@ class NezuNotify:
             )
         try:
             return self.group_manager.get_groups()
+        except NezuNotifyError:
+            raise
         except Exception as e:
             raise NezuNotifyError(
                 f"Failed to retrieve groups: {str(e)}"
             ) from e
+
+
+def _check_queueable(payload: Dict[str, Any]) -> None:
+    """The outbox stores payloads as JSON, so images must be URLs or
+    paths."""
+    if not isinstance(payload.get("image", ""), str):
+        raise NezuNotifyValueError(
+            "Only image URLs and file paths can be queued in the outbox."
+        )
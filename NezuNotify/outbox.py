@@ -0,0 +1,492 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Union
+
+from .database import connect, transaction
+from .exceptions import (
+    NezuNotifyAuthError,
+    NezuNotifyRateLimitError,
+    NezuNotifyValueError,
+)
+from .line_notify import LineNotify
+from .rate_limiter import RateLimiter
+from .token_pool import TokenPool
+from .transport import Transport
+
+PENDING = "pending"
+INFLIGHT = "inflight"
+DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    token TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    claimed_at REAL,
+    last_error TEXT,
+    dedup_key BLOB
+);
+CREATE INDEX IF NOT EXISTS outbox_ready
+    ON outbox (state, available_at, id);
+"""
+
+
+class OutboxEntry:
+    """A message waiting in the outbox."""
+
+    __slots__ = (
+        "id",
+        "token",
+        "payload",
+        "attempts",
+        "created_at",
+        "dedup_key",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        token: str,
+        payload: Dict[str, Any],
+        attempts: int,
+        created_at: float,
+        dedup_key: Optional[bytes] = None,
+    ):
+        self.id = id
+        self.token = token
+        self.payload = payload
+        self.attempts = attempts
+        self.created_at = created_at
+        self.dedup_key = dedup_key
+
+
+class Outbox:
+    """
+    Durable SQLite-backed queue of outgoing messages.
+
+    Entries are claimed by workers and deleted once acknowledged. Entries
+    that were claimed but never acknowledged, because the process died or
+    the worker stalled past visibility_timeout, are delivered again.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        visibility_timeout: float = 60.0,
+        recover: bool = True,
+    ):
+        """
+        Initialize an Outbox object.
+
+        Args:
+            path (str): SQLite database file.
+            visibility_timeout (float): Seconds after which a claimed but
+                unacknowledged entry is handed out again.
+            recover (bool): Release every entry left in flight by a
+                previous process so it is replayed right away. Disable when
+                several processes share the same file.
+        """
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self._lock = threading.Lock()
+        self._conn = connect(path, _SCHEMA)
+        with transaction(self._conn, self._lock):
+            # Outbox files created before deduplication lack the column.
+            columns = self._conn.execute("PRAGMA table_info(outbox)")
+            if "dedup_key" not in {column[1] for column in columns}:
+                self._conn.execute(
+                    "ALTER TABLE outbox ADD COLUMN dedup_key BLOB"
+                )
+        if recover:
+            self.recover()
+
+    def enqueue(
+        self,
+        token: str,
+        payload: Dict[str, Any],
+        dedup_key: Optional[bytes] = None,
+    ) -> int:
+        """
+        Append a message to the outbox.
+
+        Args:
+            token (str): The token the message is sent with.
+            payload (Dict[str, Any]): Keyword arguments for LineNotify.send.
+            dedup_key (Optional[bytes]): Deduplication key claimed for the
+                message, handed back with the entry.
+
+        Returns:
+            int: The entry ID.
+        """
+        return self.enqueue_many(token, [payload], [dedup_key])[0]
+
+    def enqueue_many(
+        self,
+        token: str,
+        payloads: List[Dict[str, Any]],
+        dedup_keys: Optional[Sequence[Optional[bytes]]] = None,
+    ) -> List[int]:
+        """
+        Append several messages to the outbox in a single transaction.
+
+        Args:
+            token (str): The token the messages are sent with.
+            payloads (List[Dict[str, Any]]): Keyword arguments for
+                LineNotify.send, one per message.
+            dedup_keys (Optional[Sequence[Optional[bytes]]]): Deduplication
+                key claimed for each message, in the same order.
+
+        Returns:
+            List[int]: The entry IDs, in order.
+        """
+        now = time.time()
+        keys = dedup_keys or [None] * len(payloads)
+        rows = [
+            (token, json.dumps(payload), now, now, key)
+            for payload, key in zip(payloads, keys)
+        ]
+        ids = []
+        with transaction(self._conn, self._lock):
+            for row in rows:
+                cursor = self._conn.execute(
+                    "INSERT INTO outbox"
+                    " (token, payload, created_at, available_at, dedup_key)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    row,
+                )
+                ids.append(int(cursor.lastrowid or 0))
+        return ids
+
+    def claim(self, limit: int = 1) -> List[OutboxEntry]:
+        """
+        Hand out the oldest deliverable entries to a worker.
+
+        Args:
+            limit (int): Maximum number of entries to claim.
+
+        Returns:
+            List[OutboxEntry]: The claimed entries.
+        """
+        now = time.time()
+        with transaction(self._conn, self._lock):
+            rows = self._conn.execute(
+                "SELECT id, token, payload, attempts, created_at, dedup_key"
+                " FROM outbox"
+                " WHERE (state = ? AND available_at <= ?)"
+                " OR (state = ? AND claimed_at <= ?)"
+                " ORDER BY id LIMIT ?",
+                (
+                    PENDING,
+                    now,
+                    INFLIGHT,
+                    now - self.visibility_timeout,
+                    limit,
+                ),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE outbox SET state = ?, claimed_at = ? WHERE id = ?",
+                [(INFLIGHT, now, row[0]) for row in rows],
+            )
+        return [
+            OutboxEntry(
+                row[0], row[1], json.loads(row[2]), row[3], row[4], row[5]
+            )
+            for row in rows
+        ]
+
+    def ack(self, entry_id: int) -> None:
+        """Remove a delivered entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM outbox WHERE id = ?", (entry_id,))
+
+    def nack(
+        self,
+        entry_id: int,
+        error: Optional[str] = None,
+        retry_at: Optional[float] = None,
+        count_attempt: bool = True,
+    ) -> None:
+        """
+        Return an entry to the queue after a failed delivery.
+
+        Args:
+            entry_id (int): The entry ID.
+            error (Optional[str]): Why the delivery failed.
+            retry_at (Optional[float]): When the entry may be delivered
+                again, defaults to now.
+            count_attempt (bool): Count the delivery towards the entry's
+                attempts. Deliveries put off by rate limiting are not.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET state = ?, attempts = attempts + ?,"
+                " available_at = ?, claimed_at = NULL, last_error = ?"
+                " WHERE id = ?",
+                (
+                    PENDING,
+                    int(count_attempt),
+                    retry_at or time.time(),
+                    error,
+                    entry_id,
+                ),
+            )
+
+    def extend(self, entry_ids: List[int]) -> None:
+        """Restart the visibility timeout of entries still being
+        delivered, so they are not handed out again meanwhile."""
+        if not entry_ids:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE outbox SET claimed_at = ? WHERE id = ? AND state = ?",
+                [(time.time(), entry_id, INFLIGHT) for entry_id in entry_ids],
+            )
+
+    def fail(self, entry_id: int, error: Optional[str] = None) -> None:
+        """Park an entry that can never be delivered."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET state = ?, attempts = attempts + 1,"
+                " claimed_at = NULL, last_error = ? WHERE id = ?",
+                (DEAD, error, entry_id),
+            )
+
+    def recover(self) -> int:
+        """
+        Release every in-flight entry so it is delivered again.
+
+        Returns:
+            int: The number of entries released.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE outbox SET state = ?, claimed_at = NULL"
+                " WHERE state = ?",
+                (PENDING, INFLIGHT),
+            )
+        return cursor.rowcount
+
+    def depth(self) -> int:
+        """Number of entries not yet delivered."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE state != ?", (DEAD,)
+            ).fetchone()
+        return int(row[0])
+
+    def oldest_age(self) -> Optional[float]:
+        """Age in seconds of the oldest undelivered entry."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(created_at) FROM outbox WHERE state != ?", (DEAD,)
+            ).fetchone()
+        return None if row[0] is None else time.time() - row[0]
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Queue depth, oldest entry age and number of dead entries."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), MIN(created_at) FROM outbox"
+                " WHERE state != ?",
+                (DEAD,),
+            ).fetchone()
+            dead = self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE state = ?", (DEAD,)
+            ).fetchone()
+        return {
+            "depth": row[0],
+            "oldest_age": None if row[1] is None else time.time() - row[1],
+            "dead": dead[0],
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class OutboxWorker:
+    """
+    Background threads that drain an Outbox through LINE Notify.
+
+    A send may wait a long time for a token's quota to reset, so while
+    entries are being delivered their claims are renewed every third of
+    the outbox's visibility timeout.
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        sender: Optional[Union[LineNotify, TokenPool]] = None,
+        transport: Optional[Transport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        workers: int = 1,
+        poll_interval: float = 0.5,
+        max_attempts: int = 5,
+        backoff: float = 1.0,
+        on_fail: Optional[Callable[[OutboxEntry], None]] = None,
+    ):
+        """
+        Initialize an OutboxWorker object.
+
+        Args:
+            outbox (Outbox): The queue to drain.
+            sender (Optional[Union[LineNotify, TokenPool]]): Sender used for
+                every entry. When omitted, each entry is sent with its own
+                token.
+            transport (Optional[Transport]): Pooled HTTP transport for the
+                per-token senders. Created on first use when omitted.
+            rate_limiter (Optional[RateLimiter]): Scheduler for the
+                per-token senders.
+            workers (int): Number of delivery threads.
+            poll_interval (float): Seconds to sleep when the queue is empty.
+            max_attempts (int): Deliveries tried before an entry is parked.
+            backoff (float): Initial retry delay in seconds, doubled after
+                each failed attempt.
+            on_fail (Optional[Callable[[OutboxEntry], None]]): Called with
+                each entry parked as undeliverable.
+        """
+        self.outbox = outbox
+        self.sender = sender
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.on_fail = on_fail
+        self._senders: Dict[str, LineNotify] = {}
+        self._senders_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._inflight: Set[int] = set()
+        self._inflight_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the delivery threads."""
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"NezuNotifyOutbox-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(
+            target=self._heartbeat,
+            args=(self._stop,),
+            name="NezuNotifyOutboxHeartbeat",
+            daemon=True,
+        )
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the delivery threads after their current entry."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def drain(self) -> int:
+        """
+        Deliver every deliverable entry on the calling thread.
+
+        Returns:
+            int: The number of entries processed.
+        """
+        processed = 0
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(stop,), daemon=True
+        )
+        heartbeat.start()
+        try:
+            while True:
+                entries = self.outbox.claim()
+                if not entries:
+                    return processed
+                for entry in entries:
+                    self._deliver(entry)
+                    processed += 1
+        finally:
+            stop.set()
+            heartbeat.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            entries = self.outbox.claim()
+            if not entries:
+                self._stop.wait(self.poll_interval)
+                continue
+            for entry in entries:
+                self._deliver(entry)
+
+    def _heartbeat(self, stop: threading.Event) -> None:
+        while not stop.wait(self.outbox.visibility_timeout / 3):
+            with self._inflight_lock:
+                entry_ids = list(self._inflight)
+            self.outbox.extend(entry_ids)
+
+    def _deliver(self, entry: OutboxEntry) -> None:
+        with self._inflight_lock:
+            self._inflight.add(entry.id)
+        try:
+            self._send(entry)
+        finally:
+            with self._inflight_lock:
+                self._inflight.discard(entry.id)
+
+    def _send(self, entry: OutboxEntry) -> None:
+        payload = entry.payload
+        sticker = payload.get("sticker")
+        try:
+            self._sender(entry.token).send(
+                payload["message"],
+                payload.get("image"),
+                (sticker[0], sticker[1]) if sticker else None,
+            ).raise_for_error()
+        except NezuNotifyRateLimitError as e:
+            self.outbox.nack(
+                entry.id, str(e), e.reset_time or None, count_attempt=False
+            )
+        except (NezuNotifyAuthError, NezuNotifyValueError) as e:
+            self._fail(entry, e)
+        except Exception as e:
+            if entry.attempts + 1 >= self.max_attempts:
+                self._fail(entry, e)
+            else:
+                delay = self.backoff * 2**entry.attempts
+                self.outbox.nack(entry.id, str(e), time.time() + delay)
+        else:
+            self.outbox.ack(entry.id)
+
+    def _fail(self, entry: OutboxEntry, error: Exception) -> None:
+        logging.error(f"Dropping outbox entry {entry.id}: {error}")
+        self.outbox.fail(entry.id, str(error))
+        if self.on_fail is not None:
+            try:
+                self.on_fail(entry)
+            except Exception as e:
+                logging.warning(f"Outbox on_fail callback failed: {e!r}")
+
+    def _sender(self, token: str) -> Union[LineNotify, TokenPool]:
+        if self.sender is not None:
+            return self.sender
+        with self._senders_lock:
+            sender = self._senders.get(token)
+            if sender is None:
+                if self.transport is None:
+                    self.transport = Transport()
+                sender = LineNotify(
+                    token,
+                    self.transport,
+                    self.rate_limiter,
+                    raise_on_error=True,
+                )
+                self._senders[token] = sender
+            return sender
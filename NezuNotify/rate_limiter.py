@@ -0,0 +1,262 @@
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+from .exceptions import NezuNotifyRateLimitError
+
+DEFAULT_LIMIT = 1000
+DEFAULT_WINDOW = 3600
+
+
+class RateLimitInfo:
+    """Rate-limit quota reported by LINE Notify for a single token."""
+
+    __slots__ = (
+        "limit",
+        "remaining",
+        "image_limit",
+        "image_remaining",
+        "reset",
+    )
+
+    def __init__(
+        self,
+        limit: int,
+        remaining: int,
+        reset: int,
+        image_limit: Optional[int] = None,
+        image_remaining: Optional[int] = None,
+    ):
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+        self.image_limit = image_limit
+        self.image_remaining = image_remaining
+
+    def __repr__(self) -> str:
+        return (
+            f"RateLimitInfo(limit={self.limit}, remaining={self.remaining}, "
+            f"image_limit={self.image_limit}, "
+            f"image_remaining={self.image_remaining}, reset={self.reset})"
+        )
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def parse_rate_limit_headers(
+    headers: Mapping[str, str],
+) -> Optional[RateLimitInfo]:
+    """
+    Parse the X-RateLimit-* headers of a LINE Notify response.
+
+    Args:
+        headers (Mapping[str, str]): Response headers.
+
+    Returns:
+        Optional[RateLimitInfo]: The parsed quota, or None if the response
+            carried no rate-limit headers.
+    """
+    limit = _int_header(headers, "X-RateLimit-Limit")
+    remaining = _int_header(headers, "X-RateLimit-Remaining")
+    if limit is None or remaining is None:
+        return None
+    reset = _int_header(headers, "X-RateLimit-Reset")
+    return RateLimitInfo(
+        limit=limit,
+        remaining=remaining,
+        reset=reset if reset is not None else int(time.time()),
+        image_limit=_int_header(headers, "X-RateLimit-ImageLimit"),
+        image_remaining=_int_header(headers, "X-RateLimit-ImageRemaining"),
+    )
+
+
+class RateLimiter:
+    """
+    Per-token token bucket driven by LINE Notify's rate-limit headers.
+
+    Each token's bucket is filled from the X-RateLimit-Remaining value of
+    the latest response and drained locally by every send, so concurrent
+    senders cannot overshoot the quota between responses. When a bucket is
+    empty the send waits for X-RateLimit-Reset, or raises
+    NezuNotifyRateLimitError in fail-fast mode.
+
+    The limiter deliberately only delays sends and never reorders them:
+    waiting senders are released in no particular order. Sending the most
+    urgent messages first is left to PriorityDispatcher, which schedules
+    against this limiter's buckets.
+    """
+
+    def __init__(
+        self,
+        fail_fast: bool = False,
+        max_wait: Optional[float] = None,
+        reserve: int = 0,
+    ):
+        """
+        Initialize a RateLimiter object.
+
+        Args:
+            fail_fast (bool): Raise NezuNotifyRateLimitError instead of
+                waiting when a token's quota is exhausted.
+            max_wait (Optional[float]): Longest time in seconds a send may
+                wait for the quota to reset before raising. None waits
+                indefinitely.
+            reserve (int): Number of requests per window kept back for
+                callers that bypass the limiter.
+        """
+        self.fail_fast = fail_fast
+        self.max_wait = max_wait
+        self.reserve = reserve
+        self._states: Dict[str, RateLimitInfo] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[RateLimitInfo]:
+        """Return the last known quota of a token."""
+        with self._lock:
+            return self._states.get(token)
+
+    def acquire(
+        self,
+        token: str,
+        image: bool = False,
+        fail_fast: Optional[bool] = None,
+    ) -> None:
+        """
+        Take one request from the token's bucket, waiting if necessary.
+
+        Args:
+            token (str): The token about to send.
+            image (bool): Whether the request uploads an image.
+            fail_fast (Optional[bool]): Overrides the limiter's fail_fast
+                setting for this call.
+
+        Raises:
+            NezuNotifyRateLimitError: If the quota is exhausted and the
+                caller asked not to wait, or the wait exceeds max_wait.
+        """
+        if fail_fast is None:
+            fail_fast = self.fail_fast
+        while True:
+            with self._lock:
+                wait = self._take(self._states.get(token), image, fail_fast)
+            if wait is None:
+                return
+            time.sleep(wait)
+
+    def update(
+        self, token: str, headers: Mapping[str, str]
+    ) -> Optional[RateLimitInfo]:
+        """
+        Resynchronise a token's bucket from response headers.
+
+        Args:
+            token (str): The token the response belongs to.
+            headers (Mapping[str, str]): Response headers.
+
+        Returns:
+            Optional[RateLimitInfo]: The quota reported by the response.
+        """
+        info = parse_rate_limit_headers(headers)
+        if info is None:
+            return None
+        with self._lock:
+            self._states[token] = self._merge(self._states.get(token), info)
+        return info
+
+    def exhaust(self, token: str, reset: Optional[int] = None) -> None:
+        """Mark a token as out of quota, e.g. after a 429 response."""
+        with self._lock:
+            self._states[token] = self._exhausted(
+                self._states.get(token), reset
+            )
+
+    def _take(
+        self, state: Optional[RateLimitInfo], image: bool, fail_fast: bool
+    ) -> Optional[float]:
+        """
+        Take one request from a bucket.
+
+        Returns:
+            Optional[float]: None once the request is taken or the token is
+                untracked, otherwise seconds until the bucket refills.
+
+        Raises:
+            NezuNotifyRateLimitError: If the caller may not wait that long.
+        """
+        if state is None:
+            return None
+        now = time.time()
+        if state.reset <= now:
+            self._refill(state, now)
+        if self._has_budget(state, image):
+            state.remaining -= 1
+            if image and state.image_remaining is not None:
+                state.image_remaining -= 1
+            return None
+        wait = state.reset - now
+        if fail_fast or (self.max_wait is not None and wait > self.max_wait):
+            limit = state.limit
+            if state.remaining > self.reserve and state.image_limit:
+                limit = state.image_limit
+            raise NezuNotifyRateLimitError(limit, state.reset)
+        return wait
+
+    def _merge(
+        self, state: Optional[RateLimitInfo], info: RateLimitInfo
+    ) -> RateLimitInfo:
+        """Combine a bucket with the quota reported by a response."""
+        if state is None or info.reset > state.reset:
+            return RateLimitInfo(
+                info.limit,
+                info.remaining,
+                info.reset,
+                info.image_limit,
+                info.image_remaining,
+            )
+        # Requests still in flight were already taken from the bucket but
+        # are not yet counted by the server.
+        state.limit = info.limit
+        state.remaining = min(state.remaining, info.remaining)
+        if info.image_remaining is not None:
+            state.image_limit = info.image_limit
+            state.image_remaining = (
+                info.image_remaining
+                if state.image_remaining is None
+                else min(state.image_remaining, info.image_remaining)
+            )
+        return state
+
+    def _exhausted(
+        self, state: Optional[RateLimitInfo], reset: Optional[int]
+    ) -> RateLimitInfo:
+        if state is None:
+            state = RateLimitInfo(
+                DEFAULT_LIMIT,
+                0,
+                reset or int(time.time()) + DEFAULT_WINDOW,
+            )
+        state.remaining = 0
+        if reset is not None:
+            state.reset = reset
+        return state
+
+    def _has_budget(self, state: RateLimitInfo, image: bool) -> bool:
+        if state.remaining <= self.reserve:
+            return False
+        if image and state.image_remaining is not None:
+            return state.image_remaining > 0
+        return True
+
+    def _refill(self, state: RateLimitInfo, now: float) -> None:
+        state.remaining = state.limit
+        if state.image_limit is not None:
+            state.image_remaining = state.image_limit
+        state.reset = int(now) + DEFAULT_WINDOW
@@ -0,0 +1,232 @@
+from typing import Dict, List, Mapping, Optional
+
+from .exceptions import NezuNotifyError
+from .rate_limiter import RateLimitInfo, parse_rate_limit_headers
+
+
+class Result:
+    """
+    Outcome of an API call.
+
+    Results are truthy when the call succeeded. Response headers are kept
+    as they are and the rate-limit quota is only parsed when asked for.
+    """
+
+    __slots__ = ("ok", "status_code", "elapsed", "headers", "error")
+
+    def __init__(
+        self,
+        ok: bool,
+        status_code: Optional[int] = None,
+        elapsed: float = 0.0,
+        headers: Optional[Mapping[str, str]] = None,
+        error: Optional[NezuNotifyError] = None,
+    ):
+        self.ok = ok
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.headers = headers
+        self.error = error
+
+    @property
+    def rate_limit(self) -> Optional[RateLimitInfo]:
+        """Quota reported by the X-RateLimit headers, if any."""
+        if not self.headers:
+            return None
+        return parse_rate_limit_headers(self.headers)
+
+    def raise_for_error(self) -> None:
+        """Raise the error of a failed call."""
+        if self.error is not None:
+            raise self.error
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+
+class SendResult(Result):
+    """Outcome of sending a message."""
+
+    __slots__ = ("token", "queued", "duplicate")
+
+    def __init__(
+        self,
+        ok: bool,
+        status_code: Optional[int] = None,
+        elapsed: float = 0.0,
+        headers: Optional[Mapping[str, str]] = None,
+        error: Optional[NezuNotifyError] = None,
+        token: Optional[str] = None,
+        queued: bool = False,
+        duplicate: bool = False,
+    ):
+        super().__init__(ok, status_code, elapsed, headers, error)
+        self.token = token
+        self.queued = queued
+        self.duplicate = duplicate
+
+    def __str__(self) -> str:
+        if self.error is not None:
+            return str(self.error)
+        if self.duplicate:
+            return "Message is a duplicate and was not sent."
+        if self.queued:
+            return "Message has been queued."
+        return "Message has been sent."
+
+    def __repr__(self) -> str:
+        return (
+            f"SendResult(ok={self.ok}, status_code={self.status_code}, "
+            f"queued={self.queued}, duplicate={self.duplicate}, "
+            f"elapsed={self.elapsed:.3f}, "
+            f"error={self.error!r})"
+        )
+
+
+class StatusResult(Result):
+    """
+    Outcome of checking a token's status.
+
+    The result is truthy when the token is usable.
+    """
+
+    __slots__ = ("token", "status", "cached")
+
+    def __init__(
+        self,
+        token: str,
+        status: str,
+        ok: bool,
+        status_code: Optional[int] = None,
+        elapsed: float = 0.0,
+        headers: Optional[Mapping[str, str]] = None,
+        error: Optional[NezuNotifyError] = None,
+        cached: bool = False,
+    ):
+        super().__init__(ok, status_code, elapsed, headers, error)
+        self.token = token
+        self.status = status
+        self.cached = cached
+
+    def __str__(self) -> str:
+        return self.status
+
+    def __repr__(self) -> str:
+        return (
+            f"StatusResult(status={self.status!r}, "
+            f"status_code={self.status_code}, cached={self.cached}, "
+            f"elapsed={self.elapsed:.3f})"
+        )
+
+
+class RevokeResult(Result):
+    """Outcome of revoking a single token."""
+
+    __slots__ = ("token", "attempts")
+
+    def __init__(
+        self,
+        token: str,
+        ok: bool,
+        status_code: Optional[int] = None,
+        elapsed: float = 0.0,
+        headers: Optional[Mapping[str, str]] = None,
+        error: Optional[NezuNotifyError] = None,
+        attempts: int = 1,
+    ):
+        super().__init__(ok, status_code, elapsed, headers, error)
+        self.token = token
+        self.attempts = attempts
+
+    def __str__(self) -> str:
+        if self.ok:
+            return "Token revoked successfully."
+        return f"Error occurred while revoking token: {self.error}"
+
+    def __repr__(self) -> str:
+        return (
+            f"RevokeResult(ok={self.ok}, status_code={self.status_code}, "
+            f"attempts={self.attempts}, elapsed={self.elapsed:.3f}, "
+            f"error={self.error!r})"
+        )
+
+
+class TokenResult(Result):
+    """Outcome of creating a token."""
+
+    __slots__ = ("token", "target_mid", "description")
+
+    def __init__(
+        self,
+        target_mid: str,
+        description: str,
+        ok: bool,
+        token: Optional[str] = None,
+        status_code: Optional[int] = None,
+        elapsed: float = 0.0,
+        headers: Optional[Mapping[str, str]] = None,
+        error: Optional[NezuNotifyError] = None,
+    ):
+        super().__init__(ok, status_code, elapsed, headers, error)
+        self.target_mid = target_mid
+        self.description = description
+        self.token = token
+
+    def __str__(self) -> str:
+        if self.ok:
+            return str(self.token)
+        return f"Failed to generate token: {self.error}"
+
+    def __repr__(self) -> str:
+        return (
+            f"TokenResult(ok={self.ok}, target_mid={self.target_mid!r}, "
+            f"status_code={self.status_code}, elapsed={self.elapsed:.3f}, "
+            f"error={self.error!r})"
+        )
+
+
+class BulkRevokeResult:
+    """Per-token outcomes of a bulk revocation."""
+
+    __slots__ = ("results", "elapsed")
+
+    def __init__(self, results: List[RevokeResult], elapsed: float = 0.0):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self) -> List[str]:
+        return [result.token for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[str]:
+        return [result.token for result in self.results if not result.ok]
+
+    @property
+    def errors(self) -> Dict[str, Optional[NezuNotifyError]]:
+        return {
+            result.token: result.error
+            for result in self.results
+            if not result.ok
+        }
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def __str__(self) -> str:
+        if self.ok:
+            return "All tokens have been revoked."
+        return (
+            f"Failed to revoke {len(self.failed)} of "
+            f"{len(self.results)} tokens."
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"BulkRevokeResult(succeeded={len(self.succeeded)}, "
+            f"failed={len(self.failed)}, elapsed={self.elapsed:.3f})"
+        )
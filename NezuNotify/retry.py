@@ -0,0 +1,203 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Mapping, Optional
+
+import requests
+
+from .rate_limiter import parse_rate_limit_headers
+
+TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of a request while a host's circuit is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(
+            f"Circuit open for {host}, retry in {retry_in:.1f} seconds"
+        )
+        self.host = host
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter for a single kind of request."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        jitter: float = 0.5,
+        retry_statuses: FrozenSet[int] = TRANSIENT_STATUS_CODES,
+        idempotent: bool = True,
+    ):
+        """
+        Initialize a RetryPolicy object.
+
+        Args:
+            max_attempts (int): Total attempts, including the first one.
+            base_delay (float): Delay in seconds before the first retry,
+                doubled after each attempt.
+            max_delay (float): Longest delay in seconds. A Retry-After or
+                rate-limit reset further away than this is not waited for.
+            jitter (float): Fraction of each backoff delay that is
+                randomised, from 0 (none) to 1 (full jitter).
+            retry_statuses (FrozenSet[int]): Status codes worth retrying.
+                Network errors are always retried.
+            idempotent (bool): Whether repeating the request is harmless.
+                If not, only connection failures, which happen before
+                anything reaches the server, are retried.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+        self.idempotent = idempotent
+
+    def should_retry(
+        self, attempt: int, status_code: Optional[int], sent: bool = True
+    ) -> bool:
+        """
+        Decide whether a failed attempt is retried.
+
+        Args:
+            attempt (int): Number of attempts made so far.
+            status_code (Optional[int]): Status code of the response, or
+                None after a network error.
+            sent (bool): Whether the request may have reached the server.
+                False only for failures to connect.
+
+        Returns:
+            bool: Whether another attempt is allowed.
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if sent and not self.idempotent:
+            return False
+        return status_code is None or status_code in self.retry_statuses
+
+    def compute_delay(
+        self, attempt: int, headers: Optional[Mapping[str, str]] = None
+    ) -> Optional[float]:
+        """
+        Compute the wait before the next attempt.
+
+        Retry-After and, on rate-limited responses, X-RateLimit-Reset take
+        precedence over the exponential backoff.
+
+        Args:
+            attempt (int): Number of attempts made so far.
+            headers (Optional[Mapping[str, str]]): Headers of the failed
+                response.
+
+        Returns:
+            Optional[float]: Seconds to wait, or None if the server asked
+                for a longer wait than max_delay.
+        """
+        if headers:
+            delay = _retry_after(headers)
+            if delay is None:
+                info = parse_rate_limit_headers(headers)
+                if info and info.remaining <= 0:
+                    delay = max(0.0, info.reset - time.time())
+            if delay is not None:
+                return delay if delay <= self.max_delay else None
+        backoff = min(
+            self.max_delay, float(self.base_delay * 2 ** (attempt - 1))
+        )
+        return backoff * (1 - self.jitter * random.random())
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests fail fast. Once recovery_timeout has passed a single probe is
+    let through (half-open); its outcome closes or reopens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, failure_threshold: int = 5, recovery_timeout: float = 30.0
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._refresh()
+
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a probe through."""
+        with self._lock:
+            if self._refresh() != self.OPEN:
+                return 0.0
+            return self._opened_at + self.recovery_timeout - time.monotonic()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            state = self._refresh()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def _refresh(self) -> str:
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
@@ -0,0 +1,215 @@
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .exceptions import NezuNotifyAuthError, NezuNotifyError
+from .line_notify import LineNotify
+from .messages import message_payload
+from .results import SendResult
+from .shared_state import SharedRateLimiter, SharedStatusCache
+from .status_cache import STATUS_BLOCKED
+from .transport import Transport
+
+DEFAULT_THREADS = 4
+DEFAULT_BATCH_SIZE = 100
+
+# A message to send: the token and a message text or send() arguments.
+Message = Tuple[str, Union[str, Mapping[str, Any]]]
+
+
+class _Worker:
+    """Per-process sending state, created once by the pool initializer."""
+
+    def __init__(
+        self,
+        state_path: str,
+        threads: int,
+        transport_options: Dict[str, Any],
+        fail_fast: bool,
+        max_wait: Optional[float],
+    ):
+        self.transport = Transport(**transport_options)
+        self.rate_limiter = SharedRateLimiter(
+            state_path, fail_fast=fail_fast, max_wait=max_wait
+        )
+        self.status_cache = SharedStatusCache(state_path)
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.senders: Dict[str, LineNotify] = {}
+
+    def send_batch(
+        self, token: str, batch: List[Tuple[int, Dict[str, Any]]]
+    ) -> List[Tuple[int, SendResult]]:
+        sender = self.senders.get(token)
+        if sender is None:
+            sender = LineNotify(
+                token,
+                self.transport,
+                self.rate_limiter,
+                status_cache=self.status_cache,
+            )
+            self.senders[token] = sender
+        results = []
+        if self.rate_limiter.get(token) is None:
+            # Until a response reports the token's quota, requests in flight
+            # cannot be counted against it, so send one on its own first.
+            index, payload = batch[0]
+            results.append((index, self._send(sender, payload)))
+            batch = batch[1:]
+        results.extend(
+            self.executor.map(
+                lambda item: (item[0], self._send(sender, item[1])), batch
+            )
+        )
+        return results
+
+    def _send(self, sender: LineNotify, payload: Dict[str, Any]) -> SendResult:
+        if self.status_cache.get(sender.token) == STATUS_BLOCKED:
+            return SendResult(
+                False,
+                error=NezuNotifyAuthError("The token is blocked."),
+                token=sender.token,
+            )
+        try:
+            result = sender.send(**payload)
+        except NezuNotifyError as e:
+            return SendResult(False, error=e, token=sender.token)
+        # Headers may hold values that cannot cross the process boundary.
+        if result.headers is not None:
+            result.headers = dict(result.headers)
+        return result
+
+
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(*args: Any) -> None:
+    global _worker
+    _worker = _Worker(*args)
+
+
+def _send_batch(
+    token: str, batch: List[Tuple[int, Dict[str, Any]]]
+) -> List[Tuple[int, SendResult]]:
+    assert _worker is not None
+    return _worker.send_batch(token, batch)
+
+
+class ShardedSender:
+    """
+    Send messages from a pool of processes.
+
+    Messages are sharded by token and handed to worker processes in
+    batches, each process sending on its own pooled connections. Every
+    process paces its sends with a SharedRateLimiter and skips tokens a
+    SharedStatusCache marks blocked, both backed by the same SQLite file,
+    so adding processes raises throughput without overspending any
+    token's quota.
+    """
+
+    def __init__(
+        self,
+        state_path: str,
+        processes: Optional[int] = None,
+        threads: int = DEFAULT_THREADS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        transport_options: Optional[Dict[str, Any]] = None,
+        fail_fast: bool = False,
+        max_wait: Optional[float] = None,
+        start_method: Optional[str] = None,
+    ):
+        """
+        Initialize a ShardedSender object.
+
+        Args:
+            state_path (str): SQLite file holding the shared rate-limit
+                and token status state.
+            processes (Optional[int]): Number of worker processes. Defaults
+                to the number of CPUs.
+            threads (int): Sends in flight per process.
+            batch_size (int): Messages handed to a process at a time.
+            transport_options (Optional[Dict[str, Any]]): Keyword arguments
+                for each process's Transport.
+            fail_fast (bool): Fail sends instead of waiting when a token's
+                quota is exhausted.
+            max_wait (Optional[float]): Longest time in seconds a send may
+                wait for a token's quota to reset.
+            start_method (Optional[str]): multiprocessing start method,
+                e.g. 'spawn'. Defaults to the platform's.
+        """
+        self.state_path = state_path
+        self.processes = processes or os.cpu_count() or 1
+        self.batch_size = batch_size
+        # Create the schema once rather than in every process at once.
+        SharedRateLimiter(state_path).close()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(
+                state_path,
+                threads,
+                dict(transport_options or {}),
+                fail_fast,
+                max_wait,
+            ),
+        )
+
+    def send_many(self, messages: Iterable[Message]) -> List[SendResult]:
+        """
+        Send messages across the process pool.
+
+        Messages for the same token are batched together, so a token is
+        only used by several processes when it has more than batch_size
+        messages.
+
+        Args:
+            messages (Iterable[Message]): Pairs of a token and a message
+                text or a mapping of send() arguments.
+
+        Returns:
+            List[SendResult]: The outcome of each message, in order.
+
+        Raises:
+            NezuNotifyValueError: If a message is invalid.
+        """
+        shards: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        count = 0
+        for index, (token, message) in enumerate(messages):
+            shards.setdefault(token, []).append(
+                (index, message_payload(message))
+            )
+            count = index + 1
+
+        futures: List["Future[List[Tuple[int, SendResult]]]"] = []
+        for token, items in shards.items():
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start : start + self.batch_size]
+                futures.append(
+                    self._executor.submit(_send_batch, token, batch)
+                )
+
+        results: List[Optional[SendResult]] = [None] * count
+        for future in futures:
+            for index, result in future.result():
+                results[index] = result
+        return [result for result in results if result is not None]
+
+    def close(self) -> None:
+        """Wait for pending sends and stop the worker processes."""
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ShardedSender":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,272 @@
+import time
+from typing import Mapping, Optional
+
+from .database import connect, transaction
+from .dedup_cache import DEFAULT_MAX_ENTRIES, DEFAULT_WINDOW, DedupCache
+from .rate_limiter import RateLimiter, RateLimitInfo, parse_rate_limit_headers
+from .status_cache import (
+    DEFAULT_NEGATIVE_TTL,
+    DEFAULT_TTL,
+    STATUS_BLOCKED,
+    STATUS_OK,
+    StatusCache,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    token TEXT PRIMARY KEY,
+    "limit" INTEGER NOT NULL,
+    remaining INTEGER NOT NULL,
+    reset INTEGER NOT NULL,
+    image_limit INTEGER,
+    image_remaining INTEGER
+);
+CREATE TABLE IF NOT EXISTS token_statuses (
+    token TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dedup_keys (
+    key BLOB PRIMARY KEY,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dedup_keys_expires_at
+    ON dedup_keys (expires_at);
+"""
+# Claims between two prunings of a SharedDedupCache.
+_PRUNE_INTERVAL = 256
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    RateLimiter whose buckets live in a SQLite file.
+
+    Every process opening the same file draws from the same per-token
+    buckets, so a token's quota is not overspent however many processes
+    send with it. Each take is a single IMMEDIATE transaction.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fail_fast: bool = False,
+        max_wait: Optional[float] = None,
+        reserve: int = 0,
+    ):
+        """
+        Initialize a SharedRateLimiter object.
+
+        Args:
+            path (str): SQLite database file shared by the processes.
+            fail_fast (bool): See RateLimiter.
+            max_wait (Optional[float]): See RateLimiter.
+            reserve (int): See RateLimiter.
+        """
+        super().__init__(fail_fast, max_wait, reserve)
+        self.path = path
+        self._conn = connect(path, _SCHEMA)
+
+    def get(self, token: str) -> Optional[RateLimitInfo]:
+        with self._lock:
+            return self._load(token)
+
+    def acquire(
+        self,
+        token: str,
+        image: bool = False,
+        fail_fast: Optional[bool] = None,
+    ) -> None:
+        if fail_fast is None:
+            fail_fast = self.fail_fast
+        while True:
+            with transaction(self._conn, self._lock):
+                state = self._load(token)
+                wait = self._take(state, image, fail_fast)
+                if wait is None and state is not None:
+                    self._save(token, state)
+            if wait is None:
+                return
+            time.sleep(wait)
+
+    def update(
+        self, token: str, headers: Mapping[str, str]
+    ) -> Optional[RateLimitInfo]:
+        info = parse_rate_limit_headers(headers)
+        if info is None:
+            return None
+        with transaction(self._conn, self._lock):
+            self._save(token, self._merge(self._load(token), info))
+        return info
+
+    def exhaust(self, token: str, reset: Optional[int] = None) -> None:
+        with transaction(self._conn, self._lock):
+            self._save(token, self._exhausted(self._load(token), reset))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _load(self, token: str) -> Optional[RateLimitInfo]:
+        row = self._conn.execute(
+            'SELECT "limit", remaining, reset, image_limit, image_remaining'
+            " FROM rate_limits WHERE token = ?",
+            (token,),
+        ).fetchone()
+        return None if row is None else RateLimitInfo(*row)
+
+    def _save(self, token: str, state: RateLimitInfo) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO rate_limits"
+            ' (token, "limit", remaining, reset, image_limit,'
+            " image_remaining) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                token,
+                state.limit,
+                state.remaining,
+                state.reset,
+                state.image_limit,
+                state.image_remaining,
+            ),
+        )
+
+
+class SharedStatusCache(StatusCache):
+    """
+    StatusCache kept in a SQLite file, so a token found blocked by one
+    process is skipped by the others.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+    ):
+        """
+        Initialize a SharedStatusCache object.
+
+        Args:
+            path (str): SQLite database file shared by the processes.
+            ttl (float): Seconds an 'OK' status is reused.
+            negative_ttl (float): Seconds a 'Blocked token' status is
+                reused.
+        """
+        super().__init__(ttl, negative_ttl)
+        self.path = path
+        self._conn = connect(path, _SCHEMA)
+
+    def get(self, token: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM token_statuses"
+                " WHERE token = ? AND expires_at > ?",
+                (token, time.time()),
+            ).fetchone()
+        return None if row is None else str(row[0])
+
+    def put(self, token: str, status: str) -> None:
+        if status == STATUS_OK:
+            ttl = self.ttl
+        elif status == STATUS_BLOCKED:
+            ttl = self.negative_ttl
+        else:
+            self.invalidate(token)
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO token_statuses"
+                " (token, status, expires_at) VALUES (?, ?, ?)",
+                (token, status, time.time() + ttl),
+            )
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        with self._lock:
+            if token is None:
+                self._conn.execute("DELETE FROM token_statuses")
+            else:
+                self._conn.execute(
+                    "DELETE FROM token_statuses WHERE token = ?", (token,)
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SharedDedupCache(DedupCache):
+    """
+    DedupCache kept in a SQLite file, so sends are deduplicated across
+    processes and restarts.
+
+    Expired keys are pruned, and the oldest evicted beyond max_entries,
+    every few hundred claims.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        window: float = DEFAULT_WINDOW,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Initialize a SharedDedupCache object.
+
+        Args:
+            path (str): SQLite database file shared by the processes.
+            window (float): Seconds during which a repeated send is
+                suppressed.
+            max_entries (int): Most keys kept at once.
+        """
+        super().__init__(window, max_entries)
+        self.path = path
+        self._conn = connect(path, _SCHEMA)
+        self._claims = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM dedup_keys WHERE expires_at > ?",
+                (time.time(),),
+            ).fetchone()
+        return int(row[0])
+
+    def claim(self, key: bytes) -> bool:
+        now = time.time()
+        with transaction(self._conn, self._lock):
+            row = self._conn.execute(
+                "SELECT 1 FROM dedup_keys WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is not None:
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dedup_keys (key, expires_at)"
+                " VALUES (?, ?)",
+                (key, now + self.window),
+            )
+            self._claims += 1
+            if self._claims % _PRUNE_INTERVAL == 0:
+                self._prune(now)
+        return True
+
+    def release(self, key: bytes) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM dedup_keys WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM dedup_keys")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _prune(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM dedup_keys WHERE expires_at <= ?", (now,)
+        )
+        self._conn.execute(
+            "DELETE FROM dedup_keys WHERE key IN (SELECT key FROM dedup_keys"
+            " ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+STATUS_OK = "OK"
+STATUS_BLOCKED = "Blocked token"
+
+DEFAULT_TTL = 300.0
+DEFAULT_NEGATIVE_TTL = 86400.0
+
+
+class StatusCache:
+    """
+    Cache of token statuses.
+
+    Entries come from status checks and from the responses of real sends,
+    so a token that was just used successfully needs no status request.
+    A blocked token stays blocked, so 401 results are kept much longer.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+    ):
+        """
+        Initialize a StatusCache object.
+
+        Args:
+            ttl (float): Seconds an 'OK' status is reused.
+            negative_ttl (float): Seconds a 'Blocked token' status is
+                reused.
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[str]:
+        """Return the cached status of a token, or None if missing or
+        expired."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            status, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[token]
+                return None
+            return status
+
+    def put(self, token: str, status: str) -> None:
+        """
+        Cache a status. Only 'OK' and 'Blocked token' are cached; anything
+        else evicts the entry so the next check goes to the API.
+        """
+        if status == STATUS_OK:
+            ttl = self.ttl
+        elif status == STATUS_BLOCKED:
+            ttl = self.negative_ttl
+        else:
+            self.invalidate(token)
+            return
+        with self._lock:
+            self._entries[token] = (status, time.monotonic() + ttl)
+
+    def observe(self, token: str, status_code: int) -> None:
+        """
+        Update the cache from the status code of a response sent with the
+        token.
+
+        Args:
+            token (str): The token the request was sent with.
+            status_code (int): HTTP status code of the response.
+        """
+        if status_code == 200:
+            self.put(token, STATUS_OK)
+        elif status_code == 401:
+            self.put(token, STATUS_BLOCKED)
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """Drop a token's entry, or every entry when no token is given."""
+        with self._lock:
+            if token is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(token, None)
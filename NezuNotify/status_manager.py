@@ -1,54 +1,205 @@
-from typing import Dict, List
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import requests
 
+from .rate_limiter import RateLimiter
+from .results import StatusResult
+from .status_cache import STATUS_BLOCKED, STATUS_OK, StatusCache
+from .transport import Transport, translate_error
 from .urls import APIUrls
 
+DEFAULT_MAX_WORKERS = 10
+DEFAULT_MAX_TRACKED = 10000
+
 
 class StatusManager:
-    def __init__(self, csrf: str, cookie: str):
-        self.status: Dict[str, str] = {}
+    def __init__(
+        self,
+        csrf: str,
+        cookie: str,
+        transport: Optional[Transport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        status_cache: Optional[StatusCache] = None,
+        max_tracked: int = DEFAULT_MAX_TRACKED,
+    ):
+        # Last status of the most recently checked tokens, oldest first.
+        self.status: "OrderedDict[str, str]" = OrderedDict()
+        self.max_tracked = max_tracked
+        self._status_lock = threading.Lock()
         self.csrf = csrf
         self.cookie = cookie
+        self.transport = transport or Transport()
+        self.rate_limiter = rate_limiter
+        self.status_cache = status_cache
 
-    def check_token_statuses(self, tokens: List[str]) -> Dict[str, str]:
+    def check_token_statuses(
+        self,
+        tokens: List[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, StatusResult]:
         """
         Check the status of multiple tokens.
 
         Args:
             tokens (List[str]): A list of tokens to check.
+            max_workers (int): Maximum number of requests in flight.
+            timeout (Optional[float]): Per-request timeout in seconds.
 
         Returns:
-            Dict[str, str]: A dictionary mapping each token to its status.
+            Dict[str, StatusResult]: The outcome of each check, by token.
         """
-        if not tokens:
-            return {"warning": "No tokens provided."}
+        return dict(self.iter_token_statuses(tokens, max_workers, timeout))
 
-        return {
-            token: self._check_single_token_status(token) for token in tokens
-        }
+    def iter_token_statuses(
+        self,
+        tokens: List[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Tuple[str, StatusResult]]:
+        """
+        Check tokens concurrently and yield results as they complete.
+
+        Args:
+            tokens (List[str]): A list of tokens to check.
+            max_workers (int): Maximum number of requests in flight.
+            timeout (Optional[float]): Per-request timeout in seconds.
+
+        Yields:
+            Tuple[str, StatusResult]: Each token and the outcome of its
+                check, in completion order.
+        """
+        check = self.check_status
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(check, token, timeout): token
+                for token in dict.fromkeys(tokens)
+            }
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                # Stop queued checks if the caller abandons the iterator.
+                for future in futures:
+                    future.cancel()
+
+    def summarize_token_statuses(
+        self,
+        tokens: List[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Optional[Union[str, int]]]]:
+        """
+        Check tokens concurrently and report status with rate-limit quota.
 
-    def _check_single_token_status(self, token: str) -> str:
+        Args:
+            tokens (List[str]): A list of tokens to check.
+            max_workers (int): Maximum number of requests in flight.
+            timeout (Optional[float]): Per-request timeout in seconds.
+
+        Returns:
+            Dict[str, Dict[str, Optional[Union[str, int]]]]: For each token,
+                its status and the limit, remaining and reset values of the
+                X-RateLimit headers (None when the response had none or the
+                status was served from the cache).
+        """
+        summary: Dict[str, Dict[str, Optional[Union[str, int]]]] = {}
+        for token, result in self.iter_token_statuses(
+            tokens, max_workers, timeout
+        ):
+            info = result.rate_limit
+            summary[token] = {
+                "status": result.status,
+                "limit": info.limit if info else None,
+                "remaining": info.remaining if info else None,
+                "reset": info.reset if info else None,
+            }
+        return summary
+
+    def check_status(
+        self,
+        token: str,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> StatusResult:
         """
         Check the status of a single token.
 
         Args:
             token (str): The token to check.
+            timeout (Optional[float]): Request timeout in seconds.
+            use_cache (bool): Return a cached status when one is fresh.
 
         Returns:
-            str: The status of the token.
+            StatusResult: The outcome of the check.
         """
+        if use_cache and self.status_cache:
+            cached = self.status_cache.get(token)
+            if cached is not None:
+                self._track(token, cached)
+                return StatusResult(
+                    token, cached, cached == STATUS_OK, cached=True
+                )
+
         headers = {
             "Authorization": f"Bearer {token}",
             "X-CSRF-TOKEN": self.csrf,
             "Cookie": self.cookie,
         }
+        kwargs: Dict[str, Any] = {"timeout": timeout} if timeout else {}
+        start = time.monotonic()
         try:
-            response = requests.get(APIUrls.STATUS_URL, headers=headers)
-            response.raise_for_status()
-            return self._determine_status(response)
+            response = self.transport.request(
+                "GET",
+                APIUrls.STATUS_URL,
+                operation="status",
+                headers=headers,
+                **kwargs,
+            )
         except requests.RequestException as error:
-            return f"Error: {str(error)}"
+            status = f"Error: {str(error)}"
+            result = StatusResult(
+                token,
+                status,
+                False,
+                elapsed=time.monotonic() - start,
+                error=translate_error(error),
+            )
+        else:
+            if self.rate_limiter:
+                self.rate_limiter.update(token, response.headers)
+            status = self._determine_status(response)
+            if self.status_cache:
+                self.status_cache.put(token, status)
+            result = StatusResult(
+                token,
+                status,
+                status == STATUS_OK,
+                response.status_code,
+                time.monotonic() - start,
+                response.headers,
+            )
+        self._track(token, status)
+        return result
+
+    def _track(self, token: str, status: str) -> None:
+        with self._status_lock:
+            self.status[token] = status
+            self.status.move_to_end(token)
+            while len(self.status) > self.max_tracked:
+                self.status.popitem(last=False)
+
+    def _check_single_token_status(
+        self,
+        token: str,
+        timeout: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> str:
+        return self.check_status(token, timeout, use_cache).status
 
     def _determine_status(self, response: requests.Response) -> str:
         """
@@ -61,8 +212,8 @@ class StatusManager:
             str: The determined status.
         """
         if response.status_code == 200:
-            return "OK"
+            return STATUS_OK
         elif response.status_code == 401:
-            return "Blocked token"
+            return STATUS_BLOCKED
         else:
             return f"Unexpected status code: {response.status_code}"
@@ -0,0 +1,341 @@
+import threading
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .exceptions import NezuNotifyValueError
+from .line_notify import MAX_MESSAGE_LENGTH
+
+DEFAULT_CACHE_SIZE = 256
+TRUNCATION_SUFFIX = "…"
+
+# A compiled template is a tuple of (literal text, field path, conversion,
+# format spec) segments, as produced by string.Formatter.parse.
+Segment = Tuple[str, Optional[Tuple[str, ...]], Optional[str], str]
+
+_formatter = Formatter()
+
+
+@lru_cache(maxsize=DEFAULT_CACHE_SIZE)
+def compile_template(source: str) -> Tuple[Segment, ...]:
+    """
+    Parse a str.format style template into render-ready segments.
+
+    Fields are looked up in the context by name. Dotted names such as
+    '{host.name}' walk nested mappings. Positional, nested and computed
+    fields are not supported.
+
+    Args:
+        source (str): The template text.
+
+    Returns:
+        Tuple[Segment, ...]: The compiled segments.
+
+    Raises:
+        NezuNotifyValueError: If the template is malformed.
+    """
+    segments: List[Segment] = []
+    try:
+        for literal, field, format_spec, conversion in _formatter.parse(
+            source
+        ):
+            if field is None:
+                segments.append((literal, None, None, ""))
+                continue
+            if not field or field.isdigit() or "[" in field:
+                raise NezuNotifyValueError(
+                    f"Unsupported template field '{{{field}}}'."
+                )
+            if format_spec and "{" in format_spec:
+                raise NezuNotifyValueError(
+                    f"Nested fields are not supported in '{{{field}}}'."
+                )
+            if conversion not in (None, "s", "r", "a"):
+                raise NezuNotifyValueError(
+                    f"Invalid conversion '!{conversion}' in '{{{field}}}'."
+                )
+            segments.append(
+                (
+                    literal,
+                    tuple(field.split(".")),
+                    conversion,
+                    format_spec or "",
+                )
+            )
+    except ValueError as e:
+        raise NezuNotifyValueError(f"Invalid template: {e}") from e
+    return tuple(segments)
+
+
+class RenderedMessage:
+    """A rendered template, ready to be sent."""
+
+    __slots__ = ("message", "image", "sticker", "truncated")
+
+    def __init__(
+        self,
+        message: str,
+        image: Optional[str] = None,
+        sticker: Optional[Tuple[str, str]] = None,
+        truncated: bool = False,
+    ):
+        self.message = message
+        self.image = image
+        self.sticker = sticker
+        self.truncated = truncated
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        """Keyword arguments for LineNotify.send."""
+        payload: Dict[str, Any] = {"message": self.message}
+        if self.image is not None:
+            payload["image"] = self.image
+        elif self.sticker is not None:
+            payload["sticker"] = self.sticker
+        return payload
+
+    def __repr__(self) -> str:
+        return (
+            f"RenderedMessage(message={self.message!r}, image={self.image!r}, "
+            f"sticker={self.sticker!r}, truncated={self.truncated})"
+        )
+
+
+class MessageTemplate:
+    """
+    A compiled message template.
+
+    The severity given at render time selects the image or sticker sent
+    with the message. An image takes precedence over a sticker.
+    """
+
+    __slots__ = (
+        "name",
+        "source",
+        "segments",
+        "max_length",
+        "stickers",
+        "images",
+        "strict",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        source: str,
+        max_length: int = MAX_MESSAGE_LENGTH,
+        stickers: Optional[Mapping[str, Tuple[str, str]]] = None,
+        images: Optional[Mapping[str, str]] = None,
+        strict: bool = True,
+    ):
+        """
+        Initialize a MessageTemplate object.
+
+        Args:
+            name (str): Template name.
+            source (str): str.format style template text.
+            max_length (int): Rendered messages longer than this are
+                truncated.
+            stickers (Optional[Mapping[str, Tuple[str, str]]]): Sticker
+                package ID and sticker ID per severity.
+            images (Optional[Mapping[str, str]]): Image URL or local path
+                per severity.
+            strict (bool): Raise on fields missing from the context instead
+                of rendering them empty.
+
+        Raises:
+            NezuNotifyValueError: If the template is malformed.
+        """
+        if max_length <= len(TRUNCATION_SUFFIX):
+            raise NezuNotifyValueError(
+                f"max_length must be greater than {len(TRUNCATION_SUFFIX)}."
+            )
+        self.name = name
+        self.source = source
+        self.segments = compile_template(source)
+        self.max_length = max_length
+        self.stickers = dict(stickers or {})
+        self.images = dict(images or {})
+        self.strict = strict
+
+    def render(
+        self, context: Mapping[str, Any], severity: Optional[str] = None
+    ) -> RenderedMessage:
+        """
+        Render the template.
+
+        Args:
+            context (Mapping[str, Any]): Values of the template fields.
+            severity (Optional[str]): Severity selecting the image or
+                sticker. Defaults to context['severity'].
+
+        Returns:
+            RenderedMessage: The message and its attachment.
+
+        Raises:
+            NezuNotifyValueError: If a field is missing in strict mode or
+                a value cannot be formatted.
+        """
+        parts = []
+        for literal, path, conversion, format_spec in self.segments:
+            if literal:
+                parts.append(literal)
+            if path is None:
+                continue
+            value = self._lookup(context, path)
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "a":
+                value = ascii(value)
+            elif conversion == "s":
+                value = str(value)
+            try:
+                parts.append(format(value, format_spec))
+            except (TypeError, ValueError) as e:
+                raise NezuNotifyValueError(
+                    f"Cannot format '{'.'.join(path)}' in template "
+                    f"'{self.name}': {e}"
+                ) from e
+        message = "".join(parts)
+
+        truncated = len(message) > self.max_length
+        if truncated:
+            cut = self.max_length - len(TRUNCATION_SUFFIX)
+            message = message[:cut] + TRUNCATION_SUFFIX
+
+        if severity is None:
+            severity = context.get("severity")
+        image = sticker = None
+        if severity is not None:
+            image = self.images.get(severity)
+            sticker = self.stickers.get(severity)
+        return RenderedMessage(message, image, sticker, truncated)
+
+    def _lookup(
+        self, context: Mapping[str, Any], path: Tuple[str, ...]
+    ) -> Any:
+        value: Any = context
+        for key in path:
+            if isinstance(value, Mapping) and key in value:
+                value = value[key]
+            elif not isinstance(value, Mapping) and hasattr(value, key):
+                value = getattr(value, key)
+            elif self.strict:
+                raise NezuNotifyValueError(
+                    f"Missing field '{'.'.join(path)}' for template "
+                    f"'{self.name}'."
+                )
+            else:
+                return ""
+        return value
+
+    def __repr__(self) -> str:
+        return f"MessageTemplate(name={self.name!r})"
+
+
+class TemplateRegistry:
+    """
+    Named message templates, compiled once when registered.
+
+    Stickers and images given to the registry are the defaults for every
+    template, and templates can override them per severity.
+    """
+
+    def __init__(
+        self,
+        max_length: int = MAX_MESSAGE_LENGTH,
+        stickers: Optional[Mapping[str, Tuple[str, str]]] = None,
+        images: Optional[Mapping[str, str]] = None,
+        strict: bool = True,
+    ):
+        """
+        Initialize a TemplateRegistry object.
+
+        Args:
+            max_length (int): Default maximum length of rendered messages.
+            stickers (Optional[Mapping[str, Tuple[str, str]]]): Default
+                sticker package ID and sticker ID per severity.
+            images (Optional[Mapping[str, str]]): Default image URL or local
+                path per severity.
+            strict (bool): Default handling of missing fields, see
+                MessageTemplate.
+        """
+        self.max_length = max_length
+        self.stickers = dict(stickers or {})
+        self.images = dict(images or {})
+        self.strict = strict
+        self._templates: Dict[str, MessageTemplate] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        source: str,
+        max_length: Optional[int] = None,
+        stickers: Optional[Mapping[str, Tuple[str, str]]] = None,
+        images: Optional[Mapping[str, str]] = None,
+        strict: Optional[bool] = None,
+    ) -> MessageTemplate:
+        """
+        Compile and register a template, replacing any with the same name.
+
+        Args:
+            name (str): Template name.
+            source (str): str.format style template text.
+            max_length (Optional[int]): Overrides the registry's maximum
+                length.
+            stickers (Optional[Mapping[str, Tuple[str, str]]]): Stickers per
+                severity, merged over the registry's.
+            images (Optional[Mapping[str, str]]): Images per severity,
+                merged over the registry's.
+            strict (Optional[bool]): Overrides the registry's handling of
+                missing fields.
+
+        Returns:
+            MessageTemplate: The compiled template.
+
+        Raises:
+            NezuNotifyValueError: If the template is malformed.
+        """
+        template = MessageTemplate(
+            name,
+            source,
+            self.max_length if max_length is None else max_length,
+            {**self.stickers, **(stickers or {})},
+            {**self.images, **(images or {})},
+            self.strict if strict is None else strict,
+        )
+        with self._lock:
+            self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> MessageTemplate:
+        """
+        Return a registered template.
+
+        Raises:
+            NezuNotifyValueError: If no template has that name.
+        """
+        template = self._templates.get(name)
+        if template is None:
+            raise NezuNotifyValueError(f"Unknown template '{name}'.")
+        return template
+
+    def render(
+        self,
+        name: str,
+        context: Mapping[str, Any],
+        severity: Optional[str] = None,
+    ) -> RenderedMessage:
+        """Render a registered template, see MessageTemplate.render."""
+        return self.get(name).render(context, severity)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._templates.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._templates
+
+    def __len__(self) -> int:
+        return len(self._templates)
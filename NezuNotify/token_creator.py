@@ -1,69 +1,83 @@
 from typing import List, Optional
 
-import requests
-
-from .urls import APIUrls
+from .results import TokenResult
+from .token_provisioner import (
+    DEFAULT_MAX_WORKERS,
+    MAX_TOKENS,
+    TokenProvisioner,
+    TokenRequest,
+)
+from .token_store import TokenStore
+from .transport import Transport
 
 
 class TokenCreator:
-    def __init__(self, csrf: str, cookie: str):
+    def __init__(
+        self,
+        csrf: str,
+        cookie: str,
+        transport: Optional[Transport] = None,
+        token_store: Optional[TokenStore] = None,
+    ):
         self.csrf = csrf
         self.cookie = cookie
+        self.transport = transport or Transport()
+        self.provisioner = TokenProvisioner(
+            csrf, cookie, self.transport, token_store
+        )
 
-    def create_token(self, target_mid: str, description: str) -> Optional[str]:
-        url = APIUrls.PERSONAL_ACCESS_TOKEN_URL
-        data = {
-            "action": "issuePersonalAccessToken",
-            "description": description,
-            "targetType": "GROUP",
-            "targetMid": target_mid,
-            "_csrf": self.csrf,
-        }
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Cookie": self.cookie,
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/58.0.3029.110 Safari/537.36"
-            ),
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "X-Requested-With": "XMLHttpRequest",
-        }
-        try:
-            response = requests.post(url, headers=headers, data=data)
-            response.raise_for_status()
-            if response.status_code == 200:
-                return response.json().get("token")
-            else:
-                return (
-                    f"Failed to generate token. Status code: "
-                    f"{response.status_code}, Response: {response.text}"
-                )
-        except requests.RequestException as e:
-            return (
-                f"Error occurred while generating LINE Notify token: "
-                f"{str(e)}"
-            )
+    def create_token(self, target_mid: str, description: str) -> TokenResult:
+        return self.provisioner.create_token(target_mid, description)
 
     def create_multiple_tokens(
         self,
         target_mid: str,
         num_tokens: int = 1,
         custom_string: Optional[str] = None,
-    ) -> List[str]:
-        num_tokens = min(num_tokens, 100)
-        tokens = [
-            self.create_token(target_mid, custom_string or "NezuNotify")
-            for _ in range(num_tokens)
-        ]
-        valid_tokens = [
-            token
-            for token in tokens
-            if isinstance(token, str) and token.startswith("token_")
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> List[TokenResult]:
+        """
+        Create several tokens for the same target concurrently.
+
+        Args:
+            target_mid (str): MID of the tokens' target.
+            num_tokens (int): Number of tokens, at most MAX_TOKENS.
+            custom_string (Optional[str]): Token description. Tokens are
+                stored as '<description>-<n>' when there are several or the
+                description is already taken, numbered after the highest
+                '<description>-<n>' stored for the target.
+            max_workers (int): Maximum number of requests in flight.
+
+        Returns:
+            List[TokenResult]: Per-token outcomes.
+        """
+        description = custom_string or "NezuNotify"
+        num_tokens = min(num_tokens, MAX_TOKENS)
+        token_requests = [
+            TokenRequest(target_mid, description, name=name)
+            for name in self._token_names(target_mid, description, num_tokens)
         ]
+        return self.provisioner.provision(token_requests, max_workers)
 
-        if valid_tokens:
-            return valid_tokens
-        else:
-            return ["Failed to generate tokens."]
+    def _token_names(
+        self, target_mid: str, description: str, num_tokens: int
+    ) -> List[Optional[str]]:
+        """Names for new tokens that do not replace stored ones."""
+        store = self.provisioner.token_store
+        taken = (
+            {record.name for record in store.list(target_mid)}
+            if store
+            else set()
+        )
+        if num_tokens == 1 and description not in taken:
+            return [None]
+        prefix = f"{description}-"
+        last = max(
+            (
+                int(name[len(prefix) :])
+                for name in taken
+                if name.startswith(prefix) and name[len(prefix) :].isdigit()
+            ),
+            default=0,
+        )
+        return [f"{prefix}{last + i}" for i in range(1, num_tokens + 1)]
@@ -1,33 +1,106 @@
 import logging
+from typing import Dict, List, Optional
 
-from .status_manager import StatusManager
+from .rate_limiter import RateLimiter, RateLimitInfo
+from .results import (
+    BulkRevokeResult,
+    RevokeResult,
+    StatusResult,
+    TokenResult,
+)
+from .status_cache import STATUS_BLOCKED, StatusCache
+from .status_manager import DEFAULT_MAX_WORKERS, StatusManager
 from .token_creator import TokenCreator
+from .token_provisioner import DEFAULT_MAX_WORKERS as PROVISION_MAX_WORKERS
+from .token_provisioner import TokenRequest
+from .token_revoker import DEFAULT_MAX_WORKERS as REVOKE_MAX_WORKERS
 from .token_revoker import TokenRevoker
+from .token_store import TokenStore
+from .transport import Transport
 
 
 class TokenManager:
-    def __init__(self, csrf: str, cookie: str):
+    def __init__(
+        self,
+        csrf: str,
+        cookie: str,
+        transport: Optional[Transport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        token_store: Optional[TokenStore] = None,
+        status_cache: Optional[StatusCache] = None,
+    ):
         self.csrf = csrf
         self.cookie = cookie
-        logging.info(f"CSRF Token: {self.csrf}")
-        logging.info(f"Cookie: {self.cookie}")
-        self.token_creator = TokenCreator(csrf, cookie)
-        self.token_revoker = TokenRevoker(csrf, cookie)
-        self.status_manager = StatusManager(csrf, cookie)
+        # Session secrets are never logged, not even in part.
+        logging.info(f"CSRF Token: {'set' if self.csrf else 'missing'}")
+        logging.info(f"Cookie: {'set' if self.cookie else 'missing'}")
+        self.transport = transport or Transport()
+        self.token_store = token_store
+        self.token_creator = TokenCreator(
+            csrf, cookie, self.transport, token_store
+        )
+        self.token_revoker = TokenRevoker(csrf, cookie, self.transport)
+        self.status_manager = StatusManager(
+            csrf, cookie, self.transport, rate_limiter, status_cache
+        )
 
-    def create_token(self, target_mid: str, description: str) -> str:
+    def create_token(self, target_mid: str, description: str) -> TokenResult:
         return self.token_creator.create_token(target_mid, description)
 
-    def revoke_token(self, token: str) -> str:
-        return self.token_revoker.revoke(token)
+    def create_tokens(
+        self,
+        token_requests: List[TokenRequest],
+        max_workers: int = PROVISION_MAX_WORKERS,
+    ) -> List[TokenResult]:
+        return self.token_creator.provisioner.provision(
+            token_requests, max_workers
+        )
+
+    def revoke_token(self, token: str) -> RevokeResult:
+        result = self.token_revoker.revoke(token)
+        if result.ok:
+            self._record_revoked(token)
+        return result
 
-    def revoke_all_tokens(self, tokens: list[str]) -> str:
-        results = [self.revoke_token(token) for token in tokens]
-        return (
-            "All tokens have been revoked."
-            if all(results)
-            else "Failed to revoke some tokens."
+    def revoke_all_tokens(
+        self, tokens: List[str], max_workers: int = REVOKE_MAX_WORKERS
+    ) -> BulkRevokeResult:
+        result = self.token_revoker.revoke_many(tokens, max_workers)
+        for token in result.succeeded:
+            self._record_revoked(token)
+        return result
+
+    def check_token_status(self, token: str) -> StatusResult:
+        result = self.status_manager.check_status(token)
+        self._record_status(token, result.status, result.rate_limit)
+        return result
+
+    def check_token_statuses(
+        self,
+        tokens: List[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, StatusResult]:
+        results = self.status_manager.check_token_statuses(
+            tokens, max_workers, timeout
         )
+        for token, result in results.items():
+            self._record_status(token, result.status, result.rate_limit)
+        return results
 
-    def check_token_status(self, token: str) -> dict:
-        return self.status_manager._check_single_token_status(token)
+    def _record_revoked(self, token: str) -> None:
+        if self.status_manager.status_cache:
+            self.status_manager.status_cache.put(token, STATUS_BLOCKED)
+        self._record_status(token, "Revoked")
+
+    def _record_status(
+        self,
+        token: str,
+        status: str,
+        info: Optional[RateLimitInfo] = None,
+    ) -> None:
+        if not self.token_store:
+            return
+        self.token_store.update_status(
+            token, status, info.remaining if info else None
+        )
@@ -0,0 +1,213 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .exceptions import NezuNotifyAuthError, NezuNotifyValueError
+from .line_notify import LineNotify
+from .multipart import ImageSource
+from .rate_limiter import DEFAULT_LIMIT, RateLimiter
+from .results import SendResult
+from .status_cache import StatusCache
+from .transport import Transport
+
+ROUND_ROBIN = "round_robin"
+LEAST_LOADED = "least_loaded"
+STRATEGIES = (ROUND_ROBIN, LEAST_LOADED)
+
+
+class TokenPool:
+    """
+    Spread sends for a single target across several LINE Notify tokens.
+
+    The pool exposes the same send methods as LineNotify. Tokens are picked
+    round-robin or by the largest remaining rate-limit budget, and a token
+    answered with 401 is taken out of rotation and the send retried on the
+    next one.
+    """
+
+    def __init__(
+        self,
+        tokens: List[str],
+        transport: Optional[Transport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        strategy: str = ROUND_ROBIN,
+        raise_on_error: bool = False,
+        status_cache: Optional[StatusCache] = None,
+    ):
+        """
+        Initialize a TokenPool object.
+
+        Args:
+            tokens (List[str]): LINE Notify tokens for the same target.
+            transport (Optional[Transport]): Pooled HTTP transport.
+            rate_limiter (Optional[RateLimiter]): Scheduler tracking each
+                token's quota. A new one is created when omitted.
+            strategy (str): 'round_robin' or 'least_loaded'.
+            raise_on_error (bool): Raise NezuNotify exceptions instead of
+                returning error messages.
+            status_cache (Optional[StatusCache]): Cache updated with the
+                outcome of every send.
+
+        Raises:
+            NezuNotifyValueError: If no tokens are given or the strategy is
+                unknown.
+        """
+        if not tokens:
+            raise NezuNotifyValueError("At least one token is required.")
+        if strategy not in STRATEGIES:
+            raise NezuNotifyValueError(
+                "Invalid strategy. It must be 'round_robin' or "
+                "'least_loaded'."
+            )
+        self.transport = transport or Transport()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.strategy = strategy
+        self.raise_on_error = raise_on_error
+        self.status_cache = status_cache
+        self.blocked_tokens: List[str] = []
+        self._line_notifies: Dict[str, LineNotify] = {}
+        self._cursor = 0
+        self._lock = threading.Lock()
+        for token in tokens:
+            self.add_token(token)
+
+    @property
+    def tokens(self) -> List[str]:
+        """Tokens currently in rotation."""
+        with self._lock:
+            return list(self._line_notifies)
+
+    def add_token(self, token: str) -> None:
+        """Put a token into rotation."""
+        with self._lock:
+            if token in self._line_notifies:
+                return
+            self._line_notifies[token] = LineNotify(
+                token,
+                self.transport,
+                self.rate_limiter,
+                status_cache=self.status_cache,
+            )
+            if token in self.blocked_tokens:
+                self.blocked_tokens.remove(token)
+
+    def remove_token(self, token: str) -> None:
+        """Take a token out of rotation."""
+        with self._lock:
+            self._line_notifies.pop(token, None)
+
+    def send(
+        self,
+        message: str,
+        image: Optional[ImageSource] = None,
+        sticker: Optional[Tuple[str, str]] = None,
+    ) -> SendResult:
+        upload = image is not None and not (
+            isinstance(image, str)
+            and image.startswith(("http://", "https://"))
+        )
+        if image is not None:
+            image = _readable_once(image)
+        return self._dispatch(
+            lambda ln: ln.send(message, image, sticker), image=upload
+        )
+
+    def send_message(self, message: str) -> SendResult:
+        return self._dispatch(lambda ln: ln.send_message(message))
+
+    def send_image_with_url(self, text: str, url: str) -> SendResult:
+        return self._dispatch(lambda ln: ln.send_image_with_url(text, url))
+
+    def send_image_with_local_path(self, text: str, path: str) -> SendResult:
+        return self._dispatch(
+            lambda ln: ln.send_image_with_local_path(text, path), image=True
+        )
+
+    def send_image(
+        self,
+        text: str,
+        image: ImageSource,
+        filename: Optional[str] = None,
+    ) -> SendResult:
+        content = _readable_once(image)
+        return self._dispatch(
+            lambda ln: ln.send_image(text, content, filename), image=True
+        )
+
+    def send_sticker(
+        self, message: str, sticker_id: str, sticker_package_id: str
+    ) -> SendResult:
+        return self._dispatch(
+            lambda ln: ln.send_sticker(message, sticker_id, sticker_package_id)
+        )
+
+    def _dispatch(
+        self, send: Callable[[LineNotify], SendResult], image: bool = False
+    ) -> SendResult:
+        while True:
+            try:
+                line_notify = self._select(image)
+            except NezuNotifyAuthError as e:
+                if self.raise_on_error:
+                    raise
+                return SendResult(False, error=e)
+            result = send(line_notify)
+            if isinstance(result.error, NezuNotifyAuthError):
+                self._block(line_notify.token)
+                continue
+            if self.raise_on_error:
+                result.raise_for_error()
+            return result
+
+    def _select(self, image: bool) -> LineNotify:
+        with self._lock:
+            candidates = list(self._line_notifies.values())
+            if not candidates:
+                raise NezuNotifyAuthError(
+                    "Every token in the pool is blocked."
+                )
+            if self.strategy == ROUND_ROBIN:
+                start = self._cursor % len(candidates)
+                self._cursor += 1
+                candidates = candidates[start:] + candidates[:start]
+                for line_notify in candidates:
+                    if self._budget(line_notify.token, image) > 0:
+                        return line_notify
+            else:
+                best = max(
+                    candidates,
+                    key=lambda ln: self._budget(ln.token, image),
+                )
+                if self._budget(best.token, image) > 0:
+                    return best
+        # Every token is out of quota: queue behind the earliest reset.
+        return min(candidates, key=lambda ln: self._reset(ln.token))
+
+    def _budget(self, token: str, image: bool) -> int:
+        state = self.rate_limiter.get(token)
+        if state is None:
+            return DEFAULT_LIMIT
+        if image and state.image_remaining is not None:
+            return min(state.remaining, state.image_remaining)
+        return state.remaining
+
+    def _reset(self, token: str) -> int:
+        state = self.rate_limiter.get(token)
+        return state.reset if state else 0
+
+    def _block(self, token: str) -> None:
+        with self._lock:
+            if self._line_notifies.pop(token, None) is not None:
+                self.blocked_tokens.append(token)
+                logging.warning(
+                    "Removed a blocked token from the pool "
+                    f"({len(self._line_notifies)} left)."
+                )
+
+
+def _readable_once(image: ImageSource) -> ImageSource:
+    """Read file objects up front so a send retried on another token
+    uploads the same content."""
+    if isinstance(image, (str, bytes, bytearray, memoryview)):
+        return image
+    return image.read()
@@ -0,0 +1,249 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+import requests
+
+from .exceptions import NezuNotifyAPIError
+from .results import TokenResult
+from .retry import NO_RETRY, RetryPolicy
+from .token_store import TokenStore
+from .transport import Transport, translate_error
+from .urls import APIUrls
+
+DEFAULT_MAX_WORKERS = 4
+MAX_TOKENS = 100
+# Only throttled requests are retried: a request that failed any other way
+# may still have created a token.
+THROTTLE_RETRY_POLICY = RetryPolicy(
+    max_attempts=5,
+    base_delay=1.0,
+    max_delay=60.0,
+    retry_statuses=frozenset({429}),
+)
+
+
+class TokenRequest:
+    """A token to create."""
+
+    __slots__ = ("target_mid", "description", "target_type", "name")
+
+    def __init__(
+        self,
+        target_mid: str,
+        description: str = "NezuNotify",
+        target_type: str = "GROUP",
+        name: Optional[str] = None,
+    ):
+        """
+        Initialize a TokenRequest object.
+
+        Args:
+            target_mid (str): MID of the token's target.
+            description (str): Token name shown in LINE Notify.
+            target_type (str): 'GROUP' or 'USER'.
+            name (Optional[str]): Name the token is stored under in a token
+                store. Defaults to the description.
+        """
+        self.target_mid = target_mid
+        self.description = description
+        self.target_type = target_type
+        self.name = name or description
+
+    def __repr__(self) -> str:
+        return (
+            f"TokenRequest(target_mid={self.target_mid!r}, "
+            f"description={self.description!r}, name={self.name!r})"
+        )
+
+
+class TokenProvisioner:
+    """
+    Creates personal access tokens concurrently.
+
+    When LINE throttles token creation every worker pauses until the
+    server's Retry-After or rate-limit reset has passed, and the throttled
+    request is retried.
+    """
+
+    def __init__(
+        self,
+        csrf: str,
+        cookie: str,
+        transport: Optional[Transport] = None,
+        token_store: Optional[TokenStore] = None,
+        retry_policy: RetryPolicy = THROTTLE_RETRY_POLICY,
+    ):
+        """
+        Initialize a TokenProvisioner object.
+
+        Args:
+            csrf (str): CSRF token
+            cookie (str): Session cookie
+            transport (Optional[Transport]): Pooled HTTP transport.
+            token_store (Optional[TokenStore]): Store every created token is
+                saved to.
+            retry_policy (RetryPolicy): Backoff for throttled requests.
+        """
+        self.csrf = csrf
+        self.cookie = cookie
+        self.transport = transport or Transport()
+        self.token_store = token_store
+        self.retry_policy = retry_policy
+        self.headers = {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Cookie": self.cookie,
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/58.0.3029.110 Safari/537.36"
+            ),
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "X-Requested-With": "XMLHttpRequest",
+        }
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def create_token(
+        self,
+        target_mid: str,
+        description: str = "NezuNotify",
+        target_type: str = "GROUP",
+    ) -> TokenResult:
+        """
+        Create a single token.
+
+        Args:
+            target_mid (str): MID of the token's target.
+            description (str): Token name shown in LINE Notify.
+            target_type (str): 'GROUP' or 'USER'.
+
+        Returns:
+            TokenResult: The outcome of the creation.
+        """
+        return self.provision_one(
+            TokenRequest(target_mid, description, target_type)
+        )
+
+    def provision(
+        self,
+        token_requests: Iterable[TokenRequest],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> List[TokenResult]:
+        """
+        Create tokens concurrently.
+
+        Args:
+            token_requests (Iterable[TokenRequest]): The tokens to create.
+            max_workers (int): Maximum number of requests in flight.
+
+        Returns:
+            List[TokenResult]: Per-token outcomes, in the order given.
+        """
+        token_requests = list(token_requests)
+        if len(token_requests) <= 1 or max_workers <= 1:
+            return [self.provision_one(r) for r in token_requests]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.provision_one, token_requests))
+
+    def provision_one(self, token_request: TokenRequest) -> TokenResult:
+        """Create one token, saving it to the token store if configured."""
+        result = self._create(token_request)
+        if result.ok and self.token_store and result.token:
+            self.token_store.save(
+                token_request.target_mid, token_request.name, result.token
+            )
+        return result
+
+    def _create(self, token_request: TokenRequest) -> TokenResult:
+        data = {
+            "action": "issuePersonalAccessToken",
+            "description": token_request.description,
+            "targetType": token_request.target_type,
+            "targetMid": token_request.target_mid,
+            "_csrf": self.csrf,
+        }
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self._wait_if_throttled()
+            try:
+                response = self.transport.request(
+                    "POST",
+                    APIUrls.PERSONAL_ACCESS_TOKEN_URL,
+                    operation="create",
+                    retry_policy=NO_RETRY,
+                    headers=self.headers,
+                    data=data,
+                )
+            except requests.RequestException as e:
+                return self._failure(token_request, start, e)
+            delay = None
+            if self.retry_policy.should_retry(attempt, response.status_code):
+                delay = self.retry_policy.compute_delay(
+                    attempt, response.headers
+                )
+            if delay is None:
+                break
+            response.close()
+            self._throttle(delay)
+
+        try:
+            response.raise_for_status()
+        except requests.RequestException as e:
+            return self._failure(token_request, start, e)
+        try:
+            token = response.json().get("token")
+        except ValueError:
+            token = None
+        elapsed = time.monotonic() - start
+        if not token:
+            return TokenResult(
+                token_request.target_mid,
+                token_request.description,
+                False,
+                status_code=response.status_code,
+                elapsed=elapsed,
+                headers=response.headers,
+                error=NezuNotifyAPIError(
+                    "No token in the response.", response.status_code
+                ),
+            )
+        return TokenResult(
+            token_request.target_mid,
+            token_request.description,
+            True,
+            token,
+            response.status_code,
+            elapsed,
+            response.headers,
+        )
+
+    def _failure(
+        self,
+        token_request: TokenRequest,
+        start: float,
+        error: requests.RequestException,
+    ) -> TokenResult:
+        response = error.response
+        return TokenResult(
+            token_request.target_mid,
+            token_request.description,
+            False,
+            status_code=None if response is None else response.status_code,
+            elapsed=time.monotonic() - start,
+            headers=None if response is None else response.headers,
+            error=translate_error(error),
+        )
+
+    def _throttle(self, delay: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    def _wait_if_throttled(self) -> None:
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
@@ -1,23 +1,120 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
 import requests
 
+from .results import BulkRevokeResult, RevokeResult
+from .retry import NO_RETRY, RetryPolicy
+from .transport import Transport, translate_error
+from .urls import APIUrls
+
+DEFAULT_MAX_WORKERS = 4
+
 
 class TokenRevoker:
-    def __init__(self, csrf: str, cookie: str):
+    def __init__(
+        self, csrf: str, cookie: str, transport: Optional[Transport] = None
+    ):
         self.csrf = csrf
         self.cookie = cookie
+        self.transport = transport or Transport()
         self.headers = {
             "X-CSRF-Token": self.csrf,
             "Cookie": self.cookie,
             "Content-Type": "application/x-www-form-urlencoded",
         }
 
-    def revoke(self, token: str) -> str:
-        url = "https://notify-bot.line.me/api/revoke"
+    def revoke(self, token: str) -> RevokeResult:
+        return self.revoke_with_result(token)
+
+    def revoke_with_result(
+        self, token: str, retry_policy: Optional[RetryPolicy] = None
+    ) -> RevokeResult:
+        """
+        Revoke a token, retrying transient failures.
+
+        Args:
+            token (str): The token to revoke.
+            retry_policy (Optional[RetryPolicy]): Overrides the transport's
+                'revoke' retry policy.
+
+        Returns:
+            RevokeResult: The outcome of the revocation.
+        """
+        url = APIUrls.UNOFFICIAL_REVOKE_URL
         payload = f"token={token}"
+        policy = retry_policy or self.transport.retry_policy("revoke")
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            response = None
+            try:
+                # Attempts are counted here rather than in the transport so
+                # that the result can report them.
+                response = self.transport.request(
+                    "POST",
+                    url,
+                    retry_policy=NO_RETRY,
+                    headers=self.headers,
+                    data=payload,
+                )
+                response.raise_for_status()
+                return RevokeResult(
+                    token,
+                    True,
+                    response.status_code,
+                    time.monotonic() - start,
+                    response.headers,
+                    attempts=attempt,
+                )
+            except requests.exceptions.RequestException as e:
+                headers = None if response is None else response.headers
+                status_code = (
+                    None if response is None else response.status_code
+                )
+                delay = (
+                    policy.compute_delay(attempt, headers)
+                    if policy.should_retry(attempt, status_code)
+                    else None
+                )
+                if delay is None:
+                    return RevokeResult(
+                        token,
+                        False,
+                        status_code,
+                        time.monotonic() - start,
+                        headers,
+                        translate_error(e),
+                        attempt,
+                    )
+            time.sleep(delay)
+
+    def revoke_many(
+        self,
+        tokens: List[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> BulkRevokeResult:
+        """
+        Revoke tokens concurrently.
+
+        Args:
+            tokens (List[str]): The tokens to revoke.
+            max_workers (int): Maximum number of revocations in flight.
+            retry_policy (Optional[RetryPolicy]): Overrides the transport's
+                'revoke' retry policy.
 
-        try:
-            response = requests.post(url, headers=self.headers, data=payload)
-            response.raise_for_status()
-            return "Token revoked successfully."
-        except requests.exceptions.RequestException as e:
-            return f"Error occurred while revoking token: {str(e)}"
+        Returns:
+            BulkRevokeResult: Per-token outcomes, in the order given.
+        """
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    lambda token: self.revoke_with_result(token, retry_policy),
+                    tokens,
+                )
+            )
+        return BulkRevokeResult(results, time.monotonic() - start)
@@ -0,0 +1,243 @@
+import json
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+from .database import connect
+from .exceptions import NezuNotifyValueError
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    target_mid TEXT NOT NULL,
+    name TEXT NOT NULL,
+    token TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_status TEXT,
+    last_checked REAL,
+    remaining INTEGER,
+    PRIMARY KEY (target_mid, name)
+);
+CREATE INDEX IF NOT EXISTS tokens_token ON tokens (token);
+"""
+
+_COLUMNS = (
+    "target_mid, name, token, created_at, last_status, last_checked, remaining"
+)
+
+
+class TokenRecord:
+    """A stored token and what was last learned about it."""
+
+    __slots__ = (
+        "target_mid",
+        "name",
+        "token",
+        "created_at",
+        "last_status",
+        "last_checked",
+        "remaining",
+    )
+
+    def __init__(
+        self,
+        target_mid: str,
+        name: str,
+        token: str,
+        created_at: float,
+        last_status: Optional[str] = None,
+        last_checked: Optional[float] = None,
+        remaining: Optional[int] = None,
+    ):
+        self.target_mid = target_mid
+        self.name = name
+        self.token = token
+        self.created_at = created_at
+        self.last_status = last_status
+        self.last_checked = last_checked
+        self.remaining = remaining
+
+    def __repr__(self) -> str:
+        return (
+            f"TokenRecord(target_mid={self.target_mid!r}, "
+            f"name={self.name!r}, last_status={self.last_status!r})"
+        )
+
+
+class TokenStore:
+    """
+    SQLite-backed store of tokens keyed by (target_mid, name).
+
+    Every write is a single statement, so several threads or processes can
+    share the same file safely.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize a TokenStore object.
+
+        Args:
+            path (str): SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path, _SCHEMA)
+
+    def save(self, target_mid: str, name: str, token: str) -> TokenRecord:
+        """
+        Store a token, replacing any token saved under the same name.
+
+        Args:
+            target_mid (str): MID of the token's target.
+            name (str): Name of the token within the target.
+            token (str): The token.
+
+        Returns:
+            TokenRecord: The stored record.
+        """
+        now = time.time()
+        self._execute(
+            "INSERT INTO tokens (target_mid, name, token, created_at)"
+            " VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (target_mid, name) DO UPDATE SET"
+            " token = excluded.token, created_at = excluded.created_at,"
+            " last_status = NULL, last_checked = NULL, remaining = NULL",
+            (target_mid, name, token, now),
+        )
+        return TokenRecord(target_mid, name, token, now)
+
+    def get(self, target_mid: str, name: str) -> Optional[TokenRecord]:
+        """Return the record stored under a target and name."""
+        rows = self._query(
+            f"SELECT {_COLUMNS} FROM tokens WHERE target_mid = ? AND name = ?",
+            (target_mid, name),
+        )
+        return rows[0] if rows else None
+
+    def get_token(self, target_mid: str, name: str) -> Optional[str]:
+        """Return the token stored under a target and name."""
+        record = self.get(target_mid, name)
+        return record.token if record else None
+
+    def find(self, token: str) -> List[TokenRecord]:
+        """Return every record holding the given token."""
+        return self._query(
+            f"SELECT {_COLUMNS} FROM tokens WHERE token = ?", (token,)
+        )
+
+    def list(
+        self, target_mid: Optional[str] = None, status: Optional[str] = None
+    ) -> List[TokenRecord]:
+        """
+        Return stored records, optionally filtered.
+
+        Args:
+            target_mid (Optional[str]): Only records for this target.
+            status (Optional[str]): Only records whose last status matches.
+
+        Returns:
+            List[TokenRecord]: Records ordered by target and name.
+        """
+        conditions = []
+        params: List[Any] = []
+        if target_mid is not None:
+            conditions.append("target_mid = ?")
+            params.append(target_mid)
+        if status is not None:
+            conditions.append("last_status = ?")
+            params.append(status)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._query(
+            f"SELECT {_COLUMNS} FROM tokens{where}"
+            " ORDER BY target_mid, name",
+            tuple(params),
+        )
+
+    def update_status(
+        self,
+        token: str,
+        status: str,
+        remaining: Optional[int] = None,
+        checked_at: Optional[float] = None,
+    ) -> int:
+        """
+        Record the outcome of a status check or send.
+
+        Args:
+            token (str): The token.
+            status (str): The status that was observed.
+            remaining (Optional[int]): Remaining rate-limit quota. The
+                stored value is kept when omitted.
+            checked_at (Optional[float]): When the status was observed.
+                Defaults to now.
+
+        Returns:
+            int: Number of records updated.
+        """
+        return self._execute(
+            "UPDATE tokens SET last_status = ?, last_checked = ?,"
+            " remaining = COALESCE(?, remaining) WHERE token = ?",
+            (status, checked_at or time.time(), remaining, token),
+        )
+
+    def delete(self, target_mid: str, name: str) -> bool:
+        """Delete the record stored under a target and name."""
+        return (
+            self._execute(
+                "DELETE FROM tokens WHERE target_mid = ? AND name = ?",
+                (target_mid, name),
+            )
+            > 0
+        )
+
+    def import_json(self, path: str) -> int:
+        """
+        Import tokens from a JSON file of {target_mid: {name: token}}, the
+        format earlier versions of the example script saved. Tokens already
+        stored under the same target and name are kept.
+
+        Args:
+            path (str): JSON file.
+
+        Returns:
+            int: The number of tokens imported.
+
+        Raises:
+            OSError: If the file cannot be read.
+            NezuNotifyValueError: If the file is not in that format.
+        """
+        with open(path, encoding="utf-8") as file:
+            try:
+                targets = json.load(file)
+            except ValueError as e:
+                raise NezuNotifyValueError(
+                    f"{path} is not valid JSON: {e}"
+                ) from e
+        if not isinstance(targets, dict) or not all(
+            isinstance(tokens, dict) for tokens in targets.values()
+        ):
+            raise NezuNotifyValueError(
+                f"{path} must map target MIDs to token names and tokens."
+            )
+        imported = 0
+        for target_mid, tokens in targets.items():
+            for name, token in tokens.items():
+                imported += self._execute(
+                    "INSERT OR IGNORE INTO tokens"
+                    " (target_mid, name, token, created_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (target_mid, name, str(token), time.time()),
+                )
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: Tuple[Any, ...]) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def _query(self, sql: str, params: Tuple[Any, ...]) -> List[TokenRecord]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [TokenRecord(*row) for row in rows]
@@ -0,0 +1,283 @@
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+from .exceptions import (
+    NezuNotifyAPIError,
+    NezuNotifyAuthError,
+    NezuNotifyCircuitOpenError,
+    NezuNotifyError,
+    NezuNotifyNetworkError,
+    NezuNotifyRateLimitError,
+)
+from .instrumentation import Instrumentation
+from .rate_limiter import parse_rate_limit_headers
+from .retry import NO_RETRY, CircuitBreaker, CircuitOpenError, RetryPolicy
+from .urls import APIUrls
+
+DEFAULT_POOL_SIZES: Dict[str, int] = {
+    APIUrls.BASE_URL: 10,
+    APIUrls.UNOFFICIAL_BASE_URL: 4,
+}
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10.0
+# Sending and token creation are not idempotent: a request that timed out
+# may still have been delivered, so only failures to connect are retried.
+DEFAULT_RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    "send": RetryPolicy(idempotent=False),
+    "status": RetryPolicy(),
+    "revoke": RetryPolicy(),
+    "groups": RetryPolicy(),
+    "create": NO_RETRY,
+}
+
+
+def translate_error(error: requests.RequestException) -> NezuNotifyError:
+    """
+    Convert a requests exception into the matching NezuNotify exception.
+
+    Args:
+        error (requests.RequestException): The exception to convert.
+
+    Returns:
+        NezuNotifyError: The typed NezuNotify exception.
+    """
+    if isinstance(error, CircuitOpenError):
+        return NezuNotifyCircuitOpenError(error.host, error.retry_in)
+    response = error.response
+    if response is None:
+        return NezuNotifyNetworkError(str(error))
+    if response.status_code == 401:
+        return NezuNotifyAuthError(str(error))
+    if response.status_code == 429:
+        info = parse_rate_limit_headers(response.headers)
+        return NezuNotifyRateLimitError(
+            info.limit if info else 0, info.reset if info else 0
+        )
+    return NezuNotifyAPIError(str(error), response.status_code)
+
+
+class Transport:
+    """Pooled HTTP transport shared by every NezuNotify component."""
+
+    def __init__(
+        self,
+        pool_sizes: Optional[Dict[str, int]] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        instrumentation: Optional[Instrumentation] = None,
+        host_overrides: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize a Transport object.
+
+        Args:
+            pool_sizes (Optional[Dict[str, int]]): Maximum number of
+                keep-alive connections per base URL. Unlisted hosts fall
+                back to the defaults in DEFAULT_POOL_SIZES.
+            connect_timeout (float): Seconds to wait for a connection.
+            read_timeout (float): Seconds to wait for a response.
+            retry_policies (Optional[Dict[str, RetryPolicy]]): Retry policy
+                per operation ('send', 'status', 'revoke', 'groups',
+                'create'), overriding DEFAULT_RETRY_POLICIES.
+            failure_threshold (int): Consecutive failures that open a
+                host's circuit.
+            recovery_timeout (float): Seconds an open circuit waits before
+                letting a probe through.
+            instrumentation (Optional[Instrumentation]): Hooks and metrics
+                run around every HTTP attempt.
+            host_overrides (Optional[Dict[str, str]]): Base URLs that
+                replace the LINE ones, keyed by the LINE base URL, e.g. to
+                point the client at a local test server.
+        """
+        self.pool_sizes = dict(DEFAULT_POOL_SIZES)
+        self.pool_sizes.update(pool_sizes or {})
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.retry_policies = dict(DEFAULT_RETRY_POLICIES)
+        self.retry_policies.update(retry_policies or {})
+        self.instrumentation = instrumentation
+        self.host_overrides = dict(host_overrides or {})
+        self.breakers = {
+            base_url: CircuitBreaker(failure_threshold, recovery_timeout)
+            for base_url in self.pool_sizes
+        }
+
+        self.session = requests.Session()
+        # Credentials are sent explicitly per request, so the session must
+        # never carry cookies over from one token's response to another.
+        self.session.cookies.set_policy(
+            DefaultCookiePolicy(allowed_domains=[])
+        )
+        for base_url, pool_size in self.pool_sizes.items():
+            self.session.mount(
+                f"{base_url}/",
+                HTTPAdapter(pool_connections=1, pool_maxsize=pool_size),
+            )
+        target_pool_sizes: Dict[str, int] = {}
+        for base_url, target in self.host_overrides.items():
+            pool_size = self.pool_sizes.get(base_url, 0)
+            pool_size += target_pool_sizes.get(target, 0)
+            target_pool_sizes[target] = pool_size
+        for target, pool_size in target_pool_sizes.items():
+            self.session.mount(
+                f"{target}/",
+                HTTPAdapter(pool_connections=1, pool_maxsize=pool_size),
+            )
+
+    def retry_policy(self, operation: Optional[str]) -> RetryPolicy:
+        """Return the retry policy configured for an operation."""
+        if operation is None:
+            return NO_RETRY
+        return self.retry_policies.get(operation, NO_RETRY)
+
+    def circuit_states(self) -> Dict[str, str]:
+        """Return the circuit breaker state of every known host."""
+        return {
+            base_url: breaker.state
+            for base_url, breaker in self.breakers.items()
+        }
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        operation: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        before_attempt: Optional[Callable[[], None]] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Send an HTTP request over the pooled session.
+
+        Transient failures are retried according to the operation's retry
+        policy, and requests to a host whose circuit is open fail fast with
+        CircuitOpenError.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            operation (Optional[str]): Operation name selecting the retry
+                policy. Requests without one are not retried.
+            retry_policy (Optional[RetryPolicy]): Overrides the operation's
+                retry policy.
+            before_attempt (Optional[Callable[[], None]]): Called before
+                every attempt, e.g. to take a rate-limit token for each.
+            **kwargs: Extra arguments passed to requests.Session.request.
+
+        Returns:
+            requests.Response: The HTTP response.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        policy = retry_policy or self.retry_policy(operation)
+        breaker, host = self._breaker(url)
+        if self.host_overrides:
+            url = self._override_host(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker and not breaker.allow():
+                raise CircuitOpenError(host, breaker.retry_in())
+            if before_attempt is not None:
+                before_attempt()
+            event = None
+            if self.instrumentation is not None:
+                event = self.instrumentation.start(
+                    method, url, operation, attempt, kwargs
+                )
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                if event is not None:
+                    event.finish(error=e)
+                if breaker:
+                    breaker.record_failure()
+                delay = (
+                    policy.compute_delay(attempt)
+                    if policy.should_retry(attempt, None, _sent(e))
+                    else None
+                )
+                if delay is None:
+                    raise
+            else:
+                if event is not None:
+                    event.finish(response)
+                if breaker:
+                    if response.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                if not policy.should_retry(attempt, response.status_code):
+                    return response
+                delay = policy.compute_delay(attempt, response.headers)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            _rewind_body(kwargs)
+
+    def mount(self, adapter: BaseAdapter) -> None:
+        """
+        Route every request to the LINE hosts, and to the hosts overriding
+        them, through an adapter instead of the pooled connections.
+
+        Args:
+            adapter (BaseAdapter): A requests transport adapter, e.g. one
+                from NezuNotify.transport_modes.
+        """
+        for base_url in {*self.pool_sizes, *self.host_overrides.values()}:
+            self.session.mount(f"{base_url}/", adapter)
+
+    def _override_host(self, url: str) -> str:
+        for base_url, target in self.host_overrides.items():
+            if url.startswith(f"{base_url}/"):
+                return f"{target}{url[len(base_url):]}"
+        return url
+
+    def _breaker(self, url: str) -> Tuple[Optional[CircuitBreaker], str]:
+        for base_url, breaker in self.breakers.items():
+            if url.startswith(f"{base_url}/"):
+                return breaker, base_url
+        return None, url
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self.session.close()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _sent(error: requests.RequestException) -> bool:
+    """Whether a failed request may have reached the server."""
+    if isinstance(error, requests.ConnectTimeout):
+        return False
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return True
+    # requests wraps urllib3's MaxRetryError, whose reason is the failure.
+    reason = getattr(error.args[0], "reason", error.args[0])
+    return not isinstance(reason, ConnectTimeoutError)
+
+
+def _rewind_body(kwargs: Dict[str, Any]) -> None:
+    """Seek streamed bodies and uploaded files back to the start before a
+    retry."""
+    data = kwargs.get("data")
+    if data is not None and hasattr(data, "seek"):
+        data.seek(0)
+    files = kwargs.get("files")
+    if not isinstance(files, dict):
+        return
+    for value in files.values():
+        file = value[1] if isinstance(value, tuple) else value
+        if hasattr(file, "seek"):
+            file.seek(0)
@@ -0,0 +1,415 @@
+import gzip
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .exceptions import NezuNotifyValueError
+from .instrumentation import endpoint_label
+from .line_notify import MAX_MESSAGE_LENGTH
+from .multipart import MultipartBody
+from .rate_limiter import DEFAULT_LIMIT, DEFAULT_WINDOW
+
+DRY_RUN = "dry_run"
+RECORD = "record"
+REPLAY = "replay"
+MODES = (DRY_RUN, RECORD, REPLAY)
+
+RECORDING_VERSION = 1
+# Headers and response body fields that carry credentials are never
+# written to recordings.
+_SECRET_HEADERS = {"authorization", "cookie", "set-cookie", "x-csrf-token"}
+_SECRET_FIELDS = {"token", "accessToken"}
+REDACTED = "[REDACTED]"
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    429: "Too Many Requests",
+    501: "Not Implemented",
+}
+
+
+def _build_response(
+    request: requests.PreparedRequest,
+    status_code: int,
+    body: bytes,
+    headers: Optional[Mapping[str, str]] = None,
+    elapsed: float = 0.0,
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = _REASONS.get(status_code, "")
+    response.headers = CaseInsensitiveDict(
+        {"Content-Type": "application/json;charset=UTF-8", **(headers or {})}
+    )
+    response._content = body
+    response.encoding = "utf-8"
+    response.url = request.url or ""
+    response.request = request
+    response.elapsed = timedelta(seconds=elapsed)
+    return response
+
+
+def _json_body(payload: Mapping[str, Any]) -> bytes:
+    return json.dumps(payload).encode()
+
+
+def _form_fields(request: requests.PreparedRequest) -> Dict[str, str]:
+    """Form fields of a urlencoded or multipart request body."""
+    body = request.body
+    if isinstance(body, MultipartBody):
+        return dict(body.fields)
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+    if not isinstance(body, str):
+        body = urlsplit(request.url or "").query
+    return {key: values[0] for key, values in parse_qs(body).items()}
+
+
+def _bearer_token(request: requests.PreparedRequest) -> Optional[str]:
+    authorization = request.headers.get("Authorization", "")
+    if authorization.startswith("Bearer ") and authorization[7:]:
+        return authorization[7:]
+    return None
+
+
+class DryRunAdapter(BaseAdapter):
+    """
+    Answers LINE requests locally without sending anything.
+
+    Requests are validated the way LINE Notify would, counted per endpoint
+    and answered with a synthetic response. Notify responses carry
+    X-RateLimit headers from a local per-token quota, so rate limiting
+    behaves as it would against the real API.
+    """
+
+    def __init__(self, limit: int = DEFAULT_LIMIT):
+        """
+        Initialize a DryRunAdapter object.
+
+        Args:
+            limit (int): Requests allowed per token and hour.
+        """
+        super().__init__()
+        self.limit = limit
+        self.counts: Dict[str, int] = {}
+        self.rejected: Dict[str, int] = {}
+        self._quotas: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Union[bool, str] = True,
+        cert: Any = None,
+        proxies: Optional[Mapping[str, str]] = None,
+    ) -> requests.Response:
+        endpoint = endpoint_label(request.url or "")
+        status_code, payload, headers = self._answer(endpoint, request)
+        with self._lock:
+            self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+            if status_code != 200:
+                self.rejected[endpoint] = self.rejected.get(endpoint, 0) + 1
+        return _build_response(
+            request, status_code, _json_body(payload), headers
+        )
+
+    def close(self) -> None:
+        pass
+
+    def _answer(
+        self, endpoint: str, request: requests.PreparedRequest
+    ) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        if endpoint in ("notify", "status"):
+            token = _bearer_token(request)
+            if token is None:
+                return 401, _status(401, "Invalid access token"), {}
+            if endpoint == "status":
+                return 200, {**_status(200, "ok"), "target": "dry-run"}, {}
+            error = self._validate_notify(_form_fields(request))
+            if error:
+                return 400, _status(400, error), {}
+            return self._consume(token)
+        if endpoint == "revoke":
+            if not _form_fields(request).get("token"):
+                return 400, _status(400, "token is required"), {}
+            return 200, _status(200, "ok"), {}
+        if endpoint == "create":
+            return 200, {"token": f"dry-run-{uuid.uuid4().hex}"}, {}
+        if endpoint == "groups":
+            return 200, {"groups": [], "hasNext": False}, {}
+        return 404, _status(404, "Not Found"), {}
+
+    def _validate_notify(self, fields: Dict[str, str]) -> Optional[str]:
+        message = fields.get("message")
+        if not message:
+            return "message: must not be empty"
+        if len(message) > MAX_MESSAGE_LENGTH:
+            return (
+                f"message: length must be at most {MAX_MESSAGE_LENGTH} "
+                "characters"
+            )
+        if ("stickerId" in fields) != ("stickerPackageId" in fields):
+            return "stickerId and stickerPackageId must be sent together"
+        if ("imageThumbnail" in fields) != ("imageFullsize" in fields):
+            return "imageThumbnail and imageFullsize must be sent together"
+        return None
+
+    def _consume(
+        self, token: str
+    ) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        now = int(time.time())
+        with self._lock:
+            remaining, reset = self._quotas.get(token, (self.limit, 0))
+            if reset <= now:
+                remaining, reset = self.limit, now + DEFAULT_WINDOW
+            allowed = remaining > 0
+            if allowed:
+                remaining -= 1
+            self._quotas[token] = (remaining, reset)
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset),
+        }
+        if not allowed:
+            return 429, _status(429, "Rate limit exceeded"), headers
+        return 200, _status(200, "ok"), headers
+
+
+def _status(status_code: int, message: str) -> Dict[str, Any]:
+    return {"status": status_code, "message": message}
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Sends requests for real and records every exchange.
+
+    Each response is written to a gzip-compressed JSON lines file with its
+    endpoint, status, headers, body and latency. Request bodies are not
+    recorded, and credentials are removed from headers and from JSON
+    response bodies, such as the token returned on creation.
+    """
+
+    def __init__(self, path: str, pool_maxsize: int = 10):
+        """
+        Initialize a RecordingAdapter object.
+
+        Args:
+            path (str): Recording file, overwritten if it exists.
+            pool_maxsize (int): Keep-alive connections per host.
+        """
+        super().__init__(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._file.write(json.dumps({"version": RECORDING_VERSION}) + "\n")
+        self._lock = threading.Lock()
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Union[bool, str] = True,
+        cert: Any = None,
+        proxies: Optional[Mapping[str, str]] = None,
+    ) -> requests.Response:
+        start = time.monotonic()
+        response = super().send(
+            request, stream, timeout, verify, cert, proxies
+        )
+        # Read the body now so the recorded latency covers all of it.
+        content = response.content
+        record = {
+            "at": round(time.time(), 3),
+            "method": request.method,
+            "path": urlsplit(request.url or "").path,
+            "elapsed": round(time.monotonic() - start, 6),
+            "request_headers": _public_headers(request.headers),
+            "status": response.status_code,
+            "headers": _public_headers(response.headers),
+            "body": _redact_body(content.decode("utf-8", "replace")),
+        }
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+        return response
+
+    def close(self) -> None:
+        super().close()
+        with self._lock:
+            self._file.close()
+
+
+def _public_headers(headers: Mapping[str, str]) -> Dict[str, str]:
+    return {
+        name: value
+        for name, value in headers.items()
+        if name.lower() not in _SECRET_HEADERS
+    }
+
+
+def _redact_body(body: str) -> str:
+    """Replace the credentials in a JSON object body."""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(payload, dict) or not _SECRET_FIELDS & set(payload):
+        return body
+    for name in _SECRET_FIELDS & set(payload):
+        payload[name] = REDACTED
+    return json.dumps(payload)
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Answers requests from a recording made by RecordingAdapter.
+
+    Responses recorded for the same method and path are served in turn,
+    after the recorded latency of a randomly drawn exchange, so a replay
+    reproduces the original latency distribution. X-RateLimit-Reset is
+    shifted by the time since the recording.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        speed: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize a ReplayAdapter object.
+
+        Args:
+            path (str): Recording file.
+            speed (float): Latency multiplier, 0 to answer at once.
+            seed (Optional[int]): Seed for the latency draws.
+
+        Raises:
+            NezuNotifyValueError: If the file is not a recording.
+        """
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self._records: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._cursors: Dict[Tuple[str, str], int] = {}
+        self._latencies: Dict[Tuple[str, str], List[float]] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._load()
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Union[bool, str] = True,
+        cert: Any = None,
+        proxies: Optional[Mapping[str, str]] = None,
+    ) -> requests.Response:
+        key = (request.method or "GET", urlsplit(request.url or "").path)
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                record = None
+                elapsed = 0.0
+            else:
+                cursor = self._cursors.get(key, 0)
+                self._cursors[key] = cursor + 1
+                record = records[cursor % len(records)]
+                elapsed = self._random.choice(self._latencies[key])
+        if record is None:
+            return _build_response(
+                request,
+                501,
+                _json_body(_status(501, f"No recorded response for {key}")),
+            )
+        if self.speed:
+            time.sleep(elapsed * self.speed)
+        headers = dict(record["headers"])
+        # The body was decoded already, so any encoding header is stale.
+        headers.pop("Content-Encoding", None)
+        headers.pop("Content-Length", None)
+        reset = headers.get("X-RateLimit-Reset")
+        if reset is not None and reset.isdigit():
+            offset = time.time() - record["at"]
+            headers["X-RateLimit-Reset"] = str(int(int(reset) + offset))
+        return _build_response(
+            request,
+            record["status"],
+            record["body"].encode(),
+            headers,
+            elapsed,
+        )
+
+    def close(self) -> None:
+        pass
+
+    def _load(self) -> None:
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as file:
+                header = json.loads(file.readline() or "{}")
+                if header.get("version") != RECORDING_VERSION:
+                    raise NezuNotifyValueError(
+                        f"{self.path} is not a NezuNotify recording."
+                    )
+                for line in file:
+                    record = json.loads(line)
+                    key = (record["method"], record["path"])
+                    self._records.setdefault(key, []).append(record)
+                    self._latencies.setdefault(key, []).append(
+                        record["elapsed"]
+                    )
+        except (OSError, ValueError, KeyError) as e:
+            raise NezuNotifyValueError(
+                f"Cannot read the recording {self.path}: {e}"
+            ) from e
+
+
+def create_adapter(
+    mode: str, path: Optional[str] = None, pool_maxsize: int = 10
+) -> BaseAdapter:
+    """
+    Create the adapter for a transport mode.
+
+    Args:
+        mode (str): 'dry_run', 'record' or 'replay'.
+        path (Optional[str]): Recording file, required to record or
+            replay.
+        pool_maxsize (int): Keep-alive connections per host when
+            recording.
+
+    Returns:
+        BaseAdapter: An adapter for Transport.mount.
+
+    Raises:
+        NezuNotifyValueError: If the mode is unknown or the path missing.
+    """
+    if mode not in MODES:
+        raise NezuNotifyValueError(
+            "Invalid transport mode. It must be 'dry_run', 'record' or "
+            "'replay'."
+        )
+    if mode == DRY_RUN:
+        return DryRunAdapter()
+    if not path:
+        raise NezuNotifyValueError(
+            f"A recording path is required in '{mode}' mode."
+        )
+    if mode == RECORD:
+        return RecordingAdapter(path, pool_maxsize)
+    return ReplayAdapter(path)
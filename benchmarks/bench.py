@@ -0,0 +1,345 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.fake_line_server import FakeLineServer, tokens
+from NezuNotify.lite import LiteNotify
+from NezuNotify.nezu_notify import NezuNotify
+from NezuNotify.sharded_sender import ShardedSender
+from NezuNotify.transport import Transport
+
+IMAGE_URL = "https://example.com/image.jpg"
+IMAGE_SIZE = 256 * 1024
+UNLIMITED = 10**9
+SHARDED_TOKENS = 8
+IMPORT_MODULES = (
+    "NezuNotify",
+    "NezuNotify.lite",
+    "NezuNotify.nezu_notify",
+    "NezuNotify.async_nezu_notify",
+)
+IMPORT_SCRIPT = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(
+    name: str,
+    operation: Callable[[], Any],
+    iterations: int,
+    items: int = 1,
+    warmup: int = 0,
+) -> Dict[str, Any]:
+    """
+    Run an operation repeatedly and summarise its latency.
+
+    Args:
+        name (str): Scenario name.
+        operation (Callable[[], Any]): The call to time. A falsy return
+            value counts as an error.
+        iterations (int): Timed calls.
+        items (int): Items handled by one call, for bulk operations.
+        warmup (int): Untimed calls made first.
+
+    Returns:
+        Dict[str, Any]: Throughput and latency figures.
+    """
+    for _ in range(warmup):
+        operation()
+    samples = []
+    errors = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        result = operation()
+        samples.append(time.perf_counter() - call_start)
+        if not result:
+            errors += 1
+    total = time.perf_counter() - start
+    return {
+        "scenario": name,
+        "calls": iterations,
+        "items": iterations * items,
+        "errors": errors,
+        "seconds": round(total, 6),
+        "items_per_second": round(iterations * items / total, 2),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+    }
+
+
+def bench_send(
+    transport: Transport,
+    server: FakeLineServer,
+    image_path: str,
+    iterations: int,
+    warmup: int,
+    scenarios: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    token = tokens(1)[0]
+    senders = {
+        "send_text": NezuNotify(
+            token=token,
+            transport=transport,
+            message_type="text",
+            message_content="Benchmark message",
+        ),
+        "send_image_url": NezuNotify(
+            token=token,
+            transport=transport,
+            message_type="image",
+            message_content=IMAGE_URL,
+        ),
+        "send_local_image": NezuNotify(
+            token=token,
+            transport=transport,
+            message_type="image",
+            message_content=image_path,
+        ),
+        "send_sticker": NezuNotify(
+            token=token,
+            transport=transport,
+            message_type="sticker",
+            message_content="Benchmark sticker",
+            sticker_id="171",
+            sticker_package_id="2",
+        ),
+        "send_unauthorized": NezuNotify(
+            token="invalid-token",
+            transport=transport,
+            message_type="text",
+            message_content="Benchmark message",
+        ),
+    }
+    limited_token = tokens(1, "limited")[0]
+    server.set_quota(limited_token, 0)
+    senders["send_rate_limited"] = NezuNotify(
+        token=limited_token,
+        transport=transport,
+        message_type="text",
+        message_content="Benchmark message",
+    )
+
+    lite = LiteNotify(token, url=f"{server.url}/api/notify")
+    results = []
+    if not scenarios or "send_lite" in scenarios:
+        results.append(
+            measure(
+                "send_lite",
+                lambda: lite.send("Benchmark message"),
+                iterations,
+                warmup=warmup,
+            )
+        )
+    for name, nezu in senders.items():
+        if scenarios and name not in scenarios:
+            continue
+        result = measure(
+            name,
+            lambda: nezu.process("send"),
+            iterations,
+            warmup=warmup,
+        )
+        results.append(result)
+    return results
+
+
+def bench_bulk(
+    transport: Transport,
+    iterations: int,
+    batch: int,
+    scenarios: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    nezu = NezuNotify(csrf="bench", cookie="bench", transport=transport)
+    status_tokens = tokens(batch)
+    revoke_batches = [tokens(batch, "revoke") for _ in range(iterations)]
+
+    results = []
+    if not scenarios or "status_bulk" in scenarios:
+        results.append(
+            measure(
+                "status_bulk",
+                lambda: nezu.process("check", status_tokens),
+                iterations,
+                items=batch,
+            )
+        )
+    if not scenarios or "revoke_bulk" in scenarios:
+        results.append(
+            measure(
+                "revoke_bulk",
+                lambda: nezu.process("revoke", revoke_batches.pop()),
+                iterations,
+                items=batch,
+            )
+        )
+    return results
+
+
+def bench_sharded(
+    server: FakeLineServer,
+    directory: str,
+    iterations: int,
+    batch: int,
+    scenarios: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    if scenarios and "send_sharded" not in scenarios:
+        return []
+    processes = os.cpu_count() or 1
+    bench_tokens = tokens(SHARDED_TOKENS, "sharded")
+    messages = [
+        (bench_tokens[i % SHARDED_TOKENS], "Benchmark message")
+        for i in range(batch)
+    ]
+    sender = ShardedSender(
+        os.path.join(directory, "state.db"),
+        processes=processes,
+        batch_size=max(1, batch // processes),
+        transport_options={"host_overrides": server.host_overrides},
+    )
+    with sender:
+        return [
+            measure(
+                "send_sharded",
+                lambda: all(sender.send_many(messages)),
+                iterations,
+                items=batch,
+                warmup=1,
+            )
+        ]
+
+
+def measure_imports(runs: int = 5) -> Dict[str, float]:
+    """Median cold import time of each module, in milliseconds, measured
+    in fresh interpreters."""
+    timings = {}
+    for module in IMPORT_MODULES:
+        samples = [
+            float(
+                subprocess.run(
+                    [
+                        sys.executable,
+                        "-c",
+                        IMPORT_SCRIPT.format(module=module),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+            )
+            for _ in range(runs)
+        ]
+        timings[module] = round(statistics.median(samples) * 1000, 3)
+    return timings
+
+
+def write_image(directory: str) -> str:
+    path = os.path.join(directory, "bench.png")
+    with open(path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        file.write(os.urandom(IMAGE_SIZE))
+    return path
+
+
+def run(
+    iterations: int,
+    batch: int,
+    latency: float,
+    jitter: float,
+    warmup: int,
+    scenarios: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Run the benchmarks against a fresh fake server."""
+    server = FakeLineServer(
+        latency=latency, jitter=jitter, limit=UNLIMITED, image_limit=UNLIMITED
+    )
+    with server, tempfile.TemporaryDirectory() as directory:
+        transport = Transport(host_overrides=server.host_overrides)
+        try:
+            results = bench_send(
+                transport,
+                server,
+                write_image(directory),
+                iterations,
+                warmup,
+                scenarios,
+            )
+            results += bench_bulk(
+                transport, max(1, iterations // batch), batch, scenarios
+            )
+            results += bench_sharded(
+                server,
+                directory,
+                max(1, iterations // batch),
+                batch,
+                scenarios,
+            )
+        finally:
+            transport.close()
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "server_latency_ms": latency * 1000,
+        "import_ms": measure_imports(),
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark NezuNotify against a local fake LINE server."
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--batch", type=int, default=50, help="Tokens per bulk call."
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Mean server delay (s)."
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.005, help="Delay deviation (s)."
+    )
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        help="Only report this scenario. May be repeated.",
+    )
+    parser.add_argument("--output", help="Also write the JSON report here.")
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.iterations,
+        args.batch,
+        args.latency,
+        args.jitter,
+        args.warmup,
+        args.scenario,
+    )
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
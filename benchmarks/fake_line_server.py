@@ -0,0 +1,271 @@
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from NezuNotify.urls import APIUrls
+
+INVALID_TOKEN_PREFIX = "invalid"
+GROUP_PAGE_SIZE = 20
+
+
+class _TokenQuota:
+    __slots__ = ("remaining", "image_remaining", "reset")
+
+    def __init__(self, limit: int, image_limit: int, window: int):
+        self.remaining = limit
+        self.image_remaining = image_limit
+        self.reset = int(time.time()) + window
+
+
+class FakeLineServer:
+    """
+    Local stand-in for notify-api.line.me and notify-bot.line.me.
+
+    Every response is delayed by a normally distributed latency and carries
+    X-RateLimit headers. Tokens starting with 'invalid' and revoked tokens
+    get 401, and tokens that used up their quota get 429. Other failures
+    can be queued per path with fail().
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.02,
+        jitter: float = 0.005,
+        limit: int = 1000,
+        image_limit: int = 50,
+        window: int = 3600,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize a FakeLineServer object.
+
+        Args:
+            latency (float): Mean response delay in seconds.
+            jitter (float): Standard deviation of the delay in seconds.
+            limit (int): Requests allowed per token and window.
+            image_limit (int): Image uploads allowed per token and window.
+            window (int): Seconds until a token's quota resets.
+            host (str): Address to listen on.
+            port (int): Port to listen on, 0 for any free port.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.limit = limit
+        self.image_limit = image_limit
+        self.window = window
+        self.host = host
+        self.revoked: Set[str] = set()
+        self.requests: Dict[str, int] = {}
+        self.groups: List[Dict[str, str]] = []
+        self._failures: Dict[str, List[Tuple[int, Dict[str, str]]]] = {}
+        self._quotas: Dict[str, _TokenQuota] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        setattr(self._server, "fake", self)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self._server.server_port}"
+
+    @property
+    def host_overrides(self) -> Dict[str, str]:
+        """Transport host overrides routing both LINE hosts here."""
+        return {
+            APIUrls.BASE_URL: self.url,
+            APIUrls.UNOFFICIAL_BASE_URL: self.url,
+        }
+
+    def set_quota(self, token: str, remaining: int) -> None:
+        """Set the remaining quota of a token."""
+        with self._lock:
+            self._quota(token).remaining = remaining
+
+    def fail(
+        self,
+        path: str,
+        status: int,
+        count: int = 1,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Answer the next requests to a path with an error.
+
+        Args:
+            path (str): Request path, e.g. '/api/notify'.
+            status (int): Status code of the error responses.
+            count (int): Number of requests answered with the error.
+            headers (Optional[Dict[str, str]]): Extra response headers,
+                e.g. Retry-After.
+        """
+        with self._lock:
+            self._failures.setdefault(path, []).extend(
+                [(status, dict(headers or {}))] * count
+            )
+
+    def start(self) -> "FakeLineServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeLineServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def delay(self) -> None:
+        time.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+
+    def consume(
+        self, token: str, image: bool = False, spend: bool = True
+    ) -> Tuple[int, _TokenQuota]:
+        """Charge a request to a token and return the status code."""
+        with self._lock:
+            quota = self._quota(token)
+            if token.startswith(INVALID_TOKEN_PREFIX) or token in self.revoked:
+                return 401, quota
+            if quota.remaining <= 0 or (image and quota.image_remaining <= 0):
+                return 429, quota
+            if spend:
+                quota.remaining -= 1
+                if image:
+                    quota.image_remaining -= 1
+            return 200, quota
+
+    def revoke(self, token: str) -> None:
+        with self._lock:
+            self.revoked.add(token)
+
+    def count(self, path: str) -> Optional[Tuple[int, Dict[str, str]]]:
+        """Count a request and return the failure queued for it, if any."""
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            failures = self._failures.get(path)
+            return failures.pop(0) if failures else None
+
+    def group_page(self, page: int) -> Dict[str, object]:
+        start = (page - 1) * GROUP_PAGE_SIZE
+        with self._lock:
+            results = self.groups[start : start + GROUP_PAGE_SIZE]
+            has_next = start + GROUP_PAGE_SIZE < len(self.groups)
+        return {"results": results, "hasNext": has_next}
+
+    def _quota(self, token: str) -> _TokenQuota:
+        quota = self._quotas.get(token)
+        if quota is None or quota.reset <= time.time():
+            quota = _TokenQuota(self.limit, self.image_limit, self.window)
+            self._quotas[token] = quota
+        return quota
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which Nagle's algorithm
+    # would otherwise hold back until the client's delayed ACK.
+    disable_nagle_algorithm = True
+
+    @property
+    def fake(self) -> FakeLineServer:
+        fake: FakeLineServer = getattr(self.server, "fake")
+        return fake
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        url = urlsplit(self.path)
+        path = url.path
+        failure = self.fake.count(path)
+        self.fake.delay()
+        if failure is not None:
+            status, headers = failure
+            self._send(status, {"status": status, "message": "error"}, headers)
+        elif path == "/api/notify" and self.command == "POST":
+            content_type = self.headers.get("Content-Type", "")
+            image = content_type.startswith("multipart/") or (
+                b"imageThumbnail=" in body
+            )
+            self._token_response(image=image)
+        elif path == "/api/status" and self.command == "GET":
+            self._token_response(spend=False)
+        elif path == "/api/revoke" and self.command == "POST":
+            form = parse_qs(body.decode())
+            token = (form.get("token") or [""])[0]
+            if not token:
+                self._send(400, {"status": 400, "message": "no token"})
+                return
+            self.fake.revoke(token)
+            self._send(200, {"status": 200, "message": "ok"})
+        elif path == "/my/personalAccessToken" and self.command == "POST":
+            self._send(200, {"token": uuid.uuid4().hex})
+        elif path == "/api/groupList" and self.command == "GET":
+            page = (parse_qs(url.query).get("page") or ["1"])[0]
+            self._send(200, self.fake.group_page(max(int(page), 1)))
+        else:
+            self._send(404, {"status": 404, "message": "not found"})
+
+    def _token_response(self, image: bool = False, spend: bool = True) -> None:
+        authorization = self.headers.get("Authorization", "")
+        token = (
+            authorization[7:] if authorization.startswith("Bearer ") else ""
+        )
+        status, quota = self.fake.consume(token, image, spend)
+        messages = {
+            200: "ok",
+            401: "Invalid access token",
+            429: "Rate limit exceeded",
+        }
+        headers = {
+            "X-RateLimit-Limit": str(self.fake.limit),
+            "X-RateLimit-Remaining": str(max(quota.remaining, 0)),
+            "X-RateLimit-ImageLimit": str(self.fake.image_limit),
+            "X-RateLimit-ImageRemaining": str(max(quota.image_remaining, 0)),
+            "X-RateLimit-Reset": str(quota.reset),
+        }
+        self._send(
+            status, {"status": status, "message": messages[status]}, headers
+        )
+
+    def _send(
+        self,
+        status: int,
+        payload: Dict[str, object],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def tokens(count: int, prefix: str = "bench") -> List[str]:
+    """Generate distinct tokens accepted by the fake server."""
+    return [f"{prefix}-{i:04d}-{uuid.uuid4().hex[:8]}" for i in range(count)]
@@ -1,67 +1,42 @@
-import json
 import logging
 import os
-from typing import Dict, Optional, Tuple
+from typing import Optional, Tuple
 
 from dotenv import load_dotenv
 
+from NezuNotify.exceptions import NezuNotifyError
 from NezuNotify.group_manager import GroupManager
+from NezuNotify.instrumentation import redact
 from NezuNotify.nezu_notify import NezuNotify
+from NezuNotify.results import StatusResult, TokenResult
+from NezuNotify.token_store import TokenStore
 
 load_dotenv()
 
 csrf = os.environ.get("LINE_CSRF_TOKEN")
 cookie = os.environ.get("LINE_COOKIE")
 
-TOKENS_FILE = "./tokens.json"
+TOKENS_DB = "./tokens.db"
+# Tokens saved by earlier versions of this script.
+TOKENS_JSON = "./tokens.json"
 
 logging.basicConfig(level=logging.INFO)
 
 
-class TokenManager:
-    def __init__(self, tokens_file: str = "./tokens.json"):
-        self.tokens_file = tokens_file
-
-    def save_token(self, target_mid: str, token_name: str, token: str) -> None:
-        tokens = self.load_tokens()
-        if target_mid not in tokens:
-            tokens[target_mid] = {}
-        tokens[target_mid][token_name] = token
-        try:
-            with open(self.tokens_file, "w") as f:
-                json.dump(tokens, f, indent=2)
-            logging.info(f"トークンが {self.tokens_file} に保存されました。")
-        except IOError as e:
-            logging.error(f"トークンの保存中にエラーが発生しました: {e}")
-
-    def load_tokens(self) -> Dict[str, Dict[str, str]]:
-        try:
-            with open(self.tokens_file, "r") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logging.warning(f"{self.tokens_file} が見つかりません。")
-            return {}
-        except json.JSONDecodeError:
-            logging.error(f"{self.tokens_file} の解析に失敗しました。")
-            return {}
-
-    def load_token(self, target_mid: str, token_name: str) -> Optional[str]:
-        tokens = self.load_tokens()
-        token = tokens.get(target_mid, {}).get(token_name)
-        if token is None:
-            logging.warning(
-                f"トークン '{token_name}' (MID: {target_mid}) が見つかりません"
-            )
-        return token
-
-
 def create_new_token(
-    token_manager: TokenManager,
+    token_store: TokenStore,
 ) -> Tuple[Optional[str], Optional[str]]:
     logging.info("=== 新しいトークンの作成 ===")
+    if not csrf or not cookie:
+        logging.error("LINE_CSRF_TOKEN と LINE_COOKIE を設定してください。")
+        return None, None
     group_manager = GroupManager(csrf=csrf, cookie=cookie)
 
-    groups = group_manager.get_groups()
+    try:
+        groups = group_manager.get_groups()
+    except NezuNotifyError as e:
+        logging.error(f"グループ一覧の取得に失敗しました: {e}")
+        return None, None
     if not groups:
         logging.error(
             "グループが見つかりませんでした。CSRFトークンとCookieを確認してください。"
@@ -88,41 +63,46 @@ def create_new_token(
     token_name = input("新しいトークンの名前を入力してください: ")
 
     nezu_create = NezuNotify(csrf=csrf, cookie=cookie, target_mid=target_id)
-    new_token = nezu_create.process("create", "新しいトークン")
+    result = nezu_create.process("create", "新しいトークン")
 
-    if new_token:
-        logging.info(f"新しいトークン: {new_token}")
-        token_manager.save_token(target_id, token_name, new_token)
-        logging.info(
-            f"トークンが {token_manager.tokens_file} に保存されました。"
+    if not isinstance(result, TokenResult):
+        return None, None
+    if result and result.token:
+        new_token = result.token
+        logging.info(f"新しいトークン: {redact(new_token)}")
+        token_store.save(target_id, token_name, new_token)
+        logging.info(f"トークンが {token_store.path} に保存されました。")
+
+        nezu_check = NezuNotify(
+            token=new_token, csrf=csrf, cookie=cookie, token_store=token_store
         )
-
-        nezu_check = NezuNotify(token=new_token, csrf=csrf, cookie=cookie)
         status = nezu_check.process("check", new_token)
-        logging.info(f"トークンのステータス: {status}")
+        if isinstance(status, StatusResult):
+            logging.info(f"トークンのステータス: {status.status}")
         return target_id, token_name
     else:
-        logging.error("トークンの作成に失敗しました。")
+        logging.error(f"トークンの作成に失敗しました: {result.error}")
         return None, None
 
 
 def use_existing_token(
-    token_manager: TokenManager,
+    token_store: TokenStore,
 ) -> Tuple[Optional[str], Optional[str]]:
     logging.info("=== 既存のトークンの使用 ===")
-    tokens = token_manager.load_tokens()
-    if not tokens:
+    records = token_store.list()
+    if not records:
         logging.error("保存されているトークンがありません。")
         return None, None
 
     token_list = []
     logging.info("保存されているトークン:")
-    for i, (target_id, token_dict) in enumerate(tokens.items(), 1):
-        for token_name in token_dict.keys():
-            logging.info(
-                f"{i}. グループID: {target_id}, トークン名: {token_name}"
-            )
-            token_list.append((target_id, token_name))
+    for i, record in enumerate(records, 1):
+        logging.info(
+            f"{i}. グループID: {record.target_mid}, "
+            f"トークン名: {record.name}, "
+            f"ステータス: {record.last_status or '未確認'}"
+        )
+        token_list.append((record.target_mid, record.name))
 
     while True:
         try:
@@ -138,12 +118,15 @@ def use_existing_token(
             logging.error("数字を入力してください。")
 
 
-def send_message(token_manager: TokenManager, target_id: str, token_name: str):
-    token = token_manager.load_token(target_id, token_name)
+def send_message(
+    token_store: TokenStore, target_id: str, token_name: str
+) -> None:
+    token = token_store.get_token(target_id, token_name)
     if not token:
         logging.error(f"トークン '{token_name}' が見つかりません。")
         return
 
+    nezu = NezuNotify(token=token)
     while True:
         print("\n送信するメッセージタイプを選択してください:")
         print("1. テキスト")
@@ -155,38 +138,25 @@ def send_message(token_manager: TokenManager, target_id: str, token_name: str):
             choice = int(input("選択肢の番号を入力してください: "))
             if choice == 1:
                 message_content = input("送信するテキストを入力してください: ")
-                nezu = NezuNotify(
-                    token=token,
-                    message_type="text",
-                    message_content=message_content,
+                send_result = nezu.send(message_content)
+                logging.info(
+                    f"テキストメッセージ送信結果: {send_result} "
+                    f"({send_result.elapsed:.3f}秒)"
                 )
-                send_result = nezu.process("send")
-                logging.info(f"テキストメッセージ送信結果: {send_result}")
             elif choice == 2:
                 image_content = input(
                     "画像のURLまたはローカルパスを入力してください: "
                 )
-
-                nezu = NezuNotify(
-                    token=token,
-                    message_type="image",
-                    message_content=image_content,
-                )
-                send_result = nezu.process("send")
+                send_result = nezu.send("画像", image=image_content)
                 logging.info(f"画像メッセージ送信結果: {send_result}")
             elif choice == 3:
                 sticker_package_id = input(
                     "ステッカーパッケージIDを入力してください: "
                 )
                 sticker_id = input("ステッカーIDを入力してください: ")
-
-                nezu = NezuNotify(
-                    token=token,
-                    message_type="sticker",
-                    sticker_package_id=sticker_package_id,
-                    sticker_id=sticker_id,
+                send_result = nezu.send(
+                    "ステッカー", sticker=(sticker_package_id, sticker_id)
                 )
-                send_result = nezu.process("send")
                 logging.info(f"ステッカー送信結果: {send_result}")
             elif choice == 4:
                 break
@@ -196,10 +166,17 @@ def send_message(token_manager: TokenManager, target_id: str, token_name: str):
                 )
         except ValueError:
             logging.error("数字を入力してください。")
+    nezu.close()
 
 
-def main():
-    token_manager = TokenManager()
+def main() -> None:
+    token_store = TokenStore(TOKENS_DB)
+    if os.path.exists(TOKENS_JSON) and not token_store.list():
+        imported = token_store.import_json(TOKENS_JSON)
+        logging.info(
+            f"{TOKENS_JSON} の {imported} 件のトークンを {TOKENS_DB} に"
+            "移行しました。"
+        )
 
     while True:
         print("\n操作を選択してください:")
@@ -210,9 +187,9 @@ def main():
         try:
             choice = int(input("選択肢の番号を入力してください: "))
             if choice == 1:
-                target_id, token_name = create_new_token(token_manager)
+                target_id, token_name = create_new_token(token_store)
             elif choice == 2:
-                target_id, token_name = use_existing_token(token_manager)
+                target_id, token_name = use_existing_token(token_store)
             elif choice == 3:
                 logging.info("プログラムを終了します。")
                 break
@@ -223,7 +200,7 @@ def main():
                 continue
 
             if target_id and token_name:
-                send_message(token_manager, target_id, token_name)
+                send_message(token_store, target_id, token_name)
             else:
                 logging.error("有効なトークンが選択されませんでした。")
         except ValueError:
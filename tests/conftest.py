@@ -0,0 +1,18 @@
+from typing import Iterator
+
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.transport import Transport
+
+
+@pytest.fixture
+def server() -> Iterator[FakeLineServer]:
+    with FakeLineServer(latency=0.0, jitter=0.0) as server:
+        yield server
+
+
+@pytest.fixture
+def transport(server: FakeLineServer) -> Iterator[Transport]:
+    with Transport(host_overrides=server.host_overrides) as transport:
+        yield transport
@@ -0,0 +1,119 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.async_nezu_notify import AsyncNezuNotify
+from NezuNotify.async_transport import AsyncResponse, AsyncTransport
+from NezuNotify.exceptions import NezuNotifyAuthError, NezuNotifyValueError
+from NezuNotify.results import BulkRevokeResult
+from NezuNotify.status_cache import STATUS_BLOCKED, STATUS_OK
+
+
+class _CountingTransport(AsyncTransport):
+    """Records the most requests that were ever in flight at once."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, *args: Any, **kwargs: Any) -> AsyncResponse:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().request(*args, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+def _client(server: FakeLineServer, token: str = "token") -> AsyncNezuNotify:
+    return AsyncNezuNotify(
+        "csrf",
+        "cookie",
+        token,
+        AsyncTransport(host_overrides=server.host_overrides),
+    )
+
+
+def test_send_message(server: FakeLineServer) -> None:
+    async def main() -> None:
+        async with _client(server) as client:
+            result = await client.send_message("hello")
+            assert result.ok
+            assert result.status_code == 200
+
+    asyncio.run(main())
+    assert server.requests["/api/notify"] == 1
+
+
+def test_send_with_an_invalid_token_fails(server: FakeLineServer) -> None:
+    async def main() -> None:
+        async with _client(server, "invalid-token") as client:
+            result = await client.send_message("hello")
+            assert not result.ok
+            assert isinstance(result.error, NezuNotifyAuthError)
+
+    asyncio.run(main())
+
+
+def test_send_image_from_a_local_file(
+    tmp_path: Path, server: FakeLineServer
+) -> None:
+    path = tmp_path / "image.png"
+    path.write_bytes(b"\x89PNG fake image")
+
+    async def main() -> None:
+        async with _client(server) as client:
+            assert await client.send_image_with_local_path("hi", str(path))
+
+    asyncio.run(main())
+    assert server.requests["/api/notify"] == 1
+
+
+def test_missing_image_file_is_not_sent(
+    tmp_path: Path, server: FakeLineServer
+) -> None:
+    async def main() -> None:
+        async with _client(server) as client:
+            result = await client.send_image_with_local_path(
+                "hi", str(tmp_path / "missing.png")
+            )
+            assert isinstance(result.error, NezuNotifyValueError)
+
+    asyncio.run(main())
+    assert "/api/notify" not in server.requests
+
+
+def test_status_checks_are_bounded(server: FakeLineServer) -> None:
+    tokens = [f"token-{i}" for i in range(20)] + ["invalid-token"]
+    transport = _CountingTransport(host_overrides=server.host_overrides)
+
+    async def main() -> None:
+        async with AsyncNezuNotify(
+            "csrf", "cookie", transport=transport
+        ) as client:
+            assert client.token_manager is not None
+            results = await client.token_manager.check_token_statuses(
+                tokens, max_workers=4
+            )
+            assert [results[token].status for token in tokens] == [
+                STATUS_OK
+            ] * 20 + [STATUS_BLOCKED]
+
+    server.latency = 0.02
+    asyncio.run(main())
+    assert transport.max_in_flight == 4
+
+
+def test_revoke_many(server: FakeLineServer) -> None:
+    async def main() -> None:
+        async with _client(server) as client:
+            result = await client.revoke(["a", "b"])
+            assert isinstance(result, BulkRevokeResult)
+            assert sorted(result.succeeded) == ["a", "b"]
+            status = await client.check_token_status("a")
+            assert not status
+
+    asyncio.run(main())
+    assert server.revoked == {"a", "b"}
@@ -0,0 +1,125 @@
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify import cli
+from NezuNotify.nezu_notify import NezuNotify
+from NezuNotify.transport import Transport
+
+
+@pytest.fixture(autouse=True)
+def fake_transport(
+    monkeypatch: pytest.MonkeyPatch, transport: Transport
+) -> None:
+    monkeypatch.setattr(cli, "_transport", lambda pool_size: transport)
+    for name in (cli.TOKEN_ENV, cli.CSRF_ENV, cli.COOKIE_ENV):
+        monkeypatch.delenv(name, raising=False)
+
+
+def _run(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    argv: List[str],
+    stdin: str = "",
+) -> Tuple[int, List[Dict[str, Any]]]:
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    status = cli.main(argv)
+    out = capsys.readouterr().out
+    return status, [json.loads(line) for line in out.splitlines()]
+
+
+def test_send_lines(server: FakeLineServer, transport: Transport) -> None:
+    nezu = NezuNotify(token="token", transport=transport)
+    lines = ["a\n", "\n", '{"message": "b"}\n', "c\n"]
+
+    results = dict(cli.send_lines(nezu, lines, concurrency=2))
+
+    assert sorted(results) == [1, 3, 4]
+    assert all(result.ok for result in results.values())
+    assert server.requests["/api/notify"] == 3
+
+
+def test_send_reports_failed_lines(
+    server: FakeLineServer,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    stdin = '{"message": "a"}\nnot json\n{"message": "b", "x": 1}\n'
+
+    status, records = _run(
+        monkeypatch, capsys, ["send", "--json", "--token", "token"], stdin
+    )
+
+    assert status == 1
+    assert [record["line"] for record in records] == [2, 3]
+    assert server.requests["/api/notify"] == 1
+
+
+def test_send_spreads_messages_over_tokens(
+    server: FakeLineServer,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    server.set_quota("a", 2)
+    server.set_quota("b", 2)
+    argv = ["send", "--token", "a", "--token", "b", "--concurrency", "1"]
+
+    status, records = _run(monkeypatch, capsys, argv, "1\n2\n3\n4\n")
+
+    assert status == 0 and records == []
+    assert server.requests["/api/notify"] == 4
+
+
+def test_send_requires_a_token(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit) as exc_info:
+        _run(monkeypatch, capsys, ["send"], "hello\n")
+
+    assert exc_info.value.code == 2
+
+
+def test_status(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "tokens.txt"
+    path.write_text("# comment\na\n\ninvalid-b\na\n")
+    argv = ["status", str(path), "--csrf", "csrf", "--cookie", "cookie"]
+
+    status, records = _run(monkeypatch, capsys, argv)
+
+    assert status == 1
+    assert [(record["token"], record["ok"]) for record in records] == [
+        ("a", True),
+        ("invalid-b", False),
+    ]
+
+
+def test_revoke_from_stdin(
+    server: FakeLineServer,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setenv(cli.CSRF_ENV, "csrf")
+    monkeypatch.setenv(cli.COOKIE_ENV, "cookie")
+
+    status, records = _run(monkeypatch, capsys, ["revoke"], "a\nb\n")
+
+    assert status == 0
+    assert [record["token"] for record in records] == ["a", "b"]
+    assert server.revoked == {"a", "b"}
+
+
+def test_token_commands_require_a_session(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit) as exc_info:
+        _run(monkeypatch, capsys, ["status"], "a\n")
+
+    assert exc_info.value.code == 2
@@ -0,0 +1,110 @@
+import time
+from typing import Any, List
+
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.coalescer import MessageCoalescer, coalesce
+from NezuNotify.exceptions import NezuNotifyError, NezuNotifyValueError
+from NezuNotify.line_notify import LineNotify
+from NezuNotify.nezu_notify import NezuNotify
+from NezuNotify.results import SendResult
+from NezuNotify.transport import Transport
+
+
+class _BrokenSender(LineNotify):
+    def send_message(self, message: str) -> SendResult:
+        raise RuntimeError("connection reset")
+
+
+def test_coalesce_joins_lines() -> None:
+    assert coalesce(["a", "b\nc"]) == ["a\nb\nc"]
+
+
+def test_coalesce_splits_at_line_boundaries() -> None:
+    assert coalesce(["aaa", "bbb", "ccc"], max_length=7) == [
+        "aaa\nbbb",
+        "ccc",
+    ]
+
+
+def test_coalesce_cuts_long_lines() -> None:
+    assert coalesce(["a", "bbbbbbb"], max_length=3) == ["a", "bbb", "bbb", "b"]
+
+
+def test_coalesce_dedupes_lines() -> None:
+    assert coalesce(["x", "y", "x", "x"], dedupe=True) == ["x (x3)\ny"]
+
+
+def test_flush_sends_one_merged_message(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    coalescer = MessageCoalescer(LineNotify("token", transport), window=60)
+    for i in range(5):
+        coalescer.submit(f"alert {i}")
+
+    results = coalescer.flush()
+
+    assert [result.ok for result in results] == [True]
+    assert coalescer.pending == 0
+    assert server.requests["/api/notify"] == 1
+
+
+def test_window_flushes_in_the_background(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    coalescer = MessageCoalescer(LineNotify("token", transport), window=0.1)
+    coalescer.submit("a")
+    coalescer.submit("b")
+
+    time.sleep(0.3)
+
+    assert coalescer.pending == 0
+    assert server.requests["/api/notify"] == 1
+
+
+def test_full_buffer_flushes_early(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    coalescer = MessageCoalescer(
+        LineNotify("token", transport), window=60, max_messages=3
+    )
+    for i in range(3):
+        coalescer.submit(str(i))
+
+    assert coalescer.pending == 0
+    assert server.requests["/api/notify"] == 1
+
+
+def test_invalid_message_is_rejected(transport: Transport) -> None:
+    coalescer = MessageCoalescer(LineNotify("token", transport))
+
+    invalid: List[Any] = [None, "", 1]
+
+    for message in invalid:
+        with pytest.raises(NezuNotifyValueError):
+            coalescer.submit(message)
+
+    assert coalescer.pending == 0
+
+
+def test_flush_turns_errors_into_results(transport: Transport) -> None:
+    coalescer = MessageCoalescer(_BrokenSender("token", transport), window=60)
+    coalescer.submit("a")
+
+    results = coalescer.flush()
+
+    assert len(results) == 1
+    assert isinstance(results[0].error, NezuNotifyError)
+
+
+def test_client_rejects_an_invalid_coalesced_message(
+    transport: Transport,
+) -> None:
+    client = NezuNotify(token="token", transport=transport, coalesce_window=1)
+
+    with pytest.raises(NezuNotifyValueError):
+        client._dispatch({"message": None})
+
+    assert client.coalescer is not None
+    assert client.coalescer.pending == 0
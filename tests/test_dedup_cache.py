@@ -0,0 +1,98 @@
+import time
+from pathlib import Path
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.dedup_cache import DedupCache, dedup_key
+from NezuNotify.line_notify import LineNotify
+from NezuNotify.shared_state import SharedDedupCache
+from NezuNotify.transport import Transport
+
+
+def _key(message: str) -> bytes:
+    key = dedup_key("token", {"message": message})
+    assert key is not None
+    return key
+
+
+def test_key_depends_on_scope_and_content() -> None:
+    assert _key("a") == _key("a")
+    assert _key("a") != _key("b")
+    assert dedup_key("other", {"message": "a"}) != _key("a")
+    assert dedup_key("token", {"message": "a"}, "id") == dedup_key(
+        "token", {"message": "b"}, "id"
+    )
+
+
+def test_claim_once_until_released() -> None:
+    cache = DedupCache()
+
+    assert cache.claim(_key("a"))
+    assert not cache.claim(_key("a"))
+    cache.release(_key("a"))
+    assert cache.claim(_key("a"))
+
+
+def test_claim_expires_after_the_window() -> None:
+    cache = DedupCache(window=0.05)
+    cache.claim(_key("a"))
+
+    time.sleep(0.1)
+
+    assert cache.claim(_key("a"))
+    assert len(cache) == 1
+
+
+def test_oldest_keys_are_evicted() -> None:
+    cache = DedupCache(max_entries=2)
+    for message in ("a", "b", "c"):
+        cache.claim(_key(message))
+
+    assert len(cache) == 2
+    assert cache.claim(_key("a"))
+    assert not cache.claim(_key("c"))
+
+
+def test_shared_cache_claims_across_instances(tmp_path: Path) -> None:
+    path = str(tmp_path / "state.db")
+    first = SharedDedupCache(path)
+    second = SharedDedupCache(path)
+
+    assert first.claim(_key("a"))
+    assert not second.claim(_key("a"))
+    first.release(_key("a"))
+    assert second.claim(_key("a"))
+
+
+def test_shared_cache_claim_expires(tmp_path: Path) -> None:
+    cache = SharedDedupCache(str(tmp_path / "state.db"), window=0.05)
+    cache.claim(_key("a"))
+
+    time.sleep(0.1)
+
+    assert cache.claim(_key("a"))
+
+
+def test_repeated_send_is_suppressed(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    sender = LineNotify("token", transport, dedup_cache=DedupCache())
+
+    first = sender.send("hello")
+    second = sender.send("hello")
+
+    assert first.ok and not first.duplicate
+    assert second.ok and second.duplicate
+    assert server.requests["/api/notify"] == 1
+
+
+def test_failed_send_releases_its_key(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    sender = LineNotify("token", transport, dedup_cache=DedupCache())
+    server.fail("/api/notify", 500)
+
+    assert not sender.send("hello")
+    retried = sender.send("hello")
+
+    assert retried.ok and not retried.duplicate
+    assert server.requests["/api/notify"] == 2
@@ -0,0 +1,130 @@
+import time
+from typing import Any, List
+
+from NezuNotify.dispatcher import (
+    CRITICAL,
+    DOWNGRADE,
+    HIGH,
+    LOW,
+    NORMAL,
+    PriorityDispatcher,
+)
+from NezuNotify.exceptions import NezuNotifyExpiredError
+from NezuNotify.line_notify import LineNotify
+from NezuNotify.rate_limiter import RateLimiter
+from NezuNotify.results import SendResult
+from NezuNotify.transport import Transport
+
+
+class _RecordingSender(LineNotify):
+    def __init__(self, transport: Transport):
+        super().__init__("token", transport, RateLimiter())
+        self.sent: List[str] = []
+
+    def send(self, message: str, *args: Any, **kwargs: Any) -> SendResult:
+        self.sent.append(message)
+        return super().send(message, *args, **kwargs)
+
+
+def _set_budget(sender: LineNotify, remaining: int) -> None:
+    assert sender.rate_limiter is not None
+    sender.rate_limiter.update(
+        sender.token,
+        {
+            "X-RateLimit-Limit": "1000",
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+        },
+    )
+
+
+def test_messages_are_sent_by_priority(transport: Transport) -> None:
+    sender = _RecordingSender(transport)
+    dispatcher = PriorityDispatcher(sender)
+    futures = [
+        dispatcher.submit(priority, priority=priority)
+        for priority in (LOW, NORMAL, HIGH, CRITICAL)
+    ]
+
+    dispatcher.start()
+    dispatcher.stop()
+
+    assert all(future.result().ok for future in futures)
+    assert sender.sent == [CRITICAL, HIGH, NORMAL, LOW]
+
+
+def test_earlier_deadline_goes_first_within_a_lane(
+    transport: Transport,
+) -> None:
+    sender = _RecordingSender(transport)
+    dispatcher = PriorityDispatcher(sender)
+    dispatcher.submit("none")
+    dispatcher.submit("later", ttl=60)
+    dispatcher.submit("sooner", ttl=30)
+
+    dispatcher.start()
+    dispatcher.stop()
+
+    assert sender.sent == ["sooner", "later", "none"]
+
+
+def test_expired_message_is_dropped(transport: Transport) -> None:
+    sender = _RecordingSender(transport)
+    dispatcher = PriorityDispatcher(sender)
+    future = dispatcher.submit("stale", ttl=0.01)
+    time.sleep(0.05)
+
+    dispatcher.start()
+    dispatcher.stop()
+
+    result = future.result()
+    assert isinstance(result.error, NezuNotifyExpiredError)
+    assert sender.sent == []
+    assert dispatcher.stats()[NORMAL]["expired"] == 1
+
+
+def test_expired_message_is_downgraded(transport: Transport) -> None:
+    sender = _RecordingSender(transport)
+    dispatcher = PriorityDispatcher(sender, on_expire=DOWNGRADE)
+    future = dispatcher.submit("stale", priority=HIGH, ttl=0.01)
+    dispatcher.submit("normal")
+    time.sleep(0.05)
+
+    dispatcher.start()
+    dispatcher.stop()
+
+    assert future.result().ok
+    assert sender.sent == ["normal", "stale"]
+    stats = dispatcher.stats()
+    assert stats[HIGH]["downgraded"] == 1
+    assert stats[LOW]["sent"] == 1
+
+
+def test_reserve_is_kept_for_critical_messages(transport: Transport) -> None:
+    sender = _RecordingSender(transport)
+    _set_budget(sender, 1)
+    dispatcher = PriorityDispatcher(sender, reserve=1)
+    normal = dispatcher.submit("normal")
+    critical = dispatcher.submit("critical", priority=CRITICAL)
+
+    dispatcher.start()
+    assert critical.result(timeout=5).ok
+    dispatcher.stop(drain=False)
+
+    assert normal.cancelled()
+    assert sender.sent == ["critical"]
+
+
+def test_stop_is_bounded_by_its_timeout(transport: Transport) -> None:
+    sender = _RecordingSender(transport)
+    _set_budget(sender, 0)
+    dispatcher = PriorityDispatcher(sender)
+    future = dispatcher.submit("waiting")
+    dispatcher.start()
+
+    start = time.monotonic()
+    dispatcher.stop(timeout=0.2)
+
+    assert time.monotonic() - start < 1
+    assert future.cancelled()
+    assert sender.sent == []
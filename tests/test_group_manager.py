@@ -0,0 +1,52 @@
+import threading
+import time
+from typing import Any, Dict, List
+
+from benchmarks.fake_line_server import GROUP_PAGE_SIZE, FakeLineServer
+from NezuNotify.group_directory import GroupDirectory
+from NezuNotify.group_manager import GroupManager
+from NezuNotify.transport import Transport
+
+
+def test_groups_are_fetched_across_pages(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.groups = [
+        {"mid": f"mid-{i}", "name": f"group {i}"}
+        for i in range(GROUP_PAGE_SIZE * 2 + 5)
+    ]
+
+    groups = GroupManager("csrf", "cookie", transport).get_groups()
+
+    assert groups == server.groups
+    assert server.requests["/api/groupList"] == 3
+
+
+def test_group_lookup(server: FakeLineServer, transport: Transport) -> None:
+    server.groups = [
+        {"mid": "mid-1", "name": "alpha"},
+        {"mid": "mid-2", "name": "beta"},
+    ]
+    manager = GroupManager("csrf", "cookie", transport)
+
+    assert manager.get_group_by_mid("mid-2") == server.groups[1]
+    assert manager.get_groups_by_name("alpha") == [server.groups[0]]
+
+
+def test_concurrent_lookups_fetch_the_directory_once() -> None:
+    pages: List[int] = []
+
+    def fetch_page(page: int) -> Dict[str, Any]:
+        pages.append(page)
+        time.sleep(0.1)
+        return {"totalPage": 1, "results": [{"mid": "mid-1", "name": "a"}]}
+
+    directory = GroupDirectory(fetch_page)
+    threads = [threading.Thread(target=directory.groups) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert directory.get("mid-1") == {"mid": "mid-1", "name": "a"}
+    assert pages == [1]
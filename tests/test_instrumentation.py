@@ -0,0 +1,119 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.instrumentation import (
+    Instrumentation,
+    Metrics,
+    PrometheusTextExporter,
+    RequestEvent,
+    redact,
+    token_label,
+)
+from NezuNotify.line_notify import LineNotify
+from NezuNotify.status_manager import StatusManager
+from NezuNotify.transport import Transport
+
+
+@pytest.fixture
+def metrics() -> Metrics:
+    return Metrics(buckets=(0.5, 5.0))
+
+
+@pytest.fixture
+def instrumented(server: FakeLineServer, metrics: Metrics) -> Transport:
+    return Transport(
+        host_overrides=server.host_overrides,
+        instrumentation=Instrumentation(metrics),
+    )
+
+
+def test_requests_are_counted(
+    server: FakeLineServer, metrics: Metrics, instrumented: Transport
+) -> None:
+    server.set_quota("token", 5)
+    LineNotify("token", instrumented).send("hello")
+    LineNotify("invalid-token", instrumented).send("hello")
+
+    assert metrics.requests == {("notify", "200"): 1, ("notify", "401"): 1}
+    assert metrics.errors == {("notify", "auth"): 1}
+    assert metrics.latency["notify"].count == 2
+    assert metrics.token_requests[(token_label("token"), "notify")] == 1
+    assert metrics.token_remaining[token_label("token")] == 4
+
+
+def test_retries_are_counted(
+    server: FakeLineServer, metrics: Metrics, instrumented: Transport
+) -> None:
+    server.fail("/api/status", 503, count=2, headers={"Retry-After": "0"})
+
+    StatusManager("csrf", "cookie", instrumented).check_status("token")
+
+    assert metrics.requests[("status", "503")] == 2
+    assert metrics.retries == {"status": 2}
+
+
+def test_hooks_see_every_attempt(server: FakeLineServer) -> None:
+    events: List[RequestEvent] = []
+    instrumentation = Instrumentation()
+
+    def add_trace_id(event: RequestEvent) -> None:
+        event.headers["X-Trace-Id"] = "trace"
+
+    def broken(event: RequestEvent) -> None:
+        raise RuntimeError("hook failed")
+
+    instrumentation.add_pre_hook(add_trace_id)
+    instrumentation.add_post_hook(broken)
+    instrumentation.add_post_hook(events.append)
+    transport = Transport(
+        host_overrides=server.host_overrides, instrumentation=instrumentation
+    )
+
+    assert LineNotify("secret-token", transport).send("hello")
+
+    [event] = events
+    assert event.endpoint == "notify" and event.status_code == 200
+    assert event.headers == {"X-Trace-Id": "trace"}
+    assert event.token == token_label("secret-token")
+
+
+def test_prometheus_text(
+    metrics: Metrics, instrumented: Transport, tmp_path: Path
+) -> None:
+    LineNotify("token", instrumented).send("hello")
+    path = tmp_path / "nezunotify.prom"
+
+    PrometheusTextExporter(str(path)).export(metrics)
+
+    lines = path.read_text().splitlines()
+    assert "# TYPE nezunotify_requests_total counter" in lines
+    assert (
+        'nezunotify_requests_total{endpoint="notify",status="200"} 1' in lines
+    )
+    assert (
+        'nezunotify_request_duration_seconds_bucket{endpoint="notify",'
+        'le="+Inf"} 1'
+    ) in lines
+    assert not (tmp_path / "nezunotify.prom.tmp").exists()
+
+
+def test_prometheus_labels_are_escaped(metrics: Metrics) -> None:
+    metrics.retries['say "hi"\n'] = 1
+
+    text = PrometheusTextExporter(prefix="x").render(metrics)
+
+    assert 'x_retries_total{endpoint="say \\"hi\\"\\n"} 1' in text
+
+
+def test_export_requires_a_path(metrics: Metrics) -> None:
+    with pytest.raises(ValueError):
+        PrometheusTextExporter().export(metrics)
+
+
+def test_redact() -> None:
+    assert redact(None) == ""
+    assert redact("short") == "****"
+    assert redact("a-long-secret") == "****cret"
@@ -0,0 +1,94 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.exceptions import (
+    NezuNotifyAuthError,
+    NezuNotifyNetworkError,
+    NezuNotifyRateLimitError,
+)
+from NezuNotify.lite import LiteNotify
+
+
+@pytest.fixture
+def url(server: FakeLineServer) -> str:
+    return f"{server.url}/api/notify"
+
+
+def test_send(server: FakeLineServer, url: str) -> None:
+    server.set_quota("token", 5)
+    sender = LiteNotify("token", url=url)
+
+    result = sender.send("hello")
+    sticker = sender.send("hello", sticker=("1", "2"))
+
+    assert result.ok and result.status_code == 200
+    assert result.rate_limit is not None
+    assert result.rate_limit.remaining == 4
+    assert sticker.ok
+    assert server.requests["/api/notify"] == 2
+
+
+def test_image_upload(url: str, tmp_path: Path) -> None:
+    path = tmp_path / "image.png"
+    path.write_bytes(b"\x89PNG data")
+    sender = LiteNotify("token", url=url)
+
+    assert sender.send("from disk", str(path))
+    assert sender.send("from memory", b"\x89PNG data")
+    assert sender.send("by url", "https://example.com/image.png")
+
+
+def test_missing_image(url: str, tmp_path: Path) -> None:
+    result = LiteNotify("token", url=url).send(
+        "hello", str(tmp_path / "missing.png")
+    )
+
+    assert not result.ok and result.status_code is None
+
+
+def test_errors(server: FakeLineServer, url: str) -> None:
+    server.set_quota("drained", 0)
+
+    blocked = LiteNotify("invalid-token", url=url).send("hello")
+    drained = LiteNotify("drained", url=url).send("hello")
+
+    assert isinstance(blocked.error, NezuNotifyAuthError)
+    assert isinstance(drained.error, NezuNotifyRateLimitError)
+    with pytest.raises(NezuNotifyAuthError):
+        LiteNotify("invalid-token", url=url, raise_on_error=True).send("x")
+
+
+def test_network_error() -> None:
+    result = LiteNotify(
+        "token", timeout=1, url="http://127.0.0.1:9/api/notify"
+    ).send("hello")
+
+    assert isinstance(result.error, NezuNotifyNetworkError)
+
+
+def test_importing_lite_does_not_load_requests() -> None:
+    code = (
+        "import sys, NezuNotify.lite; "
+        "heavy = {'requests', 'aiohttp', 'NezuNotify.nezu_notify'}; "
+        "sys.exit(sorted(heavy & set(sys.modules)) or 0)"
+    )
+
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+
+
+def test_package_attributes_are_loaded_lazily() -> None:
+    import NezuNotify
+    from NezuNotify.nezu_notify import NezuNotify as client
+
+    assert NezuNotify.NezuNotify is client
+    assert "NezuNotify" in dir(NezuNotify)
+    with pytest.raises(AttributeError):
+        NezuNotify.missing
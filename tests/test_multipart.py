@@ -0,0 +1,109 @@
+import io
+import os
+from pathlib import Path
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.line_notify import LineNotify
+from NezuNotify.multipart import (
+    MultipartBody,
+    UploadCache,
+    build_image_body,
+    encode_file_part,
+)
+from NezuNotify.transport import Transport
+
+
+def test_body_reads_like_the_joined_parts() -> None:
+    body = build_image_body("hello", b"\x89PNG data", filename="a.png")
+
+    data = bytes(body.read())
+
+    assert len(data) == len(body)
+    assert data.startswith(f"--{body.boundary}\r\n".encode())
+    assert b'name="message"\r\n\r\nhello\r\n' in data
+    assert b'filename="a.png"\r\nContent-Type: image/png' in data
+    assert data.endswith(f"\r\n--{body.boundary}--\r\n".encode())
+
+
+def test_bounded_reads_and_seek() -> None:
+    body = build_image_body("hello", io.BytesIO(b"x" * 100))
+    whole = body.read()
+
+    body.seek(0)
+    chunks = []
+    while True:
+        chunk = body.read(7)
+        if not chunk:
+            break
+        chunks.append(bytes(chunk))
+
+    assert b"".join(chunks) == whole
+    assert body.seek(-10, io.SEEK_END) == len(body) - 10
+    assert body.read() == whole[-10:]
+
+
+def test_header_params_are_escaped() -> None:
+    part = encode_file_part("image", 'a"b\r\nX-Injected: 1.png', b"")
+    body = MultipartBody({'quo"te': "v"}, part)
+
+    data = body.read()
+
+    assert b'filename="a%22b%0D%0AX-Injected: 1.png"' in data
+    assert b'name="quo%22te"' in data
+    assert b"\r\nX-Injected" not in data
+
+
+def test_cache_reuses_the_encoded_part(tmp_path: Path) -> None:
+    path = tmp_path / "image.png"
+    path.write_bytes(b"first")
+    cache = UploadCache()
+
+    part = cache.get(str(path))
+
+    assert cache.get(str(path)) is part
+    assert bytes(part.content) == b"first"
+    assert len(cache) == 1
+
+
+def test_changed_file_replaces_its_entry(tmp_path: Path) -> None:
+    path = tmp_path / "image.png"
+    path.write_bytes(b"first")
+    cache = UploadCache()
+    cache.get(str(path))
+    path.write_bytes(b"second version")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    part = cache.get(str(path))
+
+    assert bytes(part.content) == b"second version"
+    assert len(cache) == 1
+
+
+def test_cache_is_bounded(tmp_path: Path) -> None:
+    cache = UploadCache(max_entries=2)
+    for i in range(3):
+        path = tmp_path / f"{i}.png"
+        path.write_bytes(b"x")
+        cache.get(str(path))
+
+    assert len(cache) == 2
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.png"
+    path.write_bytes(b"")
+
+    assert UploadCache().get(str(path)).content == b""
+
+
+def test_local_image_is_uploaded(
+    server: FakeLineServer, transport: Transport, tmp_path: Path
+) -> None:
+    path = tmp_path / "image.png"
+    path.write_bytes(b"\x89PNG" + b"x" * 200_000)
+    sender = LineNotify("token", transport, upload_cache=UploadCache())
+
+    assert sender.send_image("first", str(path))
+    assert sender.send_image("second", str(path))
+    assert server.requests["/api/notify"] == 2
@@ -0,0 +1,125 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.dedup_cache import DedupCache
+from NezuNotify.exceptions import NezuNotifyValueError
+from NezuNotify.nezu_notify import NezuNotify
+from NezuNotify.outbox import Outbox
+from NezuNotify.transport import Transport
+
+
+def _queued_client(
+    tmp_path: Path, transport: Transport, token: str = "token"
+) -> NezuNotify:
+    client = NezuNotify(
+        token=token,
+        transport=transport,
+        outbox=Outbox(str(tmp_path / "outbox.db")),
+        dedup_cache=DedupCache(),
+    )
+    assert client.outbox_worker is not None
+    client.outbox_worker.stop()
+    return client
+
+
+def test_send(server: FakeLineServer, transport: Transport) -> None:
+    client = NezuNotify(token="token", transport=transport)
+
+    assert client.send("hello")
+    assert client.send("sticker", sticker=("1", "2"))
+    assert client.send("image", image=b"\x89PNG data")
+    assert server.requests["/api/notify"] == 3
+
+
+def test_send_many(server: FakeLineServer, transport: Transport) -> None:
+    client = NezuNotify(token="token", transport=transport)
+
+    results = client.send_many(
+        ["a", {"message": "b", "sticker": (1, 2)}, {"message": "c"}]
+    )
+
+    assert [result.ok for result in results] == [True, True, True]
+    assert server.requests["/api/notify"] == 3
+
+
+def test_send_many_checks_every_message_first(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    client = NezuNotify(token="token", transport=transport)
+
+    with pytest.raises(NezuNotifyValueError):
+        client.send_many(["a", {"text": "b"}])
+
+    assert "/api/notify" not in server.requests
+
+
+def test_send_requires_a_token(transport: Transport) -> None:
+    client = NezuNotify(csrf="csrf", cookie="cookie", transport=transport)
+
+    with pytest.raises(NezuNotifyValueError):
+        client.send("hello")
+
+
+def test_repeated_send_is_suppressed(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    client = NezuNotify(
+        token="token", transport=transport, dedup_cache=DedupCache()
+    )
+
+    assert not client.send("a").duplicate
+    assert client.send("a").duplicate
+    assert not client.send("b", idempotency_key="event-1").duplicate
+    assert client.send("c", idempotency_key="event-1").duplicate
+    assert server.requests["/api/notify"] == 2
+
+
+def test_send_many_to_an_outbox_is_deduplicated(
+    tmp_path: Path, transport: Transport
+) -> None:
+    client = _queued_client(tmp_path, transport)
+
+    results = client.send_many(["a", "b", "a"])
+
+    assert [result.duplicate for result in results] == [False, False, True]
+    assert client.outbox is not None and client.outbox.depth() == 2
+    client.close()
+
+
+def test_dead_lettered_message_can_be_sent_again(
+    tmp_path: Path, transport: Transport
+) -> None:
+    client = _queued_client(tmp_path, transport, token="invalid-token")
+    assert client.send("a").queued
+    assert client.send("a").duplicate
+
+    assert client.outbox_worker is not None
+    client.outbox_worker.drain()
+
+    assert client.outbox is not None
+    assert client.outbox.stats()["dead"] == 1
+    assert not client.send("a").duplicate
+    client.close()
+
+
+def test_failed_coalesced_message_can_be_sent_again(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    client = NezuNotify(
+        token="token",
+        transport=transport,
+        coalesce_window=60,
+        dedup_cache=DedupCache(),
+    )
+    assert client.coalescer is not None
+    server.fail("/api/notify", 500)
+    client.send("a")
+    assert client.send("a").duplicate
+
+    assert not client.coalescer.flush()[0]
+
+    assert not client.send("a").duplicate
+    client.close()
+    assert server.requests["/api/notify"] == 2
@@ -0,0 +1,240 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.line_notify import LineNotify
+from NezuNotify.outbox import Outbox, OutboxWorker
+from NezuNotify.transport import Transport
+
+
+def _attempts(outbox: Outbox, entry_id: int) -> int:
+    with sqlite3.connect(outbox.path) as conn:
+        row = conn.execute(
+            "SELECT attempts FROM outbox WHERE id = ?", (entry_id,)
+        ).fetchone()
+    return int(row[0])
+
+
+def test_claim_hands_out_entries_in_order_once(tmp_path: Path) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    ids = outbox.enqueue_many("token", [{"message": str(i)} for i in range(3)])
+
+    first = outbox.claim(2)
+    second = outbox.claim(2)
+
+    assert [entry.id for entry in first] == ids[:2]
+    assert [entry.payload for entry in first] == [
+        {"message": "0"},
+        {"message": "1"},
+    ]
+    assert [entry.id for entry in second] == ids[2:]
+    assert outbox.claim() == []
+
+
+def test_ack_removes_the_entry(tmp_path: Path) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    entry_id = outbox.enqueue("token", {"message": "hello"})
+
+    outbox.claim()
+    outbox.ack(entry_id)
+
+    assert outbox.depth() == 0
+
+
+def test_nack_requeues_and_counts_the_attempt(tmp_path: Path) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    entry_id = outbox.enqueue("token", {"message": "hello"})
+
+    outbox.claim()
+    outbox.nack(entry_id, "failed")
+    entries = outbox.claim()
+
+    assert [entry.id for entry in entries] == [entry_id]
+    assert entries[0].attempts == 1
+
+
+def test_nack_without_counting_the_attempt(tmp_path: Path) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    entry_id = outbox.enqueue("token", {"message": "hello"})
+
+    outbox.claim()
+    outbox.nack(entry_id, "rate limited", count_attempt=False)
+
+    assert _attempts(outbox, entry_id) == 0
+
+
+def test_nack_delays_the_retry(tmp_path: Path) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    entry_id = outbox.enqueue("token", {"message": "hello"})
+
+    outbox.claim()
+    outbox.nack(entry_id, retry_at=time.time() + 60)
+
+    assert outbox.claim() == []
+    assert outbox.depth() == 1
+
+
+def test_unacknowledged_claim_is_handed_out_again(tmp_path: Path) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"), visibility_timeout=0.1)
+    entry_id = outbox.enqueue("token", {"message": "hello"})
+
+    outbox.claim()
+    time.sleep(0.15)
+
+    assert [entry.id for entry in outbox.claim()] == [entry_id]
+
+
+def test_extend_keeps_the_claim(tmp_path: Path) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"), visibility_timeout=0.2)
+    entry_id = outbox.enqueue("token", {"message": "hello"})
+
+    outbox.claim()
+    time.sleep(0.15)
+    outbox.extend([entry_id])
+    time.sleep(0.1)
+
+    assert outbox.claim() == []
+
+
+def test_recover_releases_entries_in_flight(tmp_path: Path) -> None:
+    path = str(tmp_path / "outbox.db")
+    outbox = Outbox(path)
+    entry_id = outbox.enqueue("token", {"message": "hello"})
+    outbox.claim()
+    outbox.close()
+
+    reopened = Outbox(path)
+
+    assert [entry.id for entry in reopened.claim()] == [entry_id]
+
+
+def test_fail_dead_letters_the_entry(tmp_path: Path) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    entry_id = outbox.enqueue("token", {"message": "hello"})
+
+    outbox.claim()
+    outbox.fail(entry_id, "gone")
+
+    assert outbox.claim() == []
+    assert outbox.stats()["dead"] == 1
+    assert outbox.depth() == 0
+
+
+def test_worker_delivers_and_acknowledges(
+    tmp_path: Path, server: FakeLineServer, transport: Transport
+) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue_many("token", [{"message": str(i)} for i in range(5)])
+
+    processed = OutboxWorker(outbox, transport=transport).drain()
+
+    assert processed == 5
+    assert outbox.depth() == 0
+    assert server.requests["/api/notify"] == 5
+
+
+def test_worker_dead_letters_a_revoked_token(
+    tmp_path: Path, server: FakeLineServer, transport: Transport
+) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue("invalid-token", {"message": "hello"})
+
+    OutboxWorker(outbox, transport=transport).drain()
+
+    assert outbox.stats()["dead"] == 1
+    assert server.requests["/api/notify"] == 1
+
+
+def test_worker_dead_letters_after_max_attempts(
+    tmp_path: Path, server: FakeLineServer, transport: Transport
+) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue("token", {"message": "hello"})
+    server.fail("/api/notify", 500, count=3)
+
+    worker = OutboxWorker(
+        outbox, transport=transport, max_attempts=3, backoff=0
+    )
+
+    assert worker.drain() == 3
+    assert outbox.stats()["dead"] == 1
+
+
+def test_worker_rate_limit_does_not_count_as_an_attempt(
+    tmp_path: Path, server: FakeLineServer, transport: Transport
+) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    entry_id = outbox.enqueue("token", {"message": "hello"})
+    server.set_quota("token", 0)
+
+    OutboxWorker(outbox, transport=transport).drain()
+
+    assert outbox.depth() == 1
+    assert _attempts(outbox, entry_id) == 0
+
+
+def test_worker_keeps_slow_deliveries_claimed(tmp_path: Path) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"), visibility_timeout=0.3)
+    outbox.enqueue("token", {"message": "hello"})
+    with FakeLineServer(latency=0.8, jitter=0.0) as server:
+        transport = Transport(host_overrides=server.host_overrides)
+        worker = OutboxWorker(outbox, LineNotify("token", transport))
+        thread = threading.Thread(target=worker.drain)
+        thread.start()
+        time.sleep(0.5)
+        reclaimed = outbox.claim()
+        thread.join()
+
+    assert reclaimed == []
+    assert server.requests["/api/notify"] == 1
+    assert outbox.depth() == 0
+
+
+def test_worker_with_a_sender_creates_no_transport(
+    tmp_path: Path, transport: Transport
+) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+
+    worker = OutboxWorker(outbox, LineNotify("token", transport))
+
+    assert worker.transport is None
+
+
+def test_workers_share_one_sender_per_token(
+    tmp_path: Path, server: FakeLineServer, transport: Transport
+) -> None:
+    outbox = Outbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue_many("token", [{"message": str(i)} for i in range(20)])
+    worker = OutboxWorker(
+        outbox, transport=transport, workers=4, poll_interval=0.05
+    )
+
+    worker.start()
+    deadline = time.monotonic() + 5
+    while outbox.depth() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    worker.stop()
+
+    assert outbox.depth() == 0
+    assert list(worker._senders) == ["token"]
+    assert server.requests["/api/notify"] == 20
+
+
+def test_outbox_files_without_dedup_keys_are_upgraded(tmp_path: Path) -> None:
+    path = str(tmp_path / "outbox.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE outbox (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " token TEXT NOT NULL, payload TEXT NOT NULL,"
+            " state TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL,"
+            " available_at REAL NOT NULL, claimed_at REAL, last_error TEXT)"
+        )
+    outbox = Outbox(path)
+
+    outbox.enqueue("token", {"message": "hello"}, b"key")
+
+    [entry] = outbox.claim()
+    assert entry.dedup_key == b"key"
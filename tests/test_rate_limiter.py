@@ -0,0 +1,106 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.exceptions import NezuNotifyRateLimitError
+from NezuNotify.line_notify import LineNotify
+from NezuNotify.rate_limiter import RateLimiter
+from NezuNotify.retry import RetryPolicy
+from NezuNotify.transport import Transport
+
+
+def _headers(remaining: int, reset: float) -> Dict[str, str]:
+    return {
+        "X-RateLimit-Limit": "10",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(reset)),
+    }
+
+
+def test_untracked_token_is_not_paced() -> None:
+    limiter = RateLimiter(fail_fast=True)
+
+    limiter.acquire("token")
+
+    assert limiter.get("token") is None
+
+
+def test_bucket_drains_locally_between_responses() -> None:
+    limiter = RateLimiter(fail_fast=True)
+    limiter.update("token", _headers(2, time.time() + 3600))
+
+    limiter.acquire("token")
+    limiter.acquire("token")
+    with pytest.raises(NezuNotifyRateLimitError):
+        limiter.acquire("token")
+
+
+def test_wait_beyond_max_wait_raises() -> None:
+    limiter = RateLimiter(max_wait=1)
+    limiter.update("token", _headers(0, time.time() + 3600))
+
+    with pytest.raises(NezuNotifyRateLimitError):
+        limiter.acquire("token")
+
+
+def test_empty_bucket_waits_for_the_reset() -> None:
+    limiter = RateLimiter()
+    reset = int(time.time()) + 1
+    limiter.update("token", _headers(0, reset))
+
+    limiter.acquire("token")
+
+    assert time.time() >= reset
+    state = limiter.get("token")
+    assert state is not None and state.remaining == 9
+
+
+def test_reserve_is_kept_back() -> None:
+    limiter = RateLimiter(fail_fast=True, reserve=1)
+    limiter.update("token", _headers(2, time.time() + 3600))
+
+    limiter.acquire("token")
+    with pytest.raises(NezuNotifyRateLimitError):
+        limiter.acquire("token")
+
+
+def test_concurrent_sends_do_not_overspend_the_quota(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.set_quota("token", 20)
+    sender = LineNotify("token", transport, RateLimiter(fail_fast=True))
+    # The first response tells the limiter the token's quota.
+    assert sender.send("first")
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(
+            executor.map(lambda i: sender.send(f"message {i}"), range(30))
+        )
+
+    assert sum(result.ok for result in results) == 19
+    assert all(
+        isinstance(result.error, NezuNotifyRateLimitError)
+        for result in results
+        if not result.ok
+    )
+    assert server.requests["/api/notify"] == 20
+
+
+def test_every_attempt_is_charged(server: FakeLineServer) -> None:
+    transport = Transport(
+        host_overrides=server.host_overrides,
+        retry_policies={"send": RetryPolicy(base_delay=0.01)},
+    )
+    limiter = RateLimiter()
+    sender = LineNotify("token", transport, limiter)
+    assert sender.send("first")
+    server.fail("/api/notify", 503, count=2)
+
+    assert sender.send("retried")
+
+    state = limiter.get("token")
+    assert state is not None
+    assert state.remaining == server.limit - 4
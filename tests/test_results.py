@@ -0,0 +1,104 @@
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.exceptions import (
+    NezuNotifyAPIError,
+    NezuNotifyAuthError,
+    NezuNotifyValueError,
+)
+from NezuNotify.nezu_notify import NezuNotify
+from NezuNotify.results import (
+    BulkRevokeResult,
+    RevokeResult,
+    SendResult,
+    TokenResult,
+)
+from NezuNotify.transport import Transport
+
+
+def test_send_result(server: FakeLineServer, transport: Transport) -> None:
+    server.set_quota("token", 9)
+    client = NezuNotify(
+        token="token",
+        message_type="text",
+        message_content="hello",
+        transport=transport,
+    )
+
+    result = client.process("send")
+
+    assert isinstance(result, SendResult)
+    assert result and result.status_code == 200
+    assert result.rate_limit is not None
+    assert result.rate_limit.remaining == 8
+    assert str(result) == "Message has been sent."
+    result.raise_for_error()
+
+
+def test_failed_send_result(transport: Transport) -> None:
+    client = NezuNotify(
+        token="invalid-token",
+        message_type="text",
+        message_content="hello",
+        transport=transport,
+    )
+
+    result = client.process("send")
+
+    assert isinstance(result, SendResult) and not result
+    assert result.status_code == 401
+    with pytest.raises(NezuNotifyAuthError):
+        result.raise_for_error()
+
+
+def test_token_result(server: FakeLineServer, transport: Transport) -> None:
+    client = NezuNotify(
+        csrf="csrf", cookie="cookie", target_mid="mid-1", transport=transport
+    )
+
+    result = client.process("create", "alerts")
+
+    assert isinstance(result, TokenResult) and result
+    assert result.target_mid == "mid-1"
+    assert str(result) == result.token
+    assert server.requests["/my/personalAccessToken"] == 1
+
+
+def test_revoke_results(transport: Transport) -> None:
+    client = NezuNotify(csrf="csrf", cookie="cookie", transport=transport)
+
+    single = client.process("revoke", "a")
+    bulk = client.process("revoke", ["a", ""])
+
+    assert isinstance(single, RevokeResult) and single
+    assert isinstance(bulk, BulkRevokeResult) and not bulk
+    assert bulk.failed == [""]
+    assert str(bulk) == "Failed to revoke 1 of 2 tokens."
+
+
+def test_token_actions_require_a_session(transport: Transport) -> None:
+    client = NezuNotify(token="token", transport=transport)
+
+    for action in ("create", "revoke", "check"):
+        with pytest.raises(NezuNotifyValueError, match="CSRF and cookie"):
+            client.process(action, "a")
+
+
+def test_invalid_action_data(transport: Transport) -> None:
+    client = NezuNotify(
+        csrf="csrf", cookie="cookie", target_mid="mid-1", transport=transport
+    )
+
+    with pytest.raises(NezuNotifyValueError):
+        client.process("create", ["a", "b"])
+    with pytest.raises(NezuNotifyValueError):
+        client.process("revoke")
+    with pytest.raises(NezuNotifyValueError):
+        client.process("unknown")
+
+
+def test_api_error_status_code() -> None:
+    assert NezuNotifyAPIError("boom").status_code is None
+    error = NezuNotifyAPIError("boom", 502)
+    assert error.status_code == 502
+    assert str(error).endswith("API error: boom (Status code: 502)")
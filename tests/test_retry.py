@@ -0,0 +1,141 @@
+import socket
+import time
+
+import pytest
+import requests
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.exceptions import NezuNotifyCircuitOpenError
+from NezuNotify.line_notify import LineNotify
+from NezuNotify.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from NezuNotify.status_manager import StatusManager
+from NezuNotify.transport import Transport
+from NezuNotify.urls import APIUrls
+
+
+def test_status_check_retries_transient_errors(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.fail("/api/status", 503, count=2, headers={"Retry-After": "0"})
+
+    result = StatusManager("csrf", "cookie", transport).check_status("token")
+
+    assert result.ok
+    assert server.requests["/api/status"] == 3
+
+
+def test_retry_after_is_waited_for(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.fail("/api/status", 429, headers={"Retry-After": "1"})
+
+    start = time.monotonic()
+    result = StatusManager("csrf", "cookie", transport).check_status("token")
+
+    assert result.ok
+    assert time.monotonic() - start >= 1
+    assert server.requests["/api/status"] == 2
+
+
+def test_retry_after_beyond_max_delay_is_not_waited_for(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.fail("/api/status", 429, headers={"Retry-After": "60"})
+
+    result = StatusManager("csrf", "cookie", transport).check_status("token")
+
+    assert not result.ok
+    assert server.requests["/api/status"] == 1
+
+
+def test_send_is_not_retried_after_a_server_error(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.fail("/api/notify", 500)
+
+    result = LineNotify("token", transport).send("hello")
+
+    assert not result.ok
+    assert result.status_code == 500
+    assert server.requests["/api/notify"] == 1
+
+
+def test_send_is_retried_after_a_connection_failure() -> None:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    transport = Transport(
+        host_overrides={APIUrls.BASE_URL: f"http://127.0.0.1:{port}"},
+        retry_policies={
+            "send": RetryPolicy(base_delay=0.01, idempotent=False)
+        },
+    )
+    attempts = []
+
+    with pytest.raises(requests.ConnectionError):
+        transport.request(
+            "POST",
+            APIUrls.NOTIFY_URL,
+            operation="send",
+            before_attempt=lambda: attempts.append(1),
+        )
+
+    assert len(attempts) == 3
+
+
+def test_circuit_opens_and_recovers(server: FakeLineServer) -> None:
+    transport = Transport(
+        failure_threshold=2,
+        recovery_timeout=0.2,
+        host_overrides=server.host_overrides,
+    )
+    server.fail("/api/notify", 500, count=2)
+    sender = LineNotify("token", transport)
+
+    sender.send("first")
+    sender.send("second")
+    blocked = sender.send("third")
+
+    assert isinstance(blocked.error, NezuNotifyCircuitOpenError)
+    assert server.requests["/api/notify"] == 2
+    assert transport.circuit_states()[APIUrls.BASE_URL] == CircuitBreaker.OPEN
+
+    time.sleep(0.25)
+
+    assert sender.send("probe")
+    assert (
+        transport.circuit_states()[APIUrls.BASE_URL] == CircuitBreaker.CLOSED
+    )
+
+
+def test_open_circuit_fails_fast_without_a_request(
+    server: FakeLineServer,
+) -> None:
+    transport = Transport(
+        failure_threshold=1, host_overrides=server.host_overrides
+    )
+    server.fail("/api/status", 503)
+    transport.request("GET", APIUrls.STATUS_URL)
+
+    with pytest.raises(CircuitOpenError):
+        transport.request("GET", APIUrls.STATUS_URL)
+
+    assert server.requests["/api/status"] == 1
+
+
+def test_compute_delay_prefers_retry_after() -> None:
+    policy = RetryPolicy(max_delay=5)
+
+    assert policy.compute_delay(1, {"Retry-After": "2"}) == 2
+    assert policy.compute_delay(1, {"Retry-After": "10"}) is None
+
+
+def test_compute_delay_backs_off_exponentially() -> None:
+    policy = RetryPolicy(base_delay=0.5, max_delay=3, jitter=0)
+
+    assert [policy.compute_delay(attempt) for attempt in (1, 2, 3, 4)] == [
+        0.5,
+        1.0,
+        2.0,
+        3.0,
+    ]
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.exceptions import NezuNotifyRateLimitError
+from NezuNotify.sharded_sender import ShardedSender
+
+
+def test_processes_do_not_overspend_a_shared_quota(
+    tmp_path: Path, server: FakeLineServer
+) -> None:
+    tokens = ["token-a", "token-b"]
+    for token in tokens:
+        server.set_quota(token, 20)
+    messages = [(tokens[i % 2], f"message {i}") for i in range(60)]
+
+    with ShardedSender(
+        str(tmp_path / "state.db"),
+        processes=2,
+        threads=4,
+        batch_size=5,
+        transport_options={"host_overrides": server.host_overrides},
+        fail_fast=True,
+        start_method="spawn",
+    ) as sender:
+        results = sender.send_many(messages)
+
+    assert len(results) == 60
+    assert sum(result.ok for result in results) == 40
+    assert all(
+        isinstance(result.error, NezuNotifyRateLimitError)
+        for result in results
+        if not result.ok
+    )
+    assert server.requests["/api/notify"] == 40
+
+
+def test_blocked_token_is_skipped(
+    tmp_path: Path, server: FakeLineServer
+) -> None:
+    messages = [("invalid-token", f"message {i}") for i in range(10)]
+
+    with ShardedSender(
+        str(tmp_path / "state.db"),
+        processes=1,
+        threads=1,
+        transport_options={"host_overrides": server.host_overrides},
+        start_method="spawn",
+    ) as sender:
+        results = sender.send_many(messages)
+
+    assert not any(result.ok for result in results)
+    assert server.requests["/api/notify"] == 1
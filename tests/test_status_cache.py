@@ -0,0 +1,86 @@
+import time
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.line_notify import LineNotify
+from NezuNotify.status_cache import STATUS_BLOCKED, STATUS_OK, StatusCache
+from NezuNotify.status_manager import StatusManager
+from NezuNotify.transport import Transport
+
+
+def test_entries_expire() -> None:
+    cache = StatusCache(ttl=0.05, negative_ttl=60)
+    cache.put("a", STATUS_OK)
+    cache.put("b", STATUS_BLOCKED)
+    cache.put("c", "Unexpected status code: 500")
+
+    assert cache.get("a") == STATUS_OK
+    assert cache.get("c") is None
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.get("b") == STATUS_BLOCKED
+
+
+def test_cached_status_needs_no_request(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    manager = StatusManager(
+        "csrf", "cookie", transport, status_cache=StatusCache()
+    )
+
+    first = manager.check_status("a")
+    second = manager.check_status("a")
+    fresh = manager.check_status("a", use_cache=False)
+
+    assert not first.cached and second.cached and not fresh.cached
+    assert second.ok
+    assert server.requests["/api/status"] == 2
+
+
+def test_sends_update_the_cache(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    cache = StatusCache()
+    LineNotify("a", transport, status_cache=cache).send("hello")
+    LineNotify("invalid-b", transport, status_cache=cache).send("hello")
+
+    manager = StatusManager("csrf", "cookie", transport, status_cache=cache)
+
+    assert manager.check_status("a").ok
+    assert not manager.check_status("invalid-b").ok
+    assert "/api/status" not in server.requests
+
+
+def test_summary_has_no_quota_for_cached_results(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.set_quota("a", 7)
+    manager = StatusManager(
+        "csrf", "cookie", transport, status_cache=StatusCache()
+    )
+    manager.check_status("a")
+    server.set_quota("a", 3)
+
+    summary = manager.summarize_token_statuses(["a"])
+
+    assert summary["a"] == {
+        "status": STATUS_OK,
+        "limit": None,
+        "remaining": None,
+        "reset": None,
+    }
+
+
+def test_tracked_statuses_are_bounded(transport: Transport) -> None:
+    manager = StatusManager(
+        "csrf",
+        "cookie",
+        transport,
+        status_cache=StatusCache(),
+        max_tracked=3,
+    )
+
+    manager.check_token_statuses([f"token-{i}" for i in range(10)])
+    manager.check_status("token-0")
+
+    assert len(manager.status) == 3
+    assert list(manager.status)[-1] == "token-0"
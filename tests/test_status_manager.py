@@ -0,0 +1,70 @@
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.exceptions import NezuNotifyValueError
+from NezuNotify.nezu_notify import NezuNotify
+from NezuNotify.status_cache import STATUS_BLOCKED, STATUS_OK
+from NezuNotify.status_manager import StatusManager
+from NezuNotify.transport import Transport
+
+
+def test_check_token_statuses(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    manager = StatusManager("csrf", "cookie", transport)
+
+    results = manager.check_token_statuses(
+        ["a", "invalid-b", "a", "c"], max_workers=4
+    )
+
+    assert {token: result.status for token, result in results.items()} == {
+        "a": STATUS_OK,
+        "invalid-b": STATUS_BLOCKED,
+        "c": STATUS_OK,
+    }
+    assert server.requests["/api/status"] == 3
+
+
+def test_abandoned_iteration_stops_queued_checks(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    manager = StatusManager("csrf", "cookie", transport)
+    tokens = [f"token-{i}" for i in range(10)]
+
+    for token, result in manager.iter_token_statuses(tokens, max_workers=1):
+        assert result.ok
+        break
+
+    assert server.requests["/api/status"] <= 2
+
+
+def test_summary_reports_the_quota(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.set_quota("a", 7)
+    manager = StatusManager("csrf", "cookie", transport)
+
+    summary = manager.summarize_token_statuses(["a", "invalid-b"])
+
+    assert summary["a"]["status"] == STATUS_OK
+    assert summary["a"]["limit"] == server.limit
+    assert summary["a"]["remaining"] == 7
+    assert summary["invalid-b"]["status"] == STATUS_BLOCKED
+
+
+def test_process_check(transport: Transport) -> None:
+    client = NezuNotify(csrf="csrf", cookie="cookie", transport=transport)
+
+    single = client.process("check", "a")
+    several = client.process("check", ["a", "invalid-b"])
+
+    assert single
+    assert isinstance(several, dict)
+    assert not several["invalid-b"]
+
+
+def test_process_check_requires_a_session(transport: Transport) -> None:
+    client = NezuNotify(token="token", transport=transport)
+
+    with pytest.raises(NezuNotifyValueError):
+        client.process("check", "a")
@@ -0,0 +1,104 @@
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.exceptions import NezuNotifyValueError
+from NezuNotify.nezu_notify import NezuNotify
+from NezuNotify.templates import (
+    MessageTemplate,
+    TemplateRegistry,
+    compile_template,
+)
+from NezuNotify.transport import Transport
+
+
+class _Host:
+    name = "web-1"
+
+
+def test_render_fields() -> None:
+    template = MessageTemplate(
+        "alert", "{host.name}: {load:.1f} {tags!r} {{literal}}"
+    )
+
+    rendered = template.render({"host": _Host(), "load": 2.345, "tags": []})
+
+    assert rendered.message == "web-1: 2.3 [] {literal}"
+    assert rendered.payload == {"message": rendered.message}
+
+
+def test_nested_mappings() -> None:
+    template = MessageTemplate("alert", "{service.owner.name}")
+
+    rendered = template.render({"service": {"owner": {"name": "ops"}}})
+
+    assert rendered.message == "ops"
+
+
+def test_missing_fields() -> None:
+    with pytest.raises(NezuNotifyValueError, match="Missing field 'host'"):
+        MessageTemplate("alert", "{host} down").render({})
+
+    lenient = MessageTemplate("alert", "{host} down", strict=False)
+    assert lenient.render({}).message == " down"
+
+
+@pytest.mark.parametrize(
+    "source", ["{}", "{0}", "{a[0]}", "{a:{b}}", "{a!x}", "{a"]
+)
+def test_unsupported_templates(source: str) -> None:
+    with pytest.raises(NezuNotifyValueError):
+        compile_template(source)
+
+
+def test_long_messages_are_truncated() -> None:
+    template = MessageTemplate("alert", "{text}", max_length=10)
+
+    rendered = template.render({"text": "x" * 20})
+
+    assert rendered.truncated
+    assert rendered.message == "x" * 9 + "…"
+
+
+def test_severity_selects_the_attachment() -> None:
+    registry = TemplateRegistry(
+        stickers={"info": ("1", "2"), "critical": ("1", "3")},
+        images={"critical": "https://example.com/red.png"},
+    )
+    registry.register("alert", "{msg}", stickers={"info": ("9", "9")})
+
+    info = registry.render("alert", {"msg": "ok", "severity": "info"})
+    critical = registry.render("alert", {"msg": "bad"}, severity="critical")
+
+    assert info.payload == {"message": "ok", "sticker": ("9", "9")}
+    assert critical.payload == {
+        "message": "bad",
+        "image": "https://example.com/red.png",
+    }
+
+
+def test_registry() -> None:
+    registry = TemplateRegistry()
+    registry.register("alert", "{msg}")
+
+    assert "alert" in registry and len(registry) == 1
+    registry.unregister("alert")
+    with pytest.raises(NezuNotifyValueError):
+        registry.get("alert")
+
+
+def test_send_template(server: FakeLineServer, transport: Transport) -> None:
+    registry = TemplateRegistry()
+    registry.register("alert", "{host} is down")
+    client = NezuNotify(token="token", transport=transport, templates=registry)
+
+    assert client.send_template("alert", {"host": "web-1"})
+    assert server.requests["/api/notify"] == 1
+    with pytest.raises(NezuNotifyValueError):
+        client.send_template("alert", {})
+
+
+def test_send_template_requires_a_registry(transport: Transport) -> None:
+    client = NezuNotify(token="token", transport=transport)
+
+    with pytest.raises(NezuNotifyValueError):
+        client.send_template("alert", {})
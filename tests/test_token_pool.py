@@ -0,0 +1,76 @@
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.exceptions import NezuNotifyAuthError, NezuNotifyValueError
+from NezuNotify.token_pool import LEAST_LOADED, TokenPool
+from NezuNotify.transport import Transport
+
+
+def test_round_robin_rotates_tokens(transport: Transport) -> None:
+    pool = TokenPool(["a", "b", "c"], transport)
+
+    tokens = [pool.send_message(str(i)).token for i in range(6)]
+
+    assert tokens == ["a", "b", "c", "a", "b", "c"]
+
+
+def test_round_robin_skips_exhausted_tokens(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.set_quota("a", 1)
+    pool = TokenPool(["a", "b"], transport)
+
+    tokens = [pool.send_message(str(i)).token for i in range(4)]
+
+    assert tokens == ["a", "b", "b", "b"]
+
+
+def test_least_loaded_picks_the_largest_budget(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.set_quota("a", 5)
+    server.set_quota("b", 50)
+    pool = TokenPool(["a", "b"], transport, strategy=LEAST_LOADED)
+    # Untracked tokens count as full, so both are tried once first.
+    pool.send_message("first")
+    pool.send_message("second")
+
+    tokens = {pool.send_message(str(i)).token for i in range(5)}
+
+    assert tokens == {"b"}
+
+
+def test_blocked_token_is_dropped_and_the_send_retried(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    pool = TokenPool(["invalid-a", "b"], transport)
+
+    result = pool.send_message("hello")
+
+    assert result.ok and result.token == "b"
+    assert pool.tokens == ["b"]
+    assert pool.blocked_tokens == ["invalid-a"]
+    assert server.requests["/api/notify"] == 2
+
+
+def test_every_token_blocked(transport: Transport) -> None:
+    pool = TokenPool(["invalid-a", "invalid-b"], transport)
+
+    result = pool.send_message("hello")
+
+    assert isinstance(result.error, NezuNotifyAuthError)
+    assert pool.tokens == []
+
+
+def test_every_token_blocked_raises(transport: Transport) -> None:
+    pool = TokenPool(["invalid-a"], transport, raise_on_error=True)
+
+    with pytest.raises(NezuNotifyAuthError):
+        pool.send_message("hello")
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(NezuNotifyValueError):
+        TokenPool([])
+    with pytest.raises(NezuNotifyValueError):
+        TokenPool(["a"], strategy="random")
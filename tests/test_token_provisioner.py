@@ -0,0 +1,106 @@
+from pathlib import Path
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.token_creator import TokenCreator
+from NezuNotify.token_provisioner import (
+    MAX_TOKENS,
+    TokenProvisioner,
+    TokenRequest,
+)
+from NezuNotify.token_store import TokenStore
+from NezuNotify.transport import Transport
+
+
+def test_create_token(server: FakeLineServer, transport: Transport) -> None:
+    result = TokenProvisioner("csrf", "cookie", transport).create_token(
+        "mid-1", "alerts"
+    )
+
+    assert result.ok and result.token
+    assert result.target_mid == "mid-1"
+
+
+def test_provision_keeps_the_order_and_saves_tokens(
+    server: FakeLineServer, transport: Transport, tmp_path: Path
+) -> None:
+    store = TokenStore(str(tmp_path / "tokens.db"))
+    provisioner = TokenProvisioner("csrf", "cookie", transport, store)
+    token_requests = [
+        TokenRequest("mid-1", "alerts", name=f"alerts-{i}") for i in range(6)
+    ]
+
+    results = provisioner.provision(token_requests, max_workers=3)
+
+    assert [store.get_token("mid-1", f"alerts-{i}") for i in range(6)] == [
+        result.token for result in results
+    ]
+    assert server.requests["/my/personalAccessToken"] == 6
+
+
+def test_throttled_requests_are_retried(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.fail(
+        "/my/personalAccessToken", 429, count=2, headers={"Retry-After": "0"}
+    )
+
+    result = TokenProvisioner("csrf", "cookie", transport).create_token(
+        "mid-1"
+    )
+
+    assert result.ok
+    assert server.requests["/my/personalAccessToken"] == 3
+
+
+def test_other_failures_are_not_retried(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.fail("/my/personalAccessToken", 500)
+
+    result = TokenProvisioner("csrf", "cookie", transport).create_token(
+        "mid-1"
+    )
+
+    assert not result.ok and result.status_code == 500
+    assert server.requests["/my/personalAccessToken"] == 1
+
+
+def test_numbering_continues_after_stored_tokens(
+    server: FakeLineServer, transport: Transport, tmp_path: Path
+) -> None:
+    store = TokenStore(str(tmp_path / "tokens.db"))
+    creator = TokenCreator("csrf", "cookie", transport, store)
+
+    first = creator.create_multiple_tokens("mid-1", 2, "alerts")
+    second = creator.create_multiple_tokens("mid-1", 2, "alerts")
+    single = creator.create_multiple_tokens("mid-2", 1, "alerts")
+
+    names = [record.name for record in store.list("mid-1")]
+    assert names == ["alerts-1", "alerts-2", "alerts-3", "alerts-4"]
+    assert [store.get_token("mid-1", name) for name in names] == [
+        result.token for result in first + second
+    ]
+    assert store.get_token("mid-2", "alerts") == single[0].token
+
+
+def test_taken_single_name_is_not_replaced(
+    server: FakeLineServer, transport: Transport, tmp_path: Path
+) -> None:
+    store = TokenStore(str(tmp_path / "tokens.db"))
+    store.save("mid-1", "alerts", "live-token")
+    creator = TokenCreator("csrf", "cookie", transport, store)
+
+    creator.create_multiple_tokens("mid-1", 1, "alerts")
+
+    assert store.get_token("mid-1", "alerts") == "live-token"
+    assert store.get_token("mid-1", "alerts-1") is not None
+
+
+def test_token_count_is_capped(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    creator = TokenCreator("csrf", "cookie", transport)
+
+    results = creator.create_multiple_tokens("mid-1", MAX_TOKENS + 5)
+
+    assert len(results) == MAX_TOKENS
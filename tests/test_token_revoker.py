@@ -0,0 +1,56 @@
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.exceptions import NezuNotifyAPIError
+from NezuNotify.retry import NO_RETRY
+from NezuNotify.token_revoker import TokenRevoker
+from NezuNotify.transport import Transport
+
+
+def test_revoke_many_keeps_the_order(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    tokens = [f"token-{i}" for i in range(8)]
+
+    result = TokenRevoker("csrf", "cookie", transport).revoke_many(tokens)
+
+    assert result.ok
+    assert [item.token for item in result.results] == tokens
+    assert server.revoked == set(tokens)
+
+
+def test_transient_failures_are_retried(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.fail("/api/revoke", 503, count=2, headers={"Retry-After": "0"})
+
+    result = TokenRevoker("csrf", "cookie", transport).revoke("token")
+
+    assert result.ok
+    assert result.attempts == 3
+
+
+def test_retry_policy_can_be_overridden(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.fail("/api/revoke", 503)
+
+    result = TokenRevoker("csrf", "cookie", transport).revoke_with_result(
+        "token", NO_RETRY
+    )
+
+    assert not result.ok
+    assert result.attempts == 1
+    assert result.status_code == 503
+
+
+def test_failures_are_reported_per_token(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    result = TokenRevoker("csrf", "cookie", transport).revoke_many(
+        ["a", "", "b"]
+    )
+
+    assert not result.ok
+    assert result.succeeded == ["a", "b"]
+    assert result.failed == [""]
+    assert isinstance(result.errors[""], NezuNotifyAPIError)
+    assert result.results[1].attempts == 1
@@ -0,0 +1,74 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from NezuNotify.exceptions import NezuNotifyValueError
+from NezuNotify.token_store import TokenStore
+
+
+def test_save_and_lookup(tmp_path: Path) -> None:
+    store = TokenStore(str(tmp_path / "tokens.db"))
+    store.save("mid-1", "alerts", "token-a")
+    store.save("mid-1", "reports", "token-b")
+    store.save("mid-2", "alerts", "token-a")
+
+    assert store.get_token("mid-1", "alerts") == "token-a"
+    assert store.get("mid-1", "missing") is None
+    assert [record.target_mid for record in store.find("token-a")] == [
+        "mid-1",
+        "mid-2",
+    ]
+    assert [record.name for record in store.list("mid-1")] == [
+        "alerts",
+        "reports",
+    ]
+
+
+def test_status_updates(tmp_path: Path) -> None:
+    store = TokenStore(str(tmp_path / "tokens.db"))
+    store.save("mid-1", "alerts", "token-a")
+    store.save("mid-1", "reports", "token-b")
+
+    assert store.update_status("token-a", "blocked", remaining=0) == 1
+    assert store.update_status("token-a", "blocked") == 1
+
+    blocked = store.list(status="blocked")
+    assert [record.token for record in blocked] == ["token-a"]
+    assert blocked[0].remaining == 0
+    assert store.delete("mid-1", "alerts")
+    assert not store.delete("mid-1", "alerts")
+
+
+def test_store_is_shared_between_connections(tmp_path: Path) -> None:
+    path = str(tmp_path / "tokens.db")
+    TokenStore(path).save("mid-1", "alerts", "token-a")
+
+    assert TokenStore(path).get_token("mid-1", "alerts") == "token-a"
+    with sqlite3.connect(path) as conn:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_import_json_keeps_stored_tokens(tmp_path: Path) -> None:
+    store = TokenStore(str(tmp_path / "tokens.db"))
+    store.save("mid-1", "alerts", "kept")
+    path = tmp_path / "tokens.json"
+    path.write_text(
+        json.dumps({"mid-1": {"alerts": "old", "reports": "token-b"}})
+    )
+
+    assert store.import_json(str(path)) == 1
+    assert store.get_token("mid-1", "alerts") == "kept"
+    assert store.get_token("mid-1", "reports") == "token-b"
+
+
+def test_import_json_rejects_other_formats(tmp_path: Path) -> None:
+    store = TokenStore(str(tmp_path / "tokens.db"))
+    path = tmp_path / "tokens.json"
+
+    for content in ("not json", '["token"]', '{"mid-1": "token"}'):
+        path.write_text(content)
+        with pytest.raises(NezuNotifyValueError):
+            store.import_json(str(path))
@@ -0,0 +1,93 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.exceptions import NezuNotifyNetworkError
+from NezuNotify.line_notify import LineNotify
+from NezuNotify.nezu_notify import NezuNotify
+from NezuNotify.status_manager import StatusManager
+from NezuNotify.transport import Transport
+from NezuNotify.urls import APIUrls
+
+
+def _adapter(transport: Transport, url: str) -> HTTPAdapter:
+    adapter = transport.session.get_adapter(url)
+    assert isinstance(adapter, HTTPAdapter)
+    return adapter
+
+
+def test_sends_reuse_one_connection(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    sender = LineNotify("token", transport)
+
+    for i in range(5):
+        assert sender.send(f"message {i}")
+
+    pools = _adapter(transport, f"{server.url}/").poolmanager.pools
+    assert [pools[key].num_connections for key in pools.keys()] == [1]
+    assert server.requests["/api/notify"] == 5
+
+
+def test_pool_sizes_are_configured_per_host() -> None:
+    transport = Transport(pool_sizes={APIUrls.BASE_URL: 32})
+
+    api = _adapter(transport, APIUrls.NOTIFY_URL)
+    bot = _adapter(transport, APIUrls.GROUP_LIST_URL)
+
+    assert api.poolmanager.connection_pool_kw["maxsize"] == 32
+    assert bot.poolmanager.connection_pool_kw["maxsize"] == 4
+
+
+def test_read_timeout_fails_the_send() -> None:
+    with FakeLineServer(latency=0.5, jitter=0.0) as server:
+        transport = Transport(
+            read_timeout=0.1, host_overrides=server.host_overrides
+        )
+
+        result = LineNotify("token", transport).send("hello")
+
+    assert not result.ok
+    assert isinstance(result.error, NezuNotifyNetworkError)
+
+
+def test_cookies_are_not_carried_between_requests(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.fail(
+        "/api/status", 200, headers={"Set-Cookie": "session=secret; Path=/"}
+    )
+
+    StatusManager("csrf", "cookie", transport).check_status("token")
+
+    assert len(transport.session.cookies) == 0
+
+
+def test_every_component_shares_the_transport(
+    transport: Transport,
+) -> None:
+    client = NezuNotify(
+        csrf="csrf", cookie="cookie", token="token", transport=transport
+    )
+
+    assert client.line_notify is not None
+    assert client.token_manager is not None
+    assert client.group_manager is not None
+    manager = client.token_manager
+    assert client.line_notify.transport is transport
+    assert client.group_manager.transport is transport
+    assert manager.token_creator.transport is transport
+    assert manager.token_revoker.transport is transport
+    assert manager.status_manager.transport is transport
+
+
+def test_request_without_operation_is_not_retried(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    server.fail("/api/status", 503)
+
+    response = transport.request("GET", APIUrls.STATUS_URL)
+
+    assert response.status_code == 503
+    assert server.requests["/api/status"] == 1
+    assert isinstance(response, requests.Response)
@@ -0,0 +1,122 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fake_line_server import FakeLineServer
+from NezuNotify.exceptions import NezuNotifyValueError
+from NezuNotify.line_notify import LineNotify
+from NezuNotify.nezu_notify import NezuNotify
+from NezuNotify.transport import Transport
+from NezuNotify.transport_modes import (
+    REDACTED,
+    DryRunAdapter,
+    ReplayAdapter,
+    create_adapter,
+)
+from NezuNotify.urls import APIUrls
+
+
+def test_dry_run_sends_nothing(server: FakeLineServer) -> None:
+    nezu = NezuNotify(token="token", transport_mode="dry_run")
+
+    assert nezu.send("hello")
+    assert not nezu.send("x" * 1001)
+
+    assert isinstance(nezu.transport_adapter, DryRunAdapter)
+    assert nezu.transport_adapter.counts == {"notify": 2}
+    assert nezu.transport_adapter.rejected == {"notify": 1}
+    assert "/api/notify" not in server.requests
+    nezu.close()
+
+
+def test_dry_run_enforces_the_rate_limit() -> None:
+    transport = Transport()
+    transport.mount(DryRunAdapter(limit=1))
+    sender = LineNotify("token", transport)
+
+    assert sender.send("first")
+    result = sender.send("second")
+
+    assert result.status_code == 429
+    transport.close()
+
+
+def test_record_then_replay(server: FakeLineServer, tmp_path: Path) -> None:
+    path = str(tmp_path / "recording.jsonl.gz")
+    transport = Transport(host_overrides=server.host_overrides)
+    transport.mount(create_adapter("record", path))
+    sender = LineNotify("secret-token", transport)
+    assert sender.send("hello")
+    transport.close()
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        recorded = file.read()
+    assert "secret-token" not in recorded
+    record = json.loads(recorded.splitlines()[1])
+    assert record["path"] == "/api/notify"
+    assert "Authorization" not in record["request_headers"]
+
+    nezu = NezuNotify(
+        token="other-token", transport_mode="replay", recording_path=path
+    )
+    result = nezu.send("hello again")
+
+    assert result.ok
+    assert result.rate_limit is not None
+    assert server.requests["/api/notify"] == 1
+    nezu.close()
+
+
+def test_recording_redacts_created_tokens(
+    server: FakeLineServer, tmp_path: Path
+) -> None:
+    path = str(tmp_path / "recording.jsonl.gz")
+    transport = Transport(host_overrides=server.host_overrides)
+    transport.mount(create_adapter("record", path))
+    response = transport.request("POST", APIUrls.PERSONAL_ACCESS_TOKEN_URL)
+    created = response.json()["token"]
+    transport.close()
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        recorded = file.read()
+    assert created not in recorded
+    assert REDACTED in recorded
+
+
+def test_replay_rejects_a_file_that_is_not_a_recording(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "notes.gz"
+    with gzip.open(str(path), "wt") as file:
+        file.write("{}\n")
+
+    with pytest.raises(NezuNotifyValueError):
+        ReplayAdapter(str(path))
+
+
+def test_mode_requires_a_recording_path() -> None:
+    with pytest.raises(NezuNotifyValueError):
+        create_adapter("replay")
+    with pytest.raises(NezuNotifyValueError):
+        create_adapter("rewind")
+
+
+def test_given_transport_cannot_be_reconfigured(transport: Transport) -> None:
+    with pytest.raises(NezuNotifyValueError):
+        NezuNotify(
+            token="token", transport=transport, transport_mode="dry_run"
+        )
+
+
+def test_close_leaves_a_given_transport_open(
+    server: FakeLineServer, transport: Transport
+) -> None:
+    nezu = NezuNotify(token="token", transport=transport)
+    assert nezu.send("first")
+
+    nezu.close()
+
+    assert LineNotify("token", transport).send("second")
+    assert server.requests["/api/notify"] == 2